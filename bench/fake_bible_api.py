@@ -0,0 +1,99 @@
+"""Local stand-in for bible-api.com with generated text and an optional delay.
+
+Serves ``/books``, ``/<Book>+<chapter>`` and ``/<Book>+<chapter>:<verse>``
+in bible-api.com's JSON shapes and counts requests by kind in ``calls``.
+Every book has ``CHAPTERS_PER_BOOK`` chapters; later ones answer 404 like
+the real API.
+"""
+
+import json
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+BOOKS = ["Genesis", "Exodus", "Psalms", "Proverbs", "Matthew", "John", "Romans", "Philippians"]
+VERSES_PER_CHAPTER = 30
+CHAPTERS_PER_BOOK = 50
+
+PASSAGE = re.compile(r"^([1-3]?[A-Za-z]+)\+(\d+)(?::(\d+))?$")
+
+
+def verse_text(book, chapter, verse):
+    return f"Verse {verse} of {book} chapter {chapter}, and the word was good."
+
+
+class FakeBibleAPI:
+    """Threaded HTTP server answering bible-api.com requests"""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = Counter()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, name="fake-bible-api", daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset_calls(self):
+        with self._lock:
+            self.calls.clear()
+
+    def answer(self, path):
+        """(kind, status, payload) for a request path"""
+        path = unquote(path.strip("/"))
+        if path == "books":
+            return "books", 200, [{"name": book} for book in BOOKS]
+        match = PASSAGE.match(path.replace(" ", ""))
+        if not match or match.group(1) not in BOOKS:
+            return "not_found", 404, {"error": "not found"}
+        book, chapter, verse = match.group(1), int(match.group(2)), match.group(3)
+        if not 1 <= chapter <= CHAPTERS_PER_BOOK:
+            return "not_found", 404, {"error": "not found"}
+        if verse is None:
+            verses = [{"book_name": book, "chapter": chapter, "verse": v, "text": verse_text(book, chapter, v) + "\n"}
+                      for v in range(1, VERSES_PER_CHAPTER + 1)]
+            return "chapter", 200, {"reference": f"{book} {chapter}", "verses": verses,
+                                    "text": "".join(v["text"] for v in verses)}
+        verse = int(verse)
+        return "verse", 200, {"reference": f"{book} {chapter}:{verse}", "text": verse_text(book, chapter, verse),
+                              "verses": [{"book_name": book, "chapter": chapter, "verse": verse,
+                                          "text": verse_text(book, chapter, verse)}]}
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                if fake.latency:
+                    time.sleep(fake.latency)
+                kind, status, payload = fake.answer(urlsplit(self.path).path)
+                with fake._lock:
+                    fake.calls[kind] += 1
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
@@ -0,0 +1,294 @@
+"""In-memory stand-in for the parts of Supabase the app uses, served over HTTP.
+
+It speaks enough PostgREST (select with eq/neq/gt/gte/lt/lte/in filters,
+order and limit; insert and upsert with on_conflict; update; the
+profile_stats RPC) and GoTrue (password sign-in, sign-up, token refresh,
+logout) for the real supabase-py client to run against it unchanged.  Every
+request is counted per (method, table or endpoint) in ``calls``.
+"""
+
+import json
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+TOKEN_LIFETIME = 3600
+IDENTITY_COLUMNS = {"messages": "seq"}   # columns the database numbers on insert
+
+
+def _parse_filter(value):
+    op, _, operand = value.partition(".")
+    if op == "in":
+        items = operand.strip("()")
+        return op, [item.strip().strip('"') for item in items.split(",")] if items else []
+    return op, operand
+
+
+def _sort_key(value):
+    # Numbers (identity columns) compare as numbers, everything else as text
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (value is None, 0, value, "")
+    return (value is None, 1, 0, str(value))
+
+
+def _matches(row, column, op, operand):
+    value = row.get(column)
+    if op == "in":
+        return str(value) in operand
+    if op == "is":
+        return value is None if operand == "null" else str(value).lower() == operand
+    if value is None:
+        return False
+    if isinstance(value, bool):
+        value = str(value).lower()
+    elif isinstance(value, int) and operand.lstrip("-").isdigit():
+        operand = int(operand)
+    else:
+        value = str(value)
+    if op == "eq":
+        return value == operand
+    if op == "neq":
+        return value != operand
+    if op == "gt":
+        return value > operand
+    if op == "gte":
+        return value >= operand
+    if op == "lt":
+        return value < operand
+    if op == "lte":
+        return value <= operand
+    raise ValueError(f"unsupported filter {op}")
+
+
+class FakeSupabase:
+    """Threaded HTTP server holding tables as lists of dicts"""
+
+    def __init__(self, tables=None, users=None, latency=0.0):
+        self.tables = {name: list(rows) for name, rows in (tables or {}).items()}
+        self.users = dict(users or {})   # email -> user id
+        self.latency = latency
+        self.calls = Counter()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-supabase", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset_calls(self):
+        with self._lock:
+            self.calls.clear()
+
+    # PostgREST
+
+    def select(self, table, query):
+        rows = self.tables.get(table, [])
+        columns, order, limit = "*", None, None
+        filters = []
+        for key, value in query:
+            if key == "select":
+                columns = value
+            elif key == "order":
+                order = value
+            elif key == "limit":
+                limit = int(value)
+            elif key not in ("on_conflict", "columns"):
+                filters.append((key,) + _parse_filter(value))
+        rows = [row for row in rows if all(_matches(row, column, op, operand) for column, op, operand in filters)]
+        if order:
+            for part in reversed(order.split(",")):
+                column, *flags = part.split(".")
+                rows.sort(key=lambda row: _sort_key(row.get(column)), reverse="desc" in flags)
+        if limit is not None:
+            rows = rows[:limit]
+        if columns != "*":
+            names = [column.strip() for column in columns.split(",")]
+            rows = [{name: row.get(name) for name in names} for row in rows]
+        return rows
+
+    def write(self, table, rows, query, prefer):
+        query = dict(query)
+        on_conflict = [column for column in query.get("on_conflict", "").split(",") if column]
+        ignore = "ignore-duplicates" in prefer
+        merge = "merge-duplicates" in prefer
+        stored = self.tables.setdefault(table, [])
+        written = []
+        for row in rows:
+            row = dict(row)
+            row.setdefault("id", str(uuid.uuid4()))
+            row.setdefault("created_at", datetime.now(timezone.utc).isoformat())
+            identity = IDENTITY_COLUMNS.get(table)
+            if identity:
+                row[identity] = max((r.get(identity) or 0 for r in stored), default=0) + 1
+            keys = on_conflict or (["client_id"] if "client_id" in row else [])
+            existing = None
+            if (ignore or merge) and keys:
+                existing = next((r for r in stored if all(r.get(k) == row.get(k) for k in keys)), None)
+            if existing is not None:
+                if merge:
+                    existing.update({k: v for k, v in row.items() if k not in ("id", "created_at", identity)})
+                    written.append(existing)
+                continue
+            stored.append(row)
+            written.append(row)
+        return written
+
+    def update(self, table, values, query):
+        rows = self.select(table, [(k, v) for k, v in query if k not in ("select",)])
+        ids = {row.get("id") for row in rows}
+        updated = []
+        for row in self.tables.get(table, []):
+            if row.get("id") in ids:
+                row.update(values)
+                updated.append(row)
+        return updated
+
+    def profile_stats(self, user_id):
+        messages = [m for m in self.tables.get("messages", []) if m.get("sender_id") == user_id]
+        progress = [p for p in self.tables.get("study_progress", []) if p.get("user_id") == user_id]
+        return {
+            "friends": len({m.get("chat_id") for m in messages}),
+            "messages": len(messages),
+            "devotionals": sum(1 for d in self.tables.get("devotionals", []) if d.get("user_id") == user_id),
+            "saved_verses": sum(1 for v in self.tables.get("saved_verses", []) if v.get("user_id") == user_id),
+            "subjects": [p for p in progress if p.get("subject") != "*"],
+            "overall": next((p for p in progress if p.get("subject") == "*"), None),
+        }
+
+    # GoTrue
+
+    def session_for(self, user_id, email):
+        now = int(time.time())
+        return {
+            "access_token": f"access-{user_id}-{uuid.uuid4()}",
+            "refresh_token": f"refresh-{user_id}-{uuid.uuid4()}",
+            "token_type": "bearer",
+            "expires_in": TOKEN_LIFETIME,
+            "expires_at": now + TOKEN_LIFETIME,
+            "user": {
+                "id": user_id,
+                "aud": "authenticated",
+                "role": "authenticated",
+                "email": email,
+                "app_metadata": {},
+                "user_metadata": {},
+                "created_at": datetime.now(timezone.utc).isoformat(),
+            },
+        }
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _read_body(self):
+                # Always consume the body, even on GET, so keep-alive connections stay in sync
+                length = int(self.headers.get("Content-Length") or 0)
+                data = self.rfile.read(length) if length else b""
+                self.payload = json.loads(data) if data.strip() else None
+
+            def _body(self):
+                return self.payload
+
+            def _send(self, status, payload=None):
+                data = b"" if payload is None else json.dumps(payload, default=str).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _route(self, method):
+                parts = urlsplit(self.path)
+                query = parse_qsl(parts.query, keep_blank_values=True)
+                segments = [s for s in parts.path.split("/") if s]
+                self._read_body()
+                if fake.latency:
+                    time.sleep(fake.latency)
+                if segments[:2] == ["rest", "v1"] and len(segments) >= 3:
+                    name = segments[3] if segments[2] == "rpc" else segments[2]
+                    kind = "rpc" if segments[2] == "rpc" else "rest"
+                    with fake._lock:
+                        fake.calls[(method, f"{kind}:{name}")] += 1
+                        return self._rest(method, kind, name, query)
+                if segments[:2] == ["auth", "v1"]:
+                    endpoint = "/".join(segments[2:])
+                    grant = dict(query).get("grant_type")
+                    with fake._lock:
+                        fake.calls[(method, f"auth:{endpoint}" + (f":{grant}" if grant else ""))] += 1
+                        return self._auth(endpoint, grant)
+                with fake._lock:
+                    fake.calls[(method, parts.path)] += 1
+                self._send(404, {"message": "not found"})
+
+            def _rest(self, method, kind, name, query):
+                if kind == "rpc":
+                    self._body()
+                    if name == "profile_stats":
+                        # Like auth.uid(): the caller's user id comes from the bearer token
+                        token = self.headers.get("Authorization", "").removeprefix("Bearer ")
+                        if not token.startswith("access-"):
+                            return self._send(401, {"message": "permission denied for function profile_stats"})
+                        return self._send(200, fake.profile_stats(token.split("-", 1)[1].rsplit("-", 5)[0]))
+                    return self._send(404, {"message": f"function {name} not found"})
+                if method == "GET":
+                    return self._send(200, fake.select(name, query))
+                if method == "POST":
+                    body = self._body()
+                    rows = body if isinstance(body, list) else [body]
+                    written = fake.write(name, rows, query, self.headers.get("Prefer", ""))
+                    return self._send(201, written)
+                if method == "PATCH":
+                    return self._send(200, fake.update(name, self._body() or {}, query))
+                self._send(405, {"message": "method not allowed"})
+
+            def _auth(self, endpoint, grant):
+                body = self._body() or {}
+                if endpoint == "token" and grant == "password":
+                    user_id = fake.users.get(body.get("email"))
+                    if user_id is None:
+                        return self._send(400, {"error": "invalid_grant", "error_description": "Invalid login credentials"})
+                    return self._send(200, fake.session_for(user_id, body.get("email")))
+                if endpoint == "token" and grant == "refresh_token":
+                    token = body.get("refresh_token") or ""
+                    user_id = token.split("-", 1)[1].rsplit("-", 5)[0] if token.startswith("refresh-") else None
+                    if not user_id:
+                        return self._send(400, {"error": "invalid_grant", "error_description": "Invalid Refresh Token"})
+                    return self._send(200, fake.session_for(user_id, None))
+                if endpoint == "signup":
+                    user_id = fake.users.setdefault(body.get("email"), str(uuid.uuid4()))
+                    return self._send(200, fake.session_for(user_id, body.get("email")))
+                if endpoint == "logout":
+                    return self._send(204)
+                self._send(404, {"message": "not found"})
+
+            def do_GET(self):
+                self._route("GET")
+
+            def do_POST(self):
+                self._route("POST")
+
+            def do_PATCH(self):
+                self._route("PATCH")
+
+        return Handler
@@ -0,0 +1,471 @@
+"""Load test: how many concurrent sessions one Streamlit process can serve.
+
+Usage:
+    python bench/load.py
+    python bench/load.py --levels 25,50,100,200,400 --duration 60 --latency-ms 40 --out load.json
+
+Starts ``streamlit run teens-app.py`` as a subprocess against the fake
+Supabase and bible-api.com servers from ``bench/`` (run in this process with
+injected latency), then connects simulated users over the same websocket
+protocol the browser uses.  Every user signs in and then, with think time in
+between, chats in a study group, works through WAEC questions and looks up
+verses.  While a chat is open the user also makes the chat pane's timed
+fragment reruns, like a browser does.
+
+Concurrency is raised level by level (sessions stay connected between
+levels).  For each level the tool measures, over ``--duration`` seconds:
+interactions per second, p50/p95/p99 interaction latency, the server's CPU
+use and resident memory (from ``/proc``, so Linux only) and the load
+generator's own CPU.  The knee is the last level whose p95 stays under
+``--slo-ms`` while throughput still grows.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+APP = os.path.join(ROOT, "teens-app.py")
+sys.path.insert(0, ROOT)
+
+from tornado.websocket import websocket_connect  # noqa: E402
+from streamlit.proto.BackMsg_pb2 import BackMsg  # noqa: E402
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg  # noqa: E402
+from streamlit.proto.WidgetStates_pb2 import WidgetState  # noqa: E402
+
+from bench.fake_bible_api import FakeBibleAPI  # noqa: E402
+from bench.fake_supabase import FakeSupabase  # noqa: E402
+from bench.run import percentile, seed_data  # noqa: E402
+
+FINISHED = {ForwardMsg.ScriptFinishedStatus.FINISHED_SUCCESSFULLY,
+            ForwardMsg.ScriptFinishedStatus.FINISHED_FRAGMENT_RUN_SUCCESSFULLY,
+            ForwardMsg.ScriptFinishedStatus.FINISHED_WITH_COMPILE_ERROR}
+CHAT_PAGE = "💬 Chat & Groups"
+STUDY_PAGE = "📚 Study Hub"
+BIBLE_PAGE = "📖 Bible Reader"
+ACTIONS = (("chat", 4), ("quiz", 3), ("verse", 2), ("browse", 1))   # (action, weight)
+PAGES = ["🏠 Home", "🎶 Music Player", "📅 Daily Devotional", "🎮 Games", "👤 Profile"]
+
+
+class AppError(RuntimeError):
+    pass
+
+
+class Element:
+    def __init__(self, kind, proto, fragment_id):
+        self.kind = kind
+        self.proto = proto
+        self.fragment_id = fragment_id
+        self.id = getattr(proto, "id", "")
+        self.label = getattr(proto, "label", "")
+
+
+class StreamlitSession:
+    """One browser tab: a websocket to the app that sends reruns and tracks the elements on screen"""
+
+    def __init__(self, url, timeout=60):
+        self.url = url
+        self.timeout = timeout
+        self.values = {}         # widget id -> WidgetState sent with every rerun
+        self.elements = []
+        self.auto_reruns = {}    # fragment id -> interval in seconds
+        self._cache = {}         # message hash -> ForwardMsg, for messages the server sends by reference
+        self.ws = None
+
+    async def connect(self):
+        ws_url = self.url.replace("http", "ws", 1).rstrip("/") + "/_stcore/stream"
+        self.ws = await websocket_connect(ws_url, max_message_size=64 << 20)
+
+    def close(self):
+        if self.ws is not None:
+            self.ws.close()
+
+    async def rerun(self, trigger=None, fragment_id=""):
+        """Send a rerun like the browser would and wait for it to finish; returns seconds taken"""
+        message = BackMsg()
+        request = message.rerun_script
+        request.SetInParent()
+        for state in self.values.values():
+            request.widget_states.widgets.add().CopyFrom(state)
+        if trigger:
+            widget = request.widget_states.widgets.add()
+            widget.id = trigger
+            widget.trigger_value = True
+        if fragment_id:
+            request.fragment_id = fragment_id
+        started = time.perf_counter()
+        await self.ws.write_message(message.SerializeToString(), binary=True)
+        elements = []
+        auto_reruns = {}
+        while True:
+            data = await asyncio.wait_for(self.ws.read_message(), self.timeout)
+            if data is None:
+                raise AppError("websocket closed")
+            forward = ForwardMsg()
+            forward.ParseFromString(data)
+            kind = forward.WhichOneof("type")
+            if kind == "ref_hash":
+                forward = self._cache.get(forward.ref_hash, forward)
+                kind = forward.WhichOneof("type")
+            elif forward.metadata.cacheable:
+                self._cache[forward.hash] = forward
+            if kind == "new_session":
+                elements = []
+            elif kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                element = forward.delta.new_element
+                element_kind = element.WhichOneof("type")
+                if element_kind == "exception":
+                    raise AppError(element.exception.message)
+                elements.append(Element(element_kind, getattr(element, element_kind), forward.delta.fragment_id))
+            elif kind == "auto_rerun":
+                auto_reruns[forward.auto_rerun.fragment_id] = forward.auto_rerun.interval
+            elif kind == "script_finished" and forward.script_finished in FINISHED:
+                break
+        elapsed = time.perf_counter() - started
+        if fragment_id:
+            self.elements = [e for e in self.elements if e.fragment_id != fragment_id] + elements
+            self.auto_reruns.update(auto_reruns)
+        else:
+            self.elements = elements
+            self.auto_reruns = auto_reruns
+        return elapsed
+
+    def find_all(self, kind, label=None):
+        return [e for e in self.elements if e.kind == kind and (label is None or e.label == label)]
+
+    def find(self, kind, label=None):
+        found = self.find_all(kind, label)
+        return found[0] if found else None
+
+    def set(self, element, field, value):
+        state = WidgetState()
+        state.id = element.id
+        setattr(state, field, value)
+        self.values[element.id] = state
+
+    async def click(self, element):
+        return await self.rerun(trigger=element.id, fragment_id=element.fragment_id)
+
+
+class Recorder:
+    """Latencies and errors of the current measurement window"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.started = time.perf_counter()
+        self.latencies = {}   # action -> [seconds]
+        self.auto = []
+        self.errors = 0
+        self.error_samples = []
+
+    def record(self, action, seconds):
+        self.latencies.setdefault(action, []).append(seconds)
+
+    def error(self, exc):
+        self.errors += 1
+        if len(self.error_samples) < 5:
+            self.error_samples.append(f"{type(exc).__name__}: {exc}"[:200])
+
+
+class SimulatedUser:
+    """A signed-in teen clicking around the app with think time between actions"""
+
+    def __init__(self, index, url, recorder, think, rng, auto_reruns=True):
+        self.index = index
+        self.session = StreamlitSession(url)
+        self.recorder = recorder
+        self.think = think
+        self.rng = rng
+        self.auto_reruns = auto_reruns
+        self.page = None
+        self.signed_in = False
+        self.failed = False
+
+    async def timed(self, action, step):
+        self.recorder.record(action, await step)
+
+    async def sign_in(self):
+        session = self.session
+        await session.connect()
+        await self.timed("login", session.rerun())
+        session.set(session.find("text_input", "Email"), "string_value", f"bench{self.index}@example.com")
+        session.set(session.find("text_input", "Password"), "string_value", "password")
+        await self.timed("login", session.click(session.find("button", "Login")))
+        session.values.clear()
+        if session.find("radio", "Navigate") is None:
+            raise AppError(f"sign-in failed for bench{self.index}")
+        self.signed_in = True
+
+    async def goto(self, page):
+        if self.page == page:
+            return
+        radio = self.session.find("radio", "Navigate")
+        self.session.set(radio, "int_value", list(radio.proto.options).index(page))
+        await self.timed("navigate", self.session.rerun())
+        self.page = page
+
+    async def chat(self):
+        await self.goto(CHAT_PAGE)
+        session = self.session
+        if session.find("button", "Send") is None:
+            await self.timed("open_chat", session.click(self.rng.choice(session.find_all("button", "View Chat"))))
+        session.set(session.find("text_input", "Type your message:"), "string_value",
+                    f"Anyone solved question {self.rng.randint(1, 50)}? ({self.index})")
+        await self.timed("send_message", session.click(session.find("button", "Send")))
+
+    async def quiz(self):
+        await self.goto(STUDY_PAGE)
+        session = self.session
+        if session.find("button", "Start Again"):
+            await self.timed("quiz", session.click(session.find("button", "Start Again")))
+        if session.find("button", "Check Answer") is None:
+            await self.timed("quiz", session.click(session.find("button", "Load Questions")))
+        answers = session.find("radio", "Select your answer:")
+        if answers is not None:
+            session.set(answers, "int_value", self.rng.randrange(len(answers.proto.options)))
+        await self.timed("quiz", session.click(session.find("button", "Check Answer")))
+        await self.timed("quiz", session.click(session.find("button", "Next Question →")))
+
+    async def verse(self):
+        await self.goto(BIBLE_PAGE)
+        session = self.session
+        book = session.find("selectbox", "Select Book")
+        session.set(book, "int_value", self.rng.randrange(len(book.proto.options)))
+        await self.timed("verse_lookup", session.rerun())
+        session.set(session.find("number_input", "Chapter"), "int_value", self.rng.randint(1, 5))
+        session.set(session.find("number_input", "Verse"), "int_value", self.rng.randint(1, 20))
+        await self.timed("verse_lookup", session.click(session.find("button", "Lookup Verse")))
+
+    async def browse(self):
+        await self.goto(self.rng.choice([page for page in PAGES if page != self.page]))
+
+    async def idle(self, seconds):
+        """Think time; an open chat pane keeps rerunning on its timer meanwhile"""
+        deadline = time.perf_counter() + seconds
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return
+            if not (self.auto_reruns and self.session.auto_reruns):
+                await asyncio.sleep(remaining)
+                return
+            fragment_id, interval = next(iter(self.session.auto_reruns.items()))
+            await asyncio.sleep(min(interval, remaining))
+            if time.perf_counter() < deadline:
+                self.recorder.auto.append(await self.session.rerun(fragment_id=fragment_id))
+
+    async def live(self, stop):
+        names = [name for name, weight in ACTIONS]
+        weights = [weight for name, weight in ACTIONS]
+        try:
+            await self.sign_in()
+            while not stop.is_set():
+                await self.idle(self.rng.expovariate(1 / self.think))
+                if stop.is_set():
+                    break
+                await getattr(self, self.rng.choices(names, weights)[0])()
+        except (AppError, asyncio.TimeoutError, AttributeError, ValueError, IndexError, OSError) as e:
+            # AttributeError/IndexError: an expected widget was missing from the page
+            self.recorder.error(e)
+            self.failed = True
+        finally:
+            self.session.close()
+
+
+class ProcessStats:
+    """CPU time and resident memory of a process, read from /proc"""
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.ticks = os.sysconf("SC_CLK_TCK")
+
+    def cpu_seconds(self):
+        try:
+            with open(f"/proc/{self.pid}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            return (int(fields[11]) + int(fields[12])) / self.ticks
+        except (OSError, IndexError, ValueError):
+            return None
+
+    def rss_bytes(self):
+        try:
+            with open(f"/proc/{self.pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1]) * 1024
+        except (OSError, ValueError):
+            pass
+        return None
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_app(supabase, bible_api, workdir):
+    """Run the app in its own Streamlit server process; returns (process, url)"""
+    secrets_dir = os.path.join(workdir, ".streamlit")
+    os.makedirs(secrets_dir, exist_ok=True)
+    with open(os.path.join(secrets_dir, "secrets.toml"), "w") as f:
+        f.write(f'[supabase]\nurl = "{supabase.url}"\nkey = "bench.anon.key"\n')
+    port = free_port()
+    env = dict(os.environ,
+               WRITE_JOURNAL_PATH=os.path.join(workdir, "journal.sqlite3"),
+               BIBLE_DB_PATH=os.path.join(workdir, "no-bible.sqlite3"),
+               BIBLE_API_URL=bible_api.url,
+               METRICS_PORT="")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", APP, "--server.headless=true", f"--server.port={port}",
+         "--server.address=127.0.0.1", "--server.fileWatcherType=none", "--browser.gatherUsageStats=false"],
+        cwd=workdir, env=env, stdout=open(os.path.join(workdir, "server.log"), "w"), stderr=subprocess.STDOUT)
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"streamlit exited with {process.returncode}; see {workdir}/server.log")
+        try:
+            urllib.request.urlopen(url + "/_stcore/health", timeout=1)
+            return process, url
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError("streamlit did not start within 60 s")
+
+
+def summarize(level, recorder, window, server, server_cpu, generator_cpu, rss_peak, active):
+    interactions = [s for samples in recorder.latencies.values() for s in samples]
+    ms = [s * 1000 for s in interactions]
+    return {
+        "sessions": level,
+        "active_sessions": active,
+        "window_s": round(window, 1),
+        "interactions": len(ms),
+        "throughput_per_s": len(ms) / window if window else 0.0,
+        "p50_ms": percentile(ms, 50),
+        "p95_ms": percentile(ms, 95),
+        "p99_ms": percentile(ms, 99),
+        "per_action_p95_ms": {action: percentile([s * 1000 for s in samples], 95)
+                              for action, samples in sorted(recorder.latencies.items())},
+        "auto_reruns": len(recorder.auto),
+        "auto_rerun_p95_ms": percentile([s * 1000 for s in recorder.auto], 95),
+        "errors": recorder.errors,
+        "error_samples": recorder.error_samples,
+        "server_cpu_percent": server_cpu,
+        "server_rss_mb": server.rss_bytes() / 2 ** 20 if server.rss_bytes() else None,
+        "server_rss_peak_mb": rss_peak / 2 ** 20 if rss_peak else None,
+        "generator_cpu_percent": generator_cpu,
+    }
+
+
+def find_knee(levels, slo_ms, min_gain=0.1):
+    """Last level within the SLO whose throughput still grew by min_gain over the previous one"""
+    knee = None
+    previous = None
+    for result in levels:
+        if result["p95_ms"] > slo_ms or result["errors"]:
+            break
+        if previous and result["throughput_per_s"] < previous["throughput_per_s"] * (1 + min_gain):
+            break
+        knee = result["sessions"]
+        previous = result
+    return knee
+
+
+async def run_levels(args, url, server):
+    recorder = Recorder()
+    stop = asyncio.Event()
+    users = []
+    tasks = []
+    results = []
+    for level in args.levels:
+        # Ramp up: new sessions sign in spread over a few seconds, outside the measurement
+        for index in range(len(users), level):
+            user = SimulatedUser(index, url, recorder, args.think_ms / 1000, random.Random(index),
+                                 auto_reruns=not args.no_auto_rerun)
+            users.append(user)
+            tasks.append(asyncio.ensure_future(user.live(stop)))
+            await asyncio.sleep(args.ramp_s / max(1, level))
+        await asyncio.sleep(args.warmup_s)
+
+        recorder.reset()
+        cpu_before, generator_before = server.cpu_seconds(), time.process_time()
+        started = time.perf_counter()
+        rss_peak = 0
+        while time.perf_counter() - started < args.duration:
+            await asyncio.sleep(1)
+            rss_peak = max(rss_peak, server.rss_bytes() or 0)
+        window = time.perf_counter() - started
+        cpu_after = server.cpu_seconds()
+        server_cpu = (cpu_after - cpu_before) / window * 100 if cpu_before is not None and cpu_after is not None else None
+        generator_cpu = (time.process_time() - generator_before) / window * 100
+        active = sum(1 for user in users if user.signed_in and not user.failed)
+        result = summarize(level, recorder, window, server, server_cpu, generator_cpu, rss_peak, active)
+        results.append(result)
+        print(f"{level:6d} sessions  {result['throughput_per_s']:7.1f} /s  p50 {result['p50_ms']:7.0f} ms  "
+              f"p95 {result['p95_ms']:7.0f} ms  p99 {result['p99_ms']:7.0f} ms  "
+              f"cpu {result['server_cpu_percent'] or 0:5.0f}%  rss {result['server_rss_mb'] or 0:6.0f} MB  "
+              f"errors {result['errors']}  (generator cpu {generator_cpu:.0f}%)", flush=True)
+        if generator_cpu > 90:
+            print("        the load generator itself is saturated; results at this level understate the server",
+                  flush=True)
+    stop.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Find how many concurrent sessions one app process can serve")
+    parser.add_argument("--levels", default="10,25,50,100,200",
+                        help="comma-separated session counts to step through (default: 10,25,50,100,200)")
+    parser.add_argument("--duration", type=float, default=30, help="measurement window per level in seconds")
+    parser.add_argument("--warmup-s", type=float, default=5, help="settle time after ramping up a level")
+    parser.add_argument("--ramp-s", type=float, default=10, help="time over which a level's new sessions connect")
+    parser.add_argument("--think-ms", type=float, default=3000, help="mean think time between user actions")
+    parser.add_argument("--latency-ms", type=float, default=30, help="injected latency per upstream request")
+    parser.add_argument("--slo-ms", type=float, default=500, help="p95 interaction latency target for the knee")
+    parser.add_argument("--no-auto-rerun", action="store_true", help="don't make the chat pane's timed reruns")
+    parser.add_argument("--out", help="write the results as JSON to this file")
+    args = parser.parse_args(argv)
+    args.levels = sorted(int(level) for level in args.levels.split(","))
+
+    workdir = tempfile.mkdtemp(prefix="teens-load-")
+    tables, accounts = seed_data(users=args.levels[-1], contacts=args.levels[-1])
+    supabase = FakeSupabase(tables, accounts, latency=args.latency_ms / 1000).start()
+    bible_api = FakeBibleAPI(latency=args.latency_ms / 1000).start()
+    process, url = start_app(supabase, bible_api, workdir)
+    print(f"App running at {url} (pid {process.pid}, logs in {workdir}/server.log)", flush=True)
+    try:
+        results = asyncio.run(run_levels(args, url, ProcessStats(process.pid)))
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+        supabase.stop()
+        bible_api.stop()
+
+    knee = find_knee(results, args.slo_ms)
+    if knee:
+        print(f"\nKnee: {knee} sessions (p95 under {args.slo_ms:.0f} ms with throughput still growing)")
+    else:
+        print(f"\nKnee: below {args.levels[0]} sessions (p95 already over {args.slo_ms:.0f} ms or errors)")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "knee_sessions": knee, "levels": results}, f, indent=2)
+        print(f"Wrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
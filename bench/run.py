@@ -0,0 +1,339 @@
+"""Headless rerun-latency benchmark for teens-app.py.
+
+Usage:
+    python bench/run.py
+    python bench/run.py --iterations 50 --latency-ms 20 --out bench.json
+    python bench/run.py --baseline bench.json --max-regression 20
+
+Drives the app with Streamlit's AppTest against a local fake Supabase
+(``fake_supabase.py``) and a fake bible-api.com (``fake_bible_api.py``),
+both real HTTP servers so the app's own clients are exercised.  Each
+scenario scripts a user interaction (login, page visits, verse lookup, WAEC
+quiz, sending a message, group search) and records the latency of every
+rerun it causes, plus the upstream requests it made.  Memory per session is
+measured with tracemalloc over a batch of signed-in sessions.
+
+Every AppTest run is a full script rerun; fragment-only reruns (chat pane,
+quiz card, ...) are cheaper in a browser than measured here.  The login
+scenario includes the one-second pause the login page makes after success.
+
+Results are printed and, with ``--out``, written as JSON; ``--baseline``
+compares p50/p95 and upstream calls against an earlier result file.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+APP = os.path.join(ROOT, "teens-app.py")
+sys.path.insert(0, ROOT)
+
+from bench.fake_bible_api import BOOKS, FakeBibleAPI  # noqa: E402
+from bench.fake_supabase import FakeSupabase  # noqa: E402
+from journal import Journal  # noqa: E402
+from views import PAGES as VIEWS  # noqa: E402
+
+PAGES = [label for label, module in VIEWS.values()]
+
+GROUP_TERMS = ["math", "bio", "phys", "eng", "chem", "study", "x"]
+
+
+class BenchError(RuntimeError):
+    pass
+
+
+def percentile(samples, q):
+    """q-th percentile (0-100) with linear interpolation"""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * q / 100
+    low = int(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def seed_data(users, contacts):
+    """Tables and sign-in accounts for the fake Supabase"""
+    now = "2024-01-01T00:00:00+00:00"
+    profiles = [{"id": f"u{i:04d}", "username": f"Bencher{i:04d}", "number": str(1000 + i),
+                 "email": f"bench{i}@example.com"} for i in range(max(users, contacts))]
+    messages = [{"id": f"m{i}", "seq": i + 1, "client_id": f"c{i}", "chat_id": "u0001", "sender_id": "u0000" if i % 2 else "u0001",
+                 "content": f"Seed message {i}", "created_at": f"2024-01-01T00:{i // 60:02d}:{i % 60:02d}+00:00"}
+                for i in range(300)]
+    groups = [{"id": f"g{i}", "name": f"{subject} study circle {i}", "subject": subject, "members": 3 + i,
+               "description": "Past questions together", "created_at": now}
+              for i, subject in enumerate(["Mathematics", "Biology", "Physics", "English Language", "Chemistry"] * 4)]
+    tables = {"profiles": profiles, "messages": messages, "study_groups": groups}
+    accounts = {profile["email"]: profile["id"] for profile in profiles[:users]}
+    return tables, accounts
+
+
+class Bench:
+    def __init__(self, supabase, bible_api, journal_path):
+        self.supabase = supabase
+        self.bible_api = bible_api
+        # Read the app's write journal directly: outside a script run st.cache_resource
+        # doesn't cache, so services.get_outbox() would start another outbox each call
+        self.journal = Journal(journal_path)
+        self.results = {}
+
+    def session(self):
+        from streamlit.testing.v1 import AppTest
+
+        at = AppTest.from_file(APP, default_timeout=60)
+        at.secrets["supabase"] = {"url": self.supabase.url, "key": "bench.anon.key"}
+        return at
+
+    def run(self, at, samples=None):
+        started = time.perf_counter()
+        at.run()
+        elapsed = (time.perf_counter() - started) * 1000
+        if at.exception:
+            raise BenchError(at.exception[0].value)
+        if samples is not None:
+            samples.append(elapsed)
+        return at
+
+    def login(self, at, user, samples=None):
+        self.run(at, samples)
+        at.text_input[0].input(f"bench{user}@example.com")
+        at.text_input[1].input("password")
+        next(b for b in at.button if b.label == "Login").click()
+        self.run(at, samples)
+        if not any(t.value.startswith("👋") for t in at.sidebar.title):
+            raise BenchError(f"login failed for bench{user}: {[e.value for e in at.error]} {[t.value for t in at.title]}")
+        return at
+
+    def goto(self, at, page, samples=None):
+        at.sidebar.radio[0].set_value(page)
+        return self.run(at, samples)
+
+    def wait_for_writes(self, timeout=10):
+        """Let the outbox flush so writes are counted with the scenario that made them"""
+        deadline = time.time() + timeout
+        while time.time() < deadline and len(self.journal):
+            time.sleep(0.05)
+
+    def reset_calls(self):
+        """Start counting upstream calls afresh; scenarios call this once their session is set up"""
+        self.wait_for_writes()
+        self.supabase.reset_calls()
+        self.bible_api.reset_calls()
+
+    def scenario(self, name, body, iterations):
+        """Run body(samples, iterations) and record latency and upstream calls"""
+        self.reset_calls()
+        samples = []
+        body(samples, iterations)
+        self.wait_for_writes()
+        supabase_calls = {f"{method} {target}": n for (method, target), n in sorted(self.supabase.calls.items())
+                          if not target.startswith("/realtime")}
+        bible_calls = dict(sorted(self.bible_api.calls.items()))
+        upstream = sum(supabase_calls.values()) + sum(bible_calls.values())
+        self.results[name] = {
+            "interactions": len(samples),
+            "p50_ms": percentile(samples, 50),
+            "p95_ms": percentile(samples, 95),
+            "p99_ms": percentile(samples, 99),
+            "mean_ms": statistics.fmean(samples) if samples else 0.0,
+            "max_ms": max(samples) if samples else 0.0,
+            "upstream_calls": upstream,
+            "upstream_per_interaction": upstream / len(samples) if samples else 0.0,
+            "supabase": supabase_calls,
+            "bible_api": bible_calls,
+        }
+        print(f"{name:18s} {len(samples):5d} reruns  p50 {self.results[name]['p50_ms']:7.1f} ms  "
+              f"p95 {self.results[name]['p95_ms']:7.1f} ms  p99 {self.results[name]['p99_ms']:7.1f} ms  "
+              f"upstream {upstream} ({self.results[name]['upstream_per_interaction']:.2f}/rerun)", flush=True)
+
+    # Scenarios
+
+    def login_scenario(self, samples, iterations):
+        for i in range(iterations):
+            self.login(self.session(), i % 10, samples)
+
+    def pages_scenario(self, samples, iterations):
+        at = self.login(self.session(), 0)
+        self.reset_calls()
+        for _ in range(iterations):
+            for page in PAGES:
+                self.goto(at, page, samples)
+
+    def verse_lookup_scenario(self, samples, iterations):
+        at = self.goto(self.login(self.session(), 1), "📖 Bible Reader")
+        self.reset_calls()
+        rng = random.Random(1)
+        for _ in range(iterations):
+            at.selectbox(key="bible_book").set_value(rng.choice(BOOKS))
+            self.run(at, samples)
+            at.number_input(key="bible_chapter").set_value(rng.randint(1, 5))
+            at.number_input(key="bible_verse").set_value(rng.randint(1, 20))
+            next(b for b in at.button if b.label == "Lookup Verse").click()
+            self.run(at, samples)
+
+    def waec_quiz_scenario(self, samples, iterations):
+        at = self.goto(self.login(self.session(), 2), "📚 Study Hub")
+        self.reset_calls()
+        next(b for b in at.button if b.label == "Load Questions").click()
+        self.run(at, samples)
+        for _ in range(iterations):
+            labels = [b.label for b in at.button]
+            if "Start Again" in labels:
+                next(b for b in at.button if b.label == "Start Again").click()
+                self.run(at, samples)
+            next(b for b in at.button if b.label == "Check Answer").click()
+            self.run(at, samples)
+            next(b for b in at.button if b.label == "Next Question →").click()
+            self.run(at, samples)
+
+    def send_message_scenario(self, samples, iterations):
+        at = self.goto(self.login(self.session(), 0), "💬 Chat & Groups")
+        self.reset_calls()
+        at.text_input(key="user_search").input("Bencher0001")
+        self.run(at, samples)
+        at.button(key="user_u0001").click()
+        self.run(at, samples)
+        for i in range(iterations):
+            at.text_input(key="message_input").input(f"Benchmark message {i}")
+            next(b for b in at.button if b.label == "Send").click()
+            self.run(at, samples)
+
+    def group_search_scenario(self, samples, iterations):
+        at = self.goto(self.login(self.session(), 3), "💬 Chat & Groups")
+        self.reset_calls()
+        for i in range(iterations):
+            at.text_input(key="group_search").input(GROUP_TERMS[i % len(GROUP_TERMS)])
+            self.run(at, samples)
+
+    def memory(self, sessions):
+        """Traced bytes kept alive per signed-in session that has visited every page"""
+        warm = self.login(self.session(), 4)
+        for page in PAGES:
+            self.goto(warm, page)
+        tracemalloc.start()
+        baseline = tracemalloc.take_snapshot()
+        before, _ = tracemalloc.get_traced_memory()
+        alive = []
+        for i in range(sessions):
+            at = self.login(self.session(), 5 + i % 5)
+            for page in PAGES:
+                self.goto(at, page)
+            alive.append(at)
+        after, peak = tracemalloc.get_traced_memory()
+        top = tracemalloc.take_snapshot().compare_to(baseline, "filename")[:5]
+        tracemalloc.stop()
+        result = {
+            "sessions": sessions,
+            "bytes_per_session": (after - before) / sessions,
+            "peak_bytes": peak,
+            "top_files": [{"file": stat.traceback[0].filename, "bytes": stat.size_diff}
+                          for stat in top],
+        }
+        print(f"memory             {sessions:5d} sessions  {result['bytes_per_session'] / 1024:.0f} KiB per session", flush=True)
+        return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, max_regression):
+    """Print p50/p95/upstream changes against a baseline; return the scenarios that regressed"""
+    regressed = []
+    print(f"\nCompared with {baseline['meta'].get('commit') or 'baseline'}:")
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        changes = []
+        for field in ("p50_ms", "p95_ms", "upstream_per_interaction"):
+            old, new = previous[field], current[field]
+            change = (new - old) / old * 100 if old else 0.0
+            changes.append(f"{field} {old:.1f} -> {new:.1f} ({change:+.0f}%)")
+            if max_regression is not None and field != "p50_ms" and change > max_regression:
+                regressed.append(f"{name} {field}")
+        print(f"  {name:18s} " + ", ".join(changes))
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure rerun latency of teens-app.py headlessly")
+    parser.add_argument("--iterations", type=int, default=20, help="interactions per scenario (default: 20)")
+    parser.add_argument("--sessions", type=int, default=10, help="sessions for the memory measurement (default: 10)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated upstream latency per request")
+    parser.add_argument("--contacts", type=int, default=2000, help="profiles in the fake database (default: 2000)")
+    parser.add_argument("--out", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="compare with an earlier --out file")
+    parser.add_argument("--max-regression", type=float,
+                        help="with --baseline, exit 1 if p95 or upstream calls per rerun grew by more than this percent")
+    args = parser.parse_args(argv)
+
+    # Keep the app's local files out of the working tree and read Bible text from the fake API
+    workdir = tempfile.mkdtemp(prefix="teens-bench-")
+    tables, accounts = seed_data(users=20, contacts=args.contacts)
+    supabase = FakeSupabase(tables, accounts, latency=args.latency_ms / 1000).start()
+    bible_api = FakeBibleAPI(latency=args.latency_ms / 1000).start()
+    os.environ["WRITE_JOURNAL_PATH"] = os.path.join(workdir, "journal.sqlite3")
+    os.environ["BIBLE_DB_PATH"] = os.path.join(workdir, "no-bible.sqlite3")
+    os.environ["BIBLE_API_URL"] = bible_api.url
+
+    bench = Bench(supabase, bible_api, os.environ["WRITE_JOURNAL_PATH"])
+    started = time.time()
+    bench.scenario("login", bench.login_scenario, max(1, args.iterations // 4))
+    bench.scenario("pages", bench.pages_scenario, max(1, args.iterations // 4))
+    bench.scenario("verse_lookup", bench.verse_lookup_scenario, args.iterations)
+    bench.scenario("waec_quiz", bench.waec_quiz_scenario, args.iterations)
+    bench.scenario("send_message", bench.send_message_scenario, args.iterations)
+    bench.scenario("group_search", bench.group_search_scenario, args.iterations)
+    memory = bench.memory(args.sessions)
+
+    import streamlit
+
+    results = {
+        "meta": {
+            "commit": git_commit(),
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(started)),
+            "duration_s": round(time.time() - started, 1),
+            "python": platform.python_version(),
+            "streamlit": streamlit.__version__,
+            "iterations": args.iterations,
+            "latency_ms": args.latency_ms,
+            "contacts": args.contacts,
+        },
+        "scenarios": bench.results,
+        "memory": memory,
+    }
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nWrote {args.out}")
+
+    supabase.stop()
+    bible_api.stop()
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressed = compare(results, json.load(f), args.max_regression)
+        if regressed:
+            print("Regressed: " + ", ".join(regressed))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""Whole-chapter Bible reads with background prefetch of the neighbouring chapters.
+
+Chapters are cached in a shared ``TTLCache``.  Every foreground read schedules
+the next/previous chapters of the same book on a small thread pool, so paging
+through a book is normally served from memory.  ``stats()`` reports how often
+a foreground read found a chapter that the prefetcher had already warmed.
+
+Without the offline store the number of chapters in a book is only an upper
+bound.  A chapter the source reports as missing (``ChapterNotFound``) marks
+the end of its book: the prefetcher warms the chapters ahead in order, stops
+at the first missing one and never schedules past it again.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from bible_store import book_key
+
+
+class ChapterNotFound(LookupError):
+    """The source has no such chapter (past the end of the book)"""
+
+
+class ChapterPrefetcher:
+    """Serve chapters from cache and warm adjacent ones on a background pool.
+
+    ``fetch_chapter(book, chapter)`` loads one chapter from the source of
+    truth (offline store or API) and raises ``ChapterNotFound`` for a
+    chapter that doesn't exist; ``chapter_count(book)`` bounds the
+    neighbours.  ``ahead``/``behind`` control how far the prefetcher reads.
+    """
+
+    def __init__(self, cache, fetch_chapter, chapter_count, ahead=2, behind=1, workers=4):
+        self.cache = cache
+        self.fetch_chapter = fetch_chapter
+        self.chapter_count = chapter_count
+        self.ahead = ahead
+        self.behind = behind
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bible-prefetch")
+        self._lock = threading.Lock()
+        self._scheduled = set()   # keys queued or being warmed
+        self._warmed = set()      # keys warmed by the prefetcher and not read yet
+        self._ends = {}           # book key -> last chapter, learned from a missing one
+        self.reads = 0
+        self.cache_hits = 0
+        self.prefetch_hits = 0
+        self.prefetches = 0
+        self.prefetch_errors = 0
+        self.past_end = 0
+
+    @staticmethod
+    def key(book, chapter):
+        return ("chapter", book_key(book), int(chapter))
+
+    def get(self, book, chapter):
+        """Return [(verse, text)] for a chapter and prefetch its neighbours"""
+        key = self.key(book, chapter)
+        cached = key in self.cache
+        with self._lock:
+            self.reads += 1
+            if cached:
+                self.cache_hits += 1
+            if key in self._warmed:
+                self._warmed.discard(key)
+                if cached:
+                    self.prefetch_hits += 1
+        try:
+            return self.cache.get_or_load(key, lambda: self.fetch_chapter(book, chapter))
+        except ChapterNotFound:
+            self._found_end(book, chapter)
+            raise
+        finally:
+            self.prefetch_around(book, chapter)
+
+    def peek(self, book, chapter):
+        """Return a cached chapter without loading it, or None"""
+        return self.cache.get(self.key(book, chapter))
+
+    def last_chapter(self, book):
+        """Upper bound on the book's chapters, lowered once a missing chapter has been seen"""
+        last = self.chapter_count(book)
+        with self._lock:
+            end = self._ends.get(book_key(book))
+        return min(last, end) if end is not None else last
+
+    def _found_end(self, book, chapter):
+        with self._lock:
+            self.past_end += 1
+            key = book_key(book)
+            self._ends[key] = min(self._ends.get(key, chapter - 1), chapter - 1)
+
+    def prefetch_around(self, book, chapter):
+        last = self.last_chapter(book)
+        ahead = [chapter + i for i in range(1, self.ahead + 1) if chapter + i <= last]
+        behind = [chapter - i for i in range(1, self.behind + 1) if 1 <= chapter - i <= last]
+        # Ahead in order, so the first missing chapter stops the run
+        self._schedule(book, ahead)
+        for neighbour in behind:
+            self._schedule(book, [neighbour])
+
+    def _schedule(self, book, chapters):
+        run = []
+        with self._lock:
+            for chapter in chapters:
+                key = self.key(book, chapter)
+                if key in self._scheduled or key in self.cache:
+                    continue
+                self._scheduled.add(key)
+                self.prefetches += 1
+                run.append((key, chapter))
+        if run:
+            self._executor.submit(self._warm, book, run)
+
+    def _warm(self, book, run):
+        for index, (key, chapter) in enumerate(run):
+            try:
+                self.cache.get_or_load(key, lambda: self.fetch_chapter(book, chapter))
+                with self._lock:
+                    self._warmed.add(key)
+            except ChapterNotFound:
+                self._found_end(book, chapter)
+                with self._lock:
+                    for later, _ in run[index:]:
+                        self._scheduled.discard(later)
+                return
+            except Exception:
+                with self._lock:
+                    self.prefetch_errors += 1
+            with self._lock:
+                self._scheduled.discard(key)
+
+    def stats(self):
+        """Return read/prefetch counters; prefetch_hit_rate is the share of reads served by a prefetch"""
+        with self._lock:
+            return {
+                "reads": self.reads,
+                "cache_hits": self.cache_hits,
+                "prefetch_hits": self.prefetch_hits,
+                "prefetches": self.prefetches,
+                "prefetch_errors": self.prefetch_errors,
+                "past_end": self.past_end,
+                "pending": len(self._scheduled),
+                "prefetch_hit_rate": (self.prefetch_hits / self.reads) if self.reads else 0.0,
+                "prefetch_usefulness": (self.prefetch_hits / self.prefetches) if self.prefetches else 0.0,
+            }
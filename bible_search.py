@@ -0,0 +1,220 @@
+"""Full-text verse search over the offline Bible.
+
+An inverted index with positional postings is built once per process from
+the ``BibleStore``.  Plain words are ranked with BM25; ``"quoted phrases"``
+must match as consecutive words.  Postings are kept in compact ``array``
+buffers so the whole index of ~31k verses stays at a few megabytes.
+"""
+
+import heapq
+import html
+import math
+import re
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+
+TOKEN_RE = re.compile(r"[A-Za-z0-9]+(?:'[A-Za-z]+)?")
+PHRASE_RE = re.compile(r'"([^"]+)"')
+
+# Skipped when ranking loose words (but kept inside phrases); "not" is deliberately absent
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from had has have he her him his i in is it its me my "
+    "of on or our shall she so that the their them they this thou thee thy to unto was we "
+    "were which who will with ye you your".split()
+)
+
+SNIPPET_CHARS = 220
+
+
+def stem(word):
+    """Very light suffix stripping so "anxious"/"anxiety" or "loves"/"loved" meet"""
+    w = word.lower().replace("'", "")
+    for suffix, min_len in (("iety", 4), ("ious", 4), ("ness", 4), ("ing", 4), ("eth", 4), ("est", 4),
+                            ("ed", 4), ("ly", 4), ("es", 4), ("s", 3)):
+        if w.endswith(suffix) and len(w) - len(suffix) >= min_len - 1:
+            w = w[: -len(suffix)]
+            break
+    if len(w) > 3 and w.endswith("e"):
+        w = w[:-1]
+    return w
+
+
+def tokenize(text):
+    """Return the stemmed terms of a text in order"""
+    return [stem(m.group()) for m in TOKEN_RE.finditer(text)]
+
+
+class _Postings:
+    """Compact postings for one term.
+
+    ``docs``/``tfs`` are parallel arrays used for BM25; ``positions`` holds the
+    term's global token positions (document offset + position in the verse),
+    which lets phrase matching run as C-level set intersections.
+    """
+
+    __slots__ = ("docs", "tfs", "positions")
+
+    def __init__(self):
+        self.docs = array("I")
+        self.tfs = array("H")
+        self.positions = array("I")
+
+    def add(self, doc_id, positions):
+        self.docs.append(doc_id)
+        self.tfs.append(min(len(positions), 65535))
+        self.positions.extend(positions)
+
+
+class BibleSearchIndex:
+    """Inverted index over every verse with BM25 ranking and phrase queries"""
+
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings = {}
+        self._refs = []           # doc_id -> (book, chapter, verse)
+        self._texts = []          # doc_id -> verse text
+        self._lengths = array("H")
+        self._starts = array("I")  # doc_id -> global position of its first token
+        self._norms = []          # doc_id -> BM25 length normalisation, filled by finish()
+        self.build_seconds = 0.0
+
+    @classmethod
+    def from_store(cls, store):
+        """Build the index from every verse in a BibleStore"""
+        index = cls()
+        started = time.perf_counter()
+        names = {}
+        for book_id, chapter, verse, text in store.iter_verses():
+            if book_id not in names:
+                names[book_id] = store.book_name(book_id)
+            index.add(names[book_id], chapter, verse, text)
+        index.finish()
+        index.build_seconds = time.perf_counter() - started
+        return index
+
+    def __len__(self):
+        return len(self._refs)
+
+    def add(self, book, chapter, verse, text):
+        doc_id = len(self._refs)
+        # Leave a one-position gap after the previous verse so phrases can't span two verses
+        start = self._starts[-1] + self._lengths[-1] + 1 if self._refs else 0
+        self._refs.append((book, chapter, verse))
+        self._texts.append(text)
+        self._starts.append(start)
+        terms = tokenize(text)
+        self._lengths.append(min(len(terms), 65535))
+        by_term = {}
+        for position, term in enumerate(terms[:65535]):
+            by_term.setdefault(term, []).append(start + position)
+        for term, positions in by_term.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = _Postings()
+            postings.add(doc_id, positions)
+
+    def finish(self):
+        """Precompute per-document BM25 length normalisation once all verses are added"""
+        avg = (sum(self._lengths) / len(self._lengths)) if self._lengths else 1.0
+        k1, b = self.k1, self.b
+        self._norms = [k1 * (1 - b + b * length / avg) for length in self._lengths]
+
+    def search(self, query, limit=10):
+        """Return the top results for a query as a list of dicts, best first"""
+        phrases = [tokenize(p) for p in PHRASE_RE.findall(query)]
+        phrases = [p for p in phrases if p]
+        loose = tokenize(PHRASE_RE.sub(" ", query))
+
+        terms = set(loose)
+        for phrase in phrases:
+            terms.update(phrase)
+        ranked_terms = {t for t in terms if t not in STOPWORDS} or terms
+        ranked_terms = [t for t in ranked_terms if t in self._postings]
+        if not ranked_terms:
+            return []
+
+        allowed = None
+        for phrase in phrases:
+            matches = self._phrase_docs(phrase)
+            allowed = matches if allowed is None else allowed & matches
+            if not allowed:
+                return []
+
+        scores = {}
+        get = scores.get
+        norms = self._norms
+        n_docs = len(self._refs)
+        for term in ranked_terms:
+            postings = self._postings[term]
+            df = len(postings.docs)
+            weight = math.log(1 + (n_docs - df + 0.5) / (df + 0.5)) * (self.k1 + 1)
+            if allowed is None:
+                for doc_id, tf in zip(postings.docs, postings.tfs):
+                    scores[doc_id] = get(doc_id, 0.0) + weight * tf / (tf + norms[doc_id])
+            else:
+                docs, tfs = postings.docs, postings.tfs
+                for doc_id in allowed:
+                    slot = bisect_left(docs, doc_id)
+                    if slot < len(docs) and docs[slot] == doc_id:
+                        tf = tfs[slot]
+                        scores[doc_id] = get(doc_id, 0.0) + weight * tf / (tf + norms[doc_id])
+
+        top = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        highlight_terms = set(ranked_terms) | {t for phrase in phrases for t in phrase}
+        return [self._result(doc_id, score, highlight_terms) for doc_id, score in top]
+
+    def _phrase_docs(self, phrase):
+        postings = [self._postings.get(term) for term in phrase]
+        if any(p is None for p in postings):
+            return set()
+        if len(phrase) == 1:
+            return set(postings[0].docs)
+
+        # A phrase starts at global position g when term k occurs at g + k for every k
+        order = sorted(range(len(phrase)), key=lambda k: len(postings[k].positions))
+        starts = None
+        for k in order:
+            shifted = {g - k for g in postings[k].positions} if k else set(postings[k].positions)
+            starts = shifted if starts is None else starts & shifted
+            if not starts:
+                return set()
+        doc_starts = self._starts
+        return {bisect_right(doc_starts, g) - 1 for g in starts}
+
+    def _result(self, doc_id, score, terms):
+        book, chapter, verse = self._refs[doc_id]
+        text = self._texts[doc_id]
+        return {
+            "book": book,
+            "chapter": chapter,
+            "verse": verse,
+            "reference": f"{book} {chapter}:{verse}",
+            "text": text,
+            "snippet": highlight(text, terms),
+            "score": round(score, 3),
+        }
+
+
+def highlight(text, terms, max_chars=SNIPPET_CHARS):
+    """Return HTML-escaped text with matching words wrapped in <mark>, trimmed around the first hit"""
+    matches = [m for m in TOKEN_RE.finditer(text) if stem(m.group()) in terms]
+    start, end = 0, len(text)
+    if len(text) > max_chars:
+        first = matches[0].start() if matches else 0
+        start = max(0, min(first - max_chars // 3, len(text) - max_chars))
+        end = start + max_chars
+
+    parts = ["…" if start > 0 else ""]
+    cursor = start
+    for m in matches:
+        if m.start() < start or m.end() > end:
+            continue
+        parts.append(html.escape(text[cursor:m.start()]))
+        parts.append(f"<mark>{html.escape(m.group())}</mark>")
+        cursor = m.end()
+    parts.append(html.escape(text[cursor:end]))
+    if end < len(text):
+        parts.append("…")
+    return "".join(parts)
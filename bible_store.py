@@ -0,0 +1,216 @@
+"""Offline Bible corpus stored in a single read-only SQLite file.
+
+The file is built by ``tools/build_bible_db.py`` from a public-domain
+translation dump.  It is opened once per process, read-only and
+memory-mapped, so lookups need no network and several Streamlit workers on
+the same machine share the same page cache.
+
+Layout::
+
+    meta(key, value)
+    books(id, name)                                   -- canonical order
+    chapters(book_id, chapter, verses)                -- verse count per chapter
+    verses(book_id, chapter, verse, text)             -- WITHOUT ROWID, keyed by the triple
+"""
+
+import sqlite3
+import threading
+
+MMAP_SIZE = 256 * 1024 * 1024
+
+CANONICAL_BOOKS = [
+    "Genesis", "Exodus", "Leviticus", "Numbers", "Deuteronomy", "Joshua", "Judges", "Ruth",
+    "1 Samuel", "2 Samuel", "1 Kings", "2 Kings", "1 Chronicles", "2 Chronicles", "Ezra",
+    "Nehemiah", "Esther", "Job", "Psalms", "Proverbs", "Ecclesiastes", "Song of Solomon",
+    "Isaiah", "Jeremiah", "Lamentations", "Ezekiel", "Daniel", "Hosea", "Joel", "Amos",
+    "Obadiah", "Jonah", "Micah", "Nahum", "Habakkuk", "Zephaniah", "Haggai", "Zechariah",
+    "Malachi", "Matthew", "Mark", "Luke", "John", "Acts", "Romans", "1 Corinthians",
+    "2 Corinthians", "Galatians", "Ephesians", "Philippians", "Colossians",
+    "1 Thessalonians", "2 Thessalonians", "1 Timothy", "2 Timothy", "Titus", "Philemon",
+    "Hebrews", "James", "1 Peter", "2 Peter", "1 John", "2 John", "3 John", "Jude",
+    "Revelation",
+]
+
+BOOK_ALIASES = {
+    "psalm": "Psalms",
+    "songofsongs": "Song of Solomon",
+    "canticles": "Song of Solomon",
+    "revelations": "Revelation",
+}
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE books (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE chapters (
+    book_id INTEGER NOT NULL,
+    chapter INTEGER NOT NULL,
+    verses INTEGER NOT NULL,
+    PRIMARY KEY (book_id, chapter)
+) WITHOUT ROWID;
+CREATE TABLE verses (
+    book_id INTEGER NOT NULL,
+    chapter INTEGER NOT NULL,
+    verse INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (book_id, chapter, verse)
+) WITHOUT ROWID;
+"""
+
+
+def book_key(name):
+    """Normalize a book name for lookups ("1 John" / "1john" / "1JOHN" -> "1john")"""
+    return "".join(str(name).split()).lower()
+
+
+class BibleStore:
+    """Read-only access to an offline Bible file.
+
+    Book names and chapter/verse bounds are loaded into memory when the store
+    is opened; verse text is read through a single shared connection.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(f"file:{path}?mode=ro&immutable=1", uri=True, check_same_thread=False)
+        self._conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        self._conn.execute("PRAGMA query_only=1")
+
+        self.meta = dict(self._conn.execute("SELECT key, value FROM meta"))
+        self._books = []       # [(book_id, name)] in canonical order
+        self._book_ids = {}    # book_key -> book_id
+        self._names = {}       # book_id -> name
+        for book_id, name in self._conn.execute("SELECT id, name FROM books ORDER BY id"):
+            self._books.append((book_id, name))
+            self._book_ids[book_key(name)] = book_id
+            self._names[book_id] = name
+        for alias, name in BOOK_ALIASES.items():
+            if book_key(name) in self._book_ids:
+                self._book_ids.setdefault(alias, self._book_ids[book_key(name)])
+
+        self._verse_counts = {}  # book_id -> [verses in chapter 1, chapter 2, ...]
+        for book_id, chapter, verses in self._conn.execute(
+            "SELECT book_id, chapter, verses FROM chapters ORDER BY book_id, chapter"
+        ):
+            self._verse_counts.setdefault(book_id, []).append(verses)
+
+    @property
+    def translation(self):
+        return self.meta.get("translation", "")
+
+    def close(self):
+        self._conn.close()
+
+    def book_id(self, book):
+        """Return the numeric id for a book name, or None"""
+        return self._book_ids.get(book_key(book))
+
+    def book_name(self, book_id):
+        return self._names.get(book_id)
+
+    def books(self):
+        """Return the book names in canonical order"""
+        return [name for _, name in self._books]
+
+    def chapter_count(self, book):
+        book_id = self.book_id(book)
+        return len(self._verse_counts.get(book_id, ())) if book_id else 0
+
+    def verse_count(self, book, chapter):
+        book_id = self.book_id(book)
+        counts = self._verse_counts.get(book_id, ())
+        if 1 <= chapter <= len(counts):
+            return counts[chapter - 1]
+        return 0
+
+    def reference(self, book, chapter, verse=None):
+        name = self._names.get(self.book_id(book), book)
+        return f"{name} {chapter}:{verse}" if verse else f"{name} {chapter}"
+
+    def get_verse(self, book, chapter, verse):
+        """Return (text, reference) for a verse, or None if it doesn't exist"""
+        book_id = self.book_id(book)
+        if book_id is None:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text FROM verses WHERE book_id = ? AND chapter = ? AND verse = ?",
+                (book_id, int(chapter), int(verse)),
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], f"{self._names[book_id]} {chapter}:{verse}"
+
+    def get_chapter(self, book, chapter):
+        """Return [(verse, text)] for a whole chapter (empty if it doesn't exist)"""
+        book_id = self.book_id(book)
+        if book_id is None:
+            return []
+        with self._lock:
+            return self._conn.execute(
+                "SELECT verse, text FROM verses WHERE book_id = ? AND chapter = ? ORDER BY verse",
+                (book_id, int(chapter)),
+            ).fetchall()
+
+    def iter_verses(self):
+        """Yield (book_id, chapter, verse, text) for the whole Bible in order"""
+        conn = sqlite3.connect(f"file:{self.path}?mode=ro&immutable=1", uri=True)
+        try:
+            yield from conn.execute("SELECT book_id, chapter, verse, text FROM verses ORDER BY book_id, chapter, verse")
+        finally:
+            conn.close()
+
+
+def build_store(path, rows, translation=""):
+    """Write a new Bible file from an iterable of (book, chapter, verse, text).
+
+    Books are numbered in canonical order when they are known and in order of
+    first appearance otherwise.  Returns the number of verses written.
+    """
+    canonical = {book_key(name): i + 1 for i, name in enumerate(CANONICAL_BOOKS)}
+    canonical.update({alias: canonical[book_key(name)] for alias, name in BOOK_ALIASES.items()})
+
+    conn = sqlite3.connect(path)
+    try:
+        conn.executescript(SCHEMA)
+        book_ids = {}
+        next_extra_id = len(CANONICAL_BOOKS) + 1
+        counts = {}
+        batch = []
+        total = 0
+
+        for book, chapter, verse, text in rows:
+            key = book_key(book)
+            book_id = book_ids.get(key)
+            if book_id is None:
+                book_id = canonical.get(key)
+                if book_id is None:
+                    book_id = next_extra_id
+                    next_extra_id += 1
+                name = CANONICAL_BOOKS[book_id - 1] if book_id <= len(CANONICAL_BOOKS) else str(book).strip()
+                book_ids[key] = book_id
+                conn.execute("INSERT OR IGNORE INTO books (id, name) VALUES (?, ?)", (book_id, name))
+
+            chapter, verse = int(chapter), int(verse)
+            counts[(book_id, chapter)] = max(counts.get((book_id, chapter), 0), verse)
+            batch.append((book_id, chapter, verse, " ".join(str(text).split())))
+            if len(batch) >= 5000:
+                conn.executemany("INSERT OR REPLACE INTO verses VALUES (?, ?, ?, ?)", batch)
+                total += len(batch)
+                batch = []
+
+        conn.executemany("INSERT OR REPLACE INTO verses VALUES (?, ?, ?, ?)", batch)
+        total += len(batch)
+        conn.executemany(
+            "INSERT INTO chapters VALUES (?, ?, ?)",
+            [(book_id, chapter, verses) for (book_id, chapter), verses in sorted(counts.items())],
+        )
+        conn.executemany(
+            "INSERT INTO meta VALUES (?, ?)",
+            [("translation", translation), ("verses", str(total))],
+        )
+        conn.commit()
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    return total
@@ -0,0 +1,157 @@
+"""Process-wide window of recent messages per chat, shared by every session viewing it.
+
+Each open chat has one ``ChatWindow`` holding its newest messages (at most
+``size``).  It is loaded with one query however many sessions open the chat
+at once, extended when a message is sent or pushed by realtime, and polled
+for newer messages at most once per interval whatever the number of viewers.
+Windows live in a ``TTLCache``: chats nobody reads are evicted least recently
+used first, and a window is reloaded from the database after ``ttl`` seconds
+as a resync.  Database load and memory therefore grow with the number of
+active chats rather than with the number of sessions viewing them.
+
+Messages are stored in the viewer-independent shape produced by
+``to_message`` (the renderer decides which are the viewer's own).
+"""
+
+import threading
+import time
+
+from ttl_cache import TTLCache
+
+
+class ChatWindow:
+    """Newest messages of one chat, oldest first.
+
+    ``messages`` is replaced, never changed in place, so a session can keep
+    rendering the list it got while another thread extends the window.
+    """
+
+    def __init__(self, messages, has_older):
+        self.lock = threading.Lock()
+        self.messages = messages
+        self.keys = {msg["id"] for msg in messages}
+        self.has_older = has_older
+        self.checked = time.monotonic()
+
+    @property
+    def oldest(self):
+        """Smallest database seq in the window (the cursor for older pages)"""
+        return min((msg["seq"] for msg in self.messages if msg.get("seq") is not None), default=None)
+
+    @property
+    def newest(self):
+        """Largest database seq in the window (the cursor for newer messages)"""
+        return max((msg["seq"] for msg in self.messages if msg.get("seq") is not None), default=None)
+
+    def _replace(self, messages):
+        # Caller holds self.lock
+        self.messages = messages
+        self.keys = {msg["id"] for msg in messages}
+
+
+class ChatCache:
+    """Shared recent-message windows of every active chat.
+
+    ``load_page(chat_id, newer_than=None, older_than=None, limit=...)``
+    returns message rows oldest first, paging on the ``seq`` of the messages
+    ``to_message`` builds, ``to_message(row)`` converts a row and
+    ``key_of(row)`` names it the way ``to_message`` ids it.
+    """
+
+    def __init__(self, load_page, to_message, key_of, size=200, page_size=50, max_chats=500, ttl=600):
+        self.load_page = load_page
+        self.to_message = to_message
+        self.key_of = key_of
+        self.size = size
+        self.page_size = page_size
+        self._windows = TTLCache(maxsize=max_chats, ttl=ttl, negative_ttl=5)
+        self.loads = 0
+        self.refreshes = 0
+        self.appended = 0
+
+    def window(self, chat_id):
+        """The chat's window, loading its newest page once however many sessions ask at the same time"""
+        return self._windows.get_or_load(chat_id, lambda: self._load(chat_id))
+
+    def peek(self, chat_id):
+        """The chat's window if it is cached, without loading"""
+        return self._windows.get(chat_id)
+
+    def _load(self, chat_id):
+        rows = self.load_page(chat_id, limit=self.page_size)
+        self.loads += 1
+        return ChatWindow([self.to_message(row) for row in rows], has_older=len(rows) == self.page_size)
+
+    def add(self, chat_id, row):
+        """Append a sent or pushed message row to the chat's window if it is cached; True if it was new"""
+        window = self._windows.get(chat_id)
+        if window is None:
+            return False
+        with window.lock:
+            return self._append(window, [row])
+
+    def _append(self, window, rows):
+        # Caller holds window.lock
+        new = []
+        keys = set(window.keys)
+        for row in rows:
+            key = self.key_of(row)
+            if key not in keys:
+                keys.add(key)
+                new.append(self.to_message(row))
+        if not new:
+            return False
+        messages = window.messages + new
+        if len(messages) > self.size:
+            messages = messages[-self.size:]
+            window.has_older = True
+        window._replace(messages)
+        self.appended += len(new)
+        return True
+
+    def refresh(self, chat_id, interval):
+        """The chat's window after fetching newer messages, at most once per interval for all sessions together"""
+        window = self.window(chat_id)
+        if time.monotonic() - window.checked < interval or not window.lock.acquire(blocking=False):
+            # Fresh enough, or another session is refreshing it right now
+            return window
+        try:
+            window.checked = time.monotonic()
+            if window.newest is None:
+                rows = self.load_page(chat_id, limit=self.page_size)
+            else:
+                rows = self.load_page(chat_id, newer_than=window.newest, limit=self.size)
+            self.refreshes += 1
+            behind = len(rows) >= self.size
+            if not behind:
+                self._append(window, rows)
+        finally:
+            window.lock.release()
+        if behind:
+            # Fell too far behind: start again from the newest page
+            self._windows.invalidate(chat_id)
+            return self.window(chat_id)
+        return window
+
+    def extend_older(self, chat_id):
+        """Prepend the page before the window's oldest message while the window has room; True if it grew"""
+        window = self.window(chat_id)
+        with window.lock:
+            if len(window.messages) >= self.size or not window.has_older:
+                return False
+            rows = self.load_page(chat_id, older_than=window.oldest, limit=self.page_size)
+            older = [self.to_message(row) for row in rows if self.key_of(row) not in window.keys]
+            window.has_older = len(rows) == self.page_size and bool(older)
+            if not older:
+                return False
+            room = self.size - len(window.messages)
+            if len(older) > room:
+                older = older[-room:]
+                window.has_older = True
+            window._replace(older + window.messages)
+            return True
+
+    def stats(self):
+        stats = self._windows.stats()
+        stats.update(loads=self.loads, refreshes=self.refreshes, appended=self.appended)
+        return stats
@@ -0,0 +1,182 @@
+"""Realtime delivery of new chat messages to the sessions viewing them.
+
+``ChatHub`` fans a new message out to one bounded queue per subscribed
+session.  Messages reach the hub from two sources:
+
+* ``send_message()`` publishes directly, so viewers in the same process see a
+  message as soon as it is written (this is also the local pub/sub used in
+  demo mode and tests);
+* ``SupabaseRealtimeListener``, a background thread subscribed to INSERTs on
+  ``public.messages``, delivers messages written by other processes.
+
+A chat pane drains its queue from a ``st.fragment`` that reruns on a short
+timer, so only that region of the page is recomputed.  Each delivery records
+its insert-to-render latency, reported by ``ChatHub.stats()``.
+"""
+
+import asyncio
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+QUEUE_SIZE = 500          # pending messages per subscriber before it is dropped
+IDLE_SUBSCRIBER_SECONDS = 300
+LATENCY_SAMPLES = 5000
+
+
+class Subscription:
+    """One session's queue of new messages for one chat"""
+
+    def __init__(self, hub, chat_id, token):
+        self.hub = hub
+        self.chat_id = chat_id
+        self.token = token
+        self.queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self.last_drained = time.monotonic()
+        self.closed = False
+
+    def drain(self):
+        """Return [(row, inserted_at)] delivered since the last drain"""
+        self.last_drained = time.monotonic()
+        items = []
+        while True:
+            try:
+                items.append(self.queue.get_nowait())
+            except queue.Empty:
+                return items
+
+    def close(self):
+        self.hub.unsubscribe(self)
+
+
+class ChatHub:
+    """Process-wide fan-out of chat messages to per-session queues.
+
+    ``on_publish(chat_id, row)``, if given, sees every message before the
+    subscribers do (the shared chat cache appends it there).
+    """
+
+    def __init__(self, on_publish=None):
+        self.on_publish = on_publish
+        self._subscribers = {}   # chat_id -> {token: Subscription}
+        self._lock = threading.Lock()
+        self._tokens = itertools.count(1)
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.live = False        # True while a realtime listener is connected
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    def subscribe(self, chat_id):
+        sub = Subscription(self, chat_id, next(self._tokens))
+        with self._lock:
+            self._subscribers.setdefault(chat_id, {})[sub.token] = sub
+        return sub
+
+    def unsubscribe(self, sub):
+        sub.closed = True
+        with self._lock:
+            subs = self._subscribers.get(sub.chat_id)
+            if subs:
+                subs.pop(sub.token, None)
+                if not subs:
+                    del self._subscribers[sub.chat_id]
+
+    def publish(self, chat_id, row, inserted_at=None):
+        """Queue a new message row for everyone viewing chat_id"""
+        if chat_id is None:
+            return
+        if self.on_publish is not None:
+            self.on_publish(chat_id, row)
+        item = (row, inserted_at or time.time())
+        now = time.monotonic()
+        stale = []
+        with self._lock:
+            self.published += 1
+            for sub in self._subscribers.get(chat_id, {}).values():
+                try:
+                    sub.queue.put_nowait(item)
+                    self.delivered += 1
+                except queue.Full:
+                    stale.append(sub)
+                    continue
+                if now - sub.last_drained > IDLE_SUBSCRIBER_SECONDS:
+                    # The session went away without unsubscribing
+                    stale.append(sub)
+        for sub in stale:
+            self.dropped += 1
+            self.unsubscribe(sub)
+
+    def record_render(self, inserted_ats):
+        """Record insert-to-render latency for messages that were just rendered"""
+        now = time.time()
+        with self._lock:
+            self._latencies.extend(max(0.0, now - t) for t in inserted_ats)
+
+    def stats(self):
+        with self._lock:
+            latencies = sorted(self._latencies)
+            active = len(self._subscribers)
+            subscribers = sum(len(subs) for subs in self._subscribers.values())
+
+        def pct(p):
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))]
+
+        return {
+            "live": self.live,
+            "active_chats": active,
+            "subscribers": subscribers,
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped_subscribers": self.dropped,
+            "latency_p50": pct(50),
+            "latency_p95": pct(95),
+            "latency_p99": pct(99),
+        }
+
+
+def _parse_timestamp(value):
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+class SupabaseRealtimeListener(threading.Thread):
+    """Background thread that forwards INSERTs on a table to the hub via Supabase realtime"""
+
+    def __init__(self, supabase_url, supabase_key, hub, table="messages", retry_seconds=5):
+        super().__init__(name="supabase-realtime", daemon=True)
+        ws_url = supabase_url.replace("https://", "wss://", 1).replace("http://", "ws://", 1)
+        self.socket_url = f"{ws_url}/realtime/v1/websocket?apikey={supabase_key}&vsn=1.0.0"
+        self.hub = hub
+        self.table = table
+        self.retry_seconds = retry_seconds
+        self.errors = 0
+
+    def run(self):
+        from realtime.connection import Socket
+
+        asyncio.set_event_loop(asyncio.new_event_loop())
+        while True:
+            try:
+                socket = Socket(self.socket_url, auto_reconnect=True)
+                socket.connect()
+                channel = socket.set_channel(f"realtime:public:{self.table}")
+                channel.join().on("INSERT", self._on_insert)
+                self.hub.live = True
+                socket.listen()
+            except Exception:
+                self.errors += 1
+            self.hub.live = False
+            time.sleep(self.retry_seconds)
+
+    def _on_insert(self, payload):
+        row = payload.get("record") or {}
+        inserted_at = _parse_timestamp(payload.get("commit_timestamp")) or time.time()
+        self.hub.publish(row.get("chat_id"), row, inserted_at=inserted_at)
@@ -0,0 +1,48 @@
+"""HTML for the chat pane: the visible part of a chat as one escaped block.
+
+Drawing each message with its own ``st.markdown`` call cost one element (and
+one websocket delta) per loaded message on every rerun and put raw message
+text into HTML.  ``visible_window()`` picks the ``size`` messages on screen
+and ``messages_html()`` turns them into a single string with every
+user-supplied value escaped, so a rerun sends one element of bounded size
+however long the history is.
+"""
+
+import html
+
+
+def _escape(value):
+    # Newlines become <br>: a blank line would end the HTML block and let the
+    # rest of the message be parsed as markdown
+    return html.escape(str(value)).replace("\r", "").replace("\n", "<br>")
+
+
+def is_sent(message, me):
+    """Whether ``me`` wrote the message: its own ``type`` if it has one, else its sender"""
+    if "type" in message:
+        return message["type"] == "sent"
+    return me is not None and message.get("sender") == me
+
+
+def message_html(message, status_labels=None, me=None):
+    """One message bubble"""
+    if is_sent(message, me):
+        css = "chat-message user-message"
+        status = (status_labels or {}).get(message.get("status"), "")
+    else:
+        css = "chat-message other-message"
+        status = ""
+    return (f'<div class="{css}"><p>{_escape(message.get("text", ""))}</p>'
+            f'<p class="message-time">{_escape(message.get("timestamp", ""))}{_escape(status)}</p></div>')
+
+
+def messages_html(messages, status_labels=None, me=None):
+    """The visible messages as one chat container; ``me`` is the viewer's user id"""
+    return '<div class="chat-container">' + "".join(message_html(m, status_labels, me) for m in messages) + "</div>"
+
+
+def visible_window(messages, start, size):
+    """(messages on screen, index of the first) for a window starting at ``start``; None follows the newest"""
+    last_start = max(0, len(messages) - size)
+    start = last_start if start is None else min(max(0, start), last_start)
+    return messages[start:start + size], start
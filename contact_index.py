@@ -0,0 +1,214 @@
+"""Process-shared contact search over the profiles table.
+
+``ContactIndex`` holds one projected copy of every profile (id, username,
+number) per process instead of one per session.  It is loaded in id-ordered
+pages and refreshed in the background after ``ttl`` seconds.  Searches are
+ranked:
+
+* exact username or number;
+* username or number prefix (binary search over sorted keys);
+* username infix, found through a trigram index (queries of 3+ characters).
+
+Within a tier results are alphabetical, and callers page through them with
+``limit``/``offset``.
+"""
+
+import bisect
+import threading
+import time
+
+PREFIX_END = "\uffff"
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class _Snapshot:
+    """Immutable search structures for one load of the profiles"""
+
+    def __init__(self, records):
+        self.records = sorted(records, key=lambda r: (str(r.get("username") or "").lower(), str(r["id"])))
+        self.names = [str(r.get("username") or "").lower() for r in self.records]
+        self.by_id = {r["id"]: i for i, r in enumerate(self.records)}
+        numbers = sorted((str(r.get("number") or ""), i) for i, r in enumerate(self.records))
+        self.number_keys = [number for number, _ in numbers]
+        self.number_rows = [i for _, i in numbers]
+        self.trigrams = {}
+        for i, name in enumerate(self.names):
+            for gram in trigrams(name):
+                self.trigrams.setdefault(gram, []).append(i)
+
+    def prefix_names(self, q):
+        lo = bisect.bisect_left(self.names, q)
+        hi = bisect.bisect_left(self.names, q + PREFIX_END)
+        return range(lo, hi)
+
+    def prefix_numbers(self, q):
+        lo = bisect.bisect_left(self.number_keys, q)
+        hi = bisect.bisect_left(self.number_keys, q + PREFIX_END)
+        return [self.number_rows[i] for i in range(lo, hi)]
+
+    def infix_names(self, q):
+        lists = [self.trigrams.get(gram) for gram in trigrams(q)]
+        if not lists or any(l is None for l in lists):
+            return []
+        lists.sort(key=len)
+        candidates = set(lists[0])
+        for l in lists[1:]:
+            candidates.intersection_update(l)
+            if not candidates:
+                return []
+        return sorted(i for i in candidates if q in self.names[i])
+
+    def merged(self, updates):
+        """A new snapshot with each update merged into the record of the same id (or added)"""
+        records = {r["id"]: r for r in self.records}
+        for update in updates:
+            existing = records.get(update["id"])
+            records[update["id"]] = dict(existing, **update) if existing is not None else dict(update)
+        return _Snapshot(records.values())
+
+    def reflects(self, update):
+        """True if the record of the update's id already has all its values"""
+        i = self.by_id.get(update["id"])
+        return i is not None and all(self.records[i].get(k) == v for k, v in update.items())
+
+
+class ContactIndex:
+    """Shared in-memory contact search, reloaded from ``load_profiles()`` every ``ttl`` seconds.
+
+    ``load_profiles()`` returns an iterable of dicts with at least ``id``,
+    ``username`` and ``number``.  If it fails before anything was loaded the
+    index serves ``fallback`` instead.  Sessions that arrive while the first
+    load is running wait for it rather than loading the table themselves.
+    ``upsert`` changes are also kept aside and applied to every reload until
+    the loaded rows include them, since their writes may not have reached
+    the database yet.
+    """
+
+    def __init__(self, load_profiles, ttl=300, fallback=()):
+        self.load_profiles = load_profiles
+        self.ttl = ttl
+        self.fallback = list(fallback)
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._loaded_at = 0.0
+        self._refreshing = False
+        self._first_load = None   # Event set when the in-flight first load finishes
+        self._upserts = {}        # id -> upserted fields the loaded rows may not have yet
+        self.loads = 0
+        self.load_errors = 0
+        self.last_load_seconds = 0.0
+        self.searches = 0
+        self.search_seconds = 0.0
+
+    def _load(self):
+        started = time.perf_counter()
+        try:
+            snapshot = _Snapshot(list(self.load_profiles()))
+        except Exception:
+            with self._lock:
+                self.load_errors += 1
+                if self._snapshot is None:
+                    self._snapshot = _Snapshot(self.fallback)
+                self._loaded_at = time.monotonic()
+                self._refreshing = False
+            return
+        with self._lock:
+            if self._upserts:
+                self._upserts = {key: update for key, update in self._upserts.items() if not snapshot.reflects(update)}
+                if self._upserts:
+                    snapshot = snapshot.merged(self._upserts.values())
+            self._snapshot = snapshot
+            self._loaded_at = time.monotonic()
+            self._refreshing = False
+            self.loads += 1
+            self.last_load_seconds = time.perf_counter() - started
+
+    def _current(self):
+        """Return the live snapshot, loading it on first use and refreshing it in the background when stale"""
+        while True:
+            with self._lock:
+                snapshot = self._snapshot
+                if snapshot is not None:
+                    stale = not self._refreshing and time.monotonic() - self._loaded_at > self.ttl
+                    if stale:
+                        self._refreshing = True
+                    break
+                loading = self._first_load
+                leader = loading is None
+                if leader:
+                    loading = self._first_load = threading.Event()
+            if not leader:
+                # Another session is loading; if it failed outright, the loop retries
+                loading.wait()
+                continue
+            try:
+                self._load()
+            finally:
+                with self._lock:
+                    self._first_load = None
+                loading.set()
+        if stale:
+            threading.Thread(target=self._load, name="contact-index-refresh", daemon=True).start()
+        return snapshot
+
+    def search(self, query, limit=20, offset=0, exclude=None):
+        """Return (contacts, total) for a query; contacts is one page of dicts"""
+        started = time.perf_counter()
+        snapshot = self._current()
+        q = query.strip().lower().lstrip("#")
+        if not q:
+            ranked = range(len(snapshot.records))
+        else:
+            name_hits = snapshot.prefix_names(q)
+            number_hits = snapshot.prefix_numbers(q)
+            exact = [i for i in name_hits if snapshot.names[i] == q]
+            exact += [i for i in number_hits if str(snapshot.records[i].get("number")) == q]
+            prefix = sorted(set(name_hits) | set(number_hits))
+            infix = snapshot.infix_names(q) if len(q) >= 3 else []
+            ranked, seen = [], set()
+            for tier in (sorted(exact), prefix, infix):
+                for i in tier:
+                    if i not in seen:
+                        seen.add(i)
+                        ranked.append(i)
+
+        if exclude is not None and exclude in snapshot.by_id:
+            skip = snapshot.by_id[exclude]
+            ranked = [i for i in ranked if i != skip]
+        page = [dict(snapshot.records[i]) for i in ranked[offset:offset + limit]]
+        with self._lock:
+            self.searches += 1
+            self.search_seconds += time.perf_counter() - started
+        return page, len(ranked)
+
+    def get(self, contact_id):
+        """Return one contact by id, or None"""
+        snapshot = self._current()
+        i = snapshot.by_id.get(contact_id)
+        return dict(snapshot.records[i]) if i is not None else None
+
+    def upsert(self, record):
+        """Add or replace one contact (e.g. after a sign-up or a username change)"""
+        self._current()
+        with self._lock:
+            # Read, rebuild and swap under the lock so concurrent upserts don't drop each other
+            update = self._upserts[record["id"]] = dict(self._upserts.get(record["id"], {}), **record)
+            self._snapshot = self._snapshot.merged([update])
+
+    def __len__(self):
+        return len(self._current().records)
+
+    def stats(self):
+        with self._lock:
+            size = len(self._snapshot.records) if self._snapshot else 0
+            return {
+                "contacts": size,
+                "loads": self.loads,
+                "load_errors": self.load_errors,
+                "last_load_seconds": self.last_load_seconds,
+                "searches": self.searches,
+                "avg_search_ms": (self.search_seconds / self.searches * 1000) if self.searches else 0.0,
+            }
@@ -0,0 +1,139 @@
+"""Durable local write-ahead journal for database mutations.
+
+Every write the app makes is appended here (SQLite in WAL mode) before it is
+sent to Supabase, and removed only once Supabase has confirmed it.  If the
+process dies or Supabase is unreachable, the pending mutations survive and
+are replayed in order by the ``Outbox`` worker.  Entries are deduplicated by
+their idempotency key.  Writes the database keeps rejecting are moved to the
+``dead_letter`` table of the same file, where they can be inspected or
+re-queued by hand.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS journal (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    op_key TEXT NOT NULL UNIQUE,
+    table_name TEXT NOT NULL,
+    op TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    key_column TEXT,
+    on_conflict TEXT,
+    match TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS dead_letter (
+    seq INTEGER PRIMARY KEY,
+    op_key TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    op TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    key_column TEXT,
+    on_conflict TEXT,
+    match TEXT,
+    attempts INTEGER NOT NULL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    failed_at REAL NOT NULL
+);
+"""
+COLUMNS = "seq, op_key, table_name, op, payload, key_column, on_conflict, match, attempts"
+
+
+class JournalEntry:
+    """A pending mutation read back from the journal"""
+
+    __slots__ = ("seq", "key", "table", "op", "row", "key_column", "on_conflict", "match", "attempts")
+
+    def __init__(self, seq, key, table, op, payload, key_column, on_conflict, match, attempts):
+        self.seq = seq
+        self.key = key
+        self.table = table
+        self.op = op
+        self.row = json.loads(payload)
+        self.key_column = key_column
+        self.on_conflict = on_conflict
+        self.match = json.loads(match) if match else None
+        self.attempts = attempts
+
+
+class Journal:
+    """Append-only SQLite journal shared by every session of the process"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.executescript(SCHEMA)
+
+    def append(self, table, op, row, key, key_column=None, on_conflict=None, match=None):
+        """Record a mutation; returns False if one with the same key is already journaled"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO journal (op_key, table_name, op, payload, key_column, on_conflict, match, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, table, op, json.dumps(row, default=str), key_column, on_conflict,
+                 json.dumps(match, default=str) if match else None, time.time()),
+            )
+            return cursor.rowcount == 1
+
+    def head(self, limit, skip_tables=()):
+        """Return the oldest pending entries, in order, leaving out the tables in ``skip_tables``"""
+        skip_tables = list(skip_tables)
+        where = f" WHERE table_name NOT IN ({','.join('?' * len(skip_tables))})" if skip_tables else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {COLUMNS} FROM journal{where} ORDER BY seq LIMIT ?",
+                (*skip_tables, limit),
+            ).fetchall()
+        return [JournalEntry(*row) for row in rows]
+
+    def remove(self, seqs):
+        """Drop entries that Supabase has confirmed"""
+        with self._lock:
+            self._conn.executemany("DELETE FROM journal WHERE seq = ?", [(seq,) for seq in seqs])
+
+    def mark_failed(self, seqs, error):
+        """Count a failed attempt for each entry"""
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE journal SET attempts = attempts + 1, last_error = ? WHERE seq = ?",
+                [(str(error)[:500], seq) for seq in seqs],
+            )
+
+    def dead_letter(self, seqs, error):
+        """Move entries the database will not accept out of the journal"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for seq in seqs:
+                    self._conn.execute(
+                        f"INSERT OR REPLACE INTO dead_letter ({COLUMNS}, last_error, created_at, failed_at)"
+                        f" SELECT {COLUMNS.replace('attempts', 'attempts + 1')}, ?, created_at, ? FROM journal WHERE seq = ?",
+                        (str(error)[:500], time.time(), seq),
+                    )
+                    self._conn.execute("DELETE FROM journal WHERE seq = ?", (seq,))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def dead_letters(self, limit=100):
+        """The newest dead-lettered entries with their errors, newest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {COLUMNS}, last_error FROM dead_letter ORDER BY failed_at DESC LIMIT ?", (limit,),
+            ).fetchall()
+        return [(JournalEntry(*row[:-1]), row[-1]) for row in rows]
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM journal").fetchone()[0]
@@ -0,0 +1,239 @@
+"""Timed spans around upstream calls, per-rerun totals and a Prometheus endpoint.
+
+Every Supabase, auth and Bible API request is recorded as a span tagged with
+the page, the service, the table (or endpoint) and the operation.  A script
+run is wrapped in ``Metrics.rerun()``: spans made on its thread are collected
+and, when the run ends, go into the histograms under the page the run ended
+on, together with the run's duration and its total upstream time.  Spans from
+other threads (outbox, prefetcher, token refresh), from widget callbacks
+(which Streamlit runs before the script body) and from fragment runs are
+recorded immediately under ``page_of()`` and are not part of a rerun total.
+
+``exposition()`` renders everything in the Prometheus text format and
+``serve()`` exposes it at ``/metrics`` on a local port.  Comparing
+``teens_upstream_call_seconds_sum{page="Chat & Groups"}`` by ``target`` with
+``teens_rerun_seconds_sum{page="Chat & Groups"}`` shows which tables the chat
+page's reruns spend their time on.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+CALL_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50)
+BACKGROUND = "background"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Cumulative histogram per label combination (not thread-safe; Metrics locks around it)"""
+
+    def __init__(self, name, help, labels, buckets):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self._series = {}   # label values -> [bucket counts..., sum, count]
+
+    def observe(self, values, amount):
+        series = self._series.get(values)
+        if series is None:
+            series = self._series[values] = [0] * len(self.buckets) + [0.0, 0]
+        index = bisect.bisect_left(self.buckets, amount)
+        if index < len(self.buckets):
+            series[index] += 1
+        series[-2] += amount
+        series[-1] += 1
+
+    def lines(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        for values, series in sorted(self._series.items()):
+            labels = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(self.labels, values))
+            prefix = labels + "," if labels else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                yield f'{self.name}_bucket{{{prefix}le="{_format_number(bound)}"}} {cumulative}'
+            yield f'{self.name}_bucket{{{prefix}le="+Inf"}} {series[-1]}'
+            yield f"{self.name}_sum{{{labels}}} {series[-2]!r}"
+            yield f"{self.name}_count{{{labels}}} {series[-1]}"
+
+
+class Trace:
+    """Spans collected during one script run"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans = []   # (service, target, op, seconds, ok)
+
+
+class Metrics:
+    """Process-wide span and rerun histograms.
+
+    ``page_of()`` names the page to tag with; it is called on the thread that
+    made the call (or ended the rerun) and should return ``BACKGROUND`` off
+    the script threads.
+    """
+
+    def __init__(self, page_of=None):
+        self.page_of = page_of or (lambda: BACKGROUND)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.calls = Histogram("teens_upstream_call_seconds", "Duration of upstream calls",
+                               ("page", "service", "target", "op", "outcome"), LATENCY_BUCKETS)
+        self.reruns = Histogram("teens_rerun_seconds", "Duration of full script runs", ("page",), LATENCY_BUCKETS)
+        self.rerun_upstream = Histogram("teens_rerun_upstream_seconds", "Time a script run spent in upstream calls",
+                                        ("page", "service"), LATENCY_BUCKETS)
+        self.rerun_calls = Histogram("teens_rerun_upstream_calls", "Upstream calls made by a script run",
+                                     ("page",), CALL_COUNT_BUCKETS)
+        self.server = None
+
+    @contextmanager
+    def rerun(self):
+        """Collect the spans of the script run on this thread and record them when it ends"""
+        trace = Trace()
+        self._local.trace = trace
+        try:
+            yield trace
+        finally:
+            elapsed = time.perf_counter() - trace.started
+            self._local.trace = None
+            page = self.page_of()
+            upstream = {}
+            with self._lock:
+                for service, target, op, seconds, ok in trace.spans:
+                    self.calls.observe((page, service, target, op, "ok" if ok else "error"), seconds)
+                    upstream[service] = upstream.get(service, 0.0) + seconds
+                for service, seconds in upstream.items():
+                    self.rerun_upstream.observe((page, service), seconds)
+                self.rerun_calls.observe((page,), len(trace.spans))
+                self.reruns.observe((page,), elapsed)
+
+    @contextmanager
+    def span(self, service, target, op):
+        """Time the enclosed upstream call"""
+        started = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.record(service, target, op, time.perf_counter() - started, ok)
+
+    def record(self, service, target, op, seconds, ok=True):
+        trace = getattr(self._local, "trace", None)
+        if trace is not None:
+            trace.spans.append((service, target, op, seconds, ok))
+            return
+        page = self.page_of()
+        with self._lock:
+            self.calls.observe((page, service, target, op, "ok" if ok else "error"), seconds)
+
+    def exposition(self):
+        """All histograms in the Prometheus text format"""
+        with self._lock:
+            lines = [line for histogram in (self.reruns, self.rerun_upstream, self.rerun_calls, self.calls)
+                     for line in histogram.lines()]
+        return "\n".join(lines) + "\n"
+
+    def serve(self, host="127.0.0.1", port=9464):
+        """Serve ``/metrics`` from a background thread; returns the server"""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                data = metrics.exposition().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name="metrics-http", daemon=True).start()
+        return self.server
+
+
+def classify_supabase_request(method, path, prefer=""):
+    """(service, target, op) of a Supabase REST or auth request"""
+    segments = [segment for segment in path.split("/") if segment]
+    if segments[:2] == ["rest", "v1"] and len(segments) > 2:
+        if segments[2] == "rpc" and len(segments) > 3:
+            return "supabase", segments[3], "rpc"
+        if method == "POST":
+            op = "upsert" if "resolution=" in prefer else "insert"
+        else:
+            op = {"GET": "select", "HEAD": "count", "PATCH": "update", "DELETE": "delete"}.get(method, method.lower())
+        return "supabase", segments[2], op
+    if segments[:2] == ["auth", "v1"]:
+        return "auth", "/".join(segments[2:]) or "/", method.lower()
+    return "supabase", "other", method.lower()
+
+
+if httpx is not None:
+    class _TimedStream(httpx.SyncByteStream):
+        """Response body that records its span once it has been read and closed"""
+
+        def __init__(self, stream, done):
+            self._stream = stream
+            self._done = done
+
+        def __iter__(self):
+            yield from self._stream
+
+        def close(self):
+            try:
+                self._stream.close()
+            finally:
+                done, self._done = self._done, None
+                if done:
+                    done()
+
+    class TracedTransport(httpx.BaseTransport):
+        """httpx transport that records a span for every Supabase request it sends"""
+
+        def __init__(self, transport, metrics):
+            self._transport = transport
+            self._metrics = metrics
+
+        def handle_request(self, request):
+            service, target, op = classify_supabase_request(request.method, request.url.path,
+                                                            request.headers.get("prefer", ""))
+            if service == "auth" and target == "token":
+                op = request.url.params.get("grant_type", op)
+            started = time.perf_counter()
+            try:
+                response = self._transport.handle_request(request)
+            except Exception:
+                self._metrics.record(service, target, op, time.perf_counter() - started, ok=False)
+                raise
+            ok = response.status_code < 400
+            response.stream = _TimedStream(response.stream, lambda: self._metrics.record(
+                service, target, op, time.perf_counter() - started, ok))
+            return response
+
+        def close(self):
+            self._transport.close()
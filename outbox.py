@@ -0,0 +1,291 @@
+"""Write-behind outbox for database mutations, backed by a durable journal.
+
+Sessions hand rows to ``Outbox.submit()``, which appends them to the local
+``Journal`` and returns immediately.  A worker thread drains the journal to
+the database in order per table: inserts into the same table are written as
+one multi-row upsert keyed on an idempotency column, so a replayed batch
+never creates duplicates, and upserts on the same conflict columns are
+batched the same way.  An entry leaves the journal only once the write is
+confirmed.
+
+Failures are either transient (network errors, timeouts, HTTP 5xx, 408 and
+429: the database may accept the write later) or permanent (any other
+rejection, e.g. a missing table or column, a constraint or an RLS denial).
+A failed write blocks only later writes to its own table; other tables keep
+draining.  Transient failures are retried with backoff for as long as it
+takes; nothing is lost, including across restarts.  A write rejected
+permanently ``max_attempts`` times is moved to the journal's dead-letter
+table.
+
+Each live entry ends as ``"sent"`` or ``"failed"`` (dead-lettered).  After
+``max_attempts`` consecutive transient failures pending entries are reported
+as ``"queued"`` (stored locally, will be sent when the database is back) and
+report ``"sent"`` again later.  The ``on_done`` callback runs on the worker
+thread for every status change.
+"""
+
+import threading
+import time
+import uuid
+from collections import deque
+
+PENDING = "pending"
+SENT = "sent"
+QUEUED = "queued"
+FAILED = "failed"
+
+TRANSIENT_STATUS = {408, 425, 429}
+# SQLSTATE classes worth retrying: connection, resources, operator intervention
+# (timeouts, shutdown), transaction rollback (deadlocks), system and internal errors
+TRANSIENT_SQLSTATE_CLASSES = {"08", "40", "53", "57", "58", "XX"}
+
+
+def is_transient(error):
+    """Whether a failed write may succeed if retried unchanged"""
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    code = getattr(error, "code", None)
+    if status is None and isinstance(code, int):
+        status = code
+    elif status is None and isinstance(code, str) and code:
+        if code.isdigit() and len(code) == 3:
+            status = int(code)
+        elif code.startswith("PGRST"):
+            # PGRST0xx: PostgREST could not reach the database
+            return code[5:6] == "0"
+        elif len(code) == 5:
+            return code[:2] in TRANSIENT_SQLSTATE_CLASSES
+    if status is None:
+        # No answer from the database at all: network error, timeout
+        return True
+    return status >= 500 or status in TRANSIENT_STATUS
+
+
+class OutboxEntry:
+    """One mutation submitted by this process and waiting to be written"""
+
+    __slots__ = ("table", "row", "key", "on_done", "status", "error", "result", "enqueued_at")
+
+    def __init__(self, table, row, key, on_done):
+        self.table = table
+        self.row = row
+        self.key = key
+        self.on_done = on_done
+        self.status = PENDING
+        self.error = None
+        self.result = None
+        self.enqueued_at = time.monotonic()
+
+
+class Outbox:
+    """Shared, journaled write-behind queue with in-order replay and idempotency keys.
+
+    ``write_batch(head, rows)`` performs one write for a run of journal
+    entries and returns the stored rows (or None); ``head`` is the first
+    ``JournalEntry`` and carries ``table``, ``op``, ``key_column``,
+    ``on_conflict`` and ``match``.  It is the only place that talks to the
+    database.  ``is_transient(error)`` decides whether a failure is retried
+    indefinitely or counts towards dead-lettering.
+    """
+
+    def __init__(self, journal, write_batch, max_batch=200, linger=0.05, max_attempts=5, backoff=0.5, max_backoff=30,
+                 is_transient=is_transient):
+        self.journal = journal
+        self.write_batch = write_batch
+        self.is_transient = is_transient
+        self.max_batch = max_batch
+        self.linger = linger
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._live = {}           # journal key -> OutboxEntry submitted by this process
+        self._batch_sizes = deque(maxlen=1000)
+        self.offline = False
+        self.submitted = 0
+        self.sent = 0
+        self.replayed = 0
+        self.retries = 0
+        self.batches = 0
+        self.dead_lettered = 0
+        self.last_error = None
+        # Replay whatever a previous run left in the journal
+        self._wake.set()
+        threading.Thread(target=self._run, name="outbox", daemon=True).start()
+
+    def submit(self, table, row, op="insert", key_column="client_id", on_conflict=None, match=None, on_done=None):
+        """Journal a mutation and return its entry.
+
+        ``op`` is "insert" (idempotent on ``key_column``), "upsert" (merge on
+        ``on_conflict``) or "update" (rows matching the ``match`` filters).
+        """
+        key = row.get(key_column) if op == "insert" else None
+        key = str(key or uuid.uuid4())
+        entry = OutboxEntry(table, row, key, on_done)
+        with self._lock:
+            self.submitted += 1
+            if key in self._live:
+                # Already journaled under this key: the earlier copy will be written
+                return self._live[key]
+            self._live[key] = entry
+            offline = self.offline
+        if not self.journal.append(table, op, row, key, key_column=key_column, on_conflict=on_conflict, match=match):
+            # Journaled by an earlier run and not replayed yet
+            with self._lock:
+                self._live.pop(key, None)
+            entry.status = QUEUED
+            return entry
+        if offline:
+            entry.status = QUEUED
+        self._wake.set()
+        return entry
+
+    def depth(self):
+        """Mutations journaled but not yet confirmed"""
+        return len(self.journal)
+
+    def stats(self):
+        depth = len(self.journal)
+        with self._lock:
+            sizes = list(self._batch_sizes)
+            return {
+                "depth": depth,
+                "offline": self.offline,
+                "submitted": self.submitted,
+                "sent": self.sent,
+                "replayed": self.replayed,
+                "retries": self.retries,
+                "batches": self.batches,
+                "dead_lettered": self.dead_lettered,
+                "avg_batch_size": (sum(sizes) / len(sizes)) if sizes else 0.0,
+                "max_batch_size": max(sizes) if sizes else 0,
+                "last_error": self.last_error,
+            }
+
+    def _run(self):
+        failures = 0
+        while True:
+            if failures:
+                time.sleep(min(self.backoff * 2 ** (failures - 1), self.max_backoff))
+            else:
+                self._wake.wait()
+                time.sleep(self.linger)   # let concurrent submits join the batch
+            self._wake.clear()
+            drained, transient = self._drain()
+            if drained:
+                failures = 0
+                self.offline = False
+                continue
+            failures += 1
+            with self._lock:
+                self.retries += 1
+            if transient and failures >= self.max_attempts and not self.offline:
+                self.offline = True
+                with self._lock:
+                    waiting = [entry for entry in self._live.values() if entry.status == PENDING]
+                self._notify(waiting, QUEUED)
+
+    def _drain(self):
+        """Write journaled entries in order per table.
+
+        Returns (drained, transient): whether the journal is empty, and
+        whether a table was left blocked by a transient failure.  A table
+        whose write fails is skipped for the rest of the pass.
+        """
+        blocked = set()
+        transient = False
+        while True:
+            entries = self.journal.head(self.max_batch, skip_tables=blocked)
+            if not entries:
+                return not blocked, transient
+            group = self._leading_run(entries)
+            try:
+                stored = self.write_batch(group[0], self._batch_rows(group[0], group)) or []
+            except Exception as e:
+                blocked.add(group[0].table)
+                with self._lock:
+                    self.last_error = f"{type(e).__name__}: {e}"
+                if self.is_transient(e):
+                    transient = True
+                    self.journal.mark_failed([entry.seq for entry in group], e)
+                elif len(group) == 1 and group[0].attempts + 1 >= self.max_attempts:
+                    self._dead_letter(group[0], e)
+                else:
+                    self.journal.mark_failed([entry.seq for entry in group], e)
+                continue
+            self.journal.remove([entry.seq for entry in group])
+
+            head = group[0]
+            by_key = {}
+            if head.op == "insert":
+                by_key = {str(row.get(head.key_column)): row for row in stored if isinstance(row, dict)}
+            done = []
+            with self._lock:
+                self.batches += 1
+                self._batch_sizes.append(len(group))
+                self.sent += len(group)
+                for journaled in group:
+                    entry = self._live.pop(journaled.key, None)
+                    if entry is None:
+                        self.replayed += 1
+                        continue
+                    entry.result = by_key.get(journaled.key)
+                    done.append(entry)
+            self._notify(done, SENT)
+
+    def _dead_letter(self, journaled, error):
+        """Give up on a write the database keeps rejecting and tell its session"""
+        self.journal.dead_letter([journaled.seq], f"{type(error).__name__}: {error}")
+        with self._lock:
+            self.dead_lettered += 1
+            entry = self._live.pop(journaled.key, None)
+        if entry is not None:
+            self._notify([entry], FAILED)
+
+    @staticmethod
+    def _leading_run(entries):
+        """The head entry plus the later entries it can be written with.
+
+        Inserts, and upserts with ``on_conflict`` columns, are batched with
+        later entries of the same kind for the same table.  The scan stops at
+        an update or at a different kind of write to that table, so each
+        table still sees its writes in journal order.  Upserts of the same
+        conflict key collapse to the latest row.
+        """
+        head = entries[0]
+        if head.attempts or head.op == "update" or (head.op == "upsert" and not head.on_conflict):
+            # A write that failed before is retried alone, so one bad row
+            # can't keep failing the rows batched with it
+            return [head]
+        signature = (head.op, head.table, head.key_column, head.on_conflict)
+        run = [head]
+        for entry in entries[1:]:
+            if entry.op == "update":
+                break
+            if entry.table != head.table:
+                continue
+            if (entry.op, entry.table, entry.key_column, entry.on_conflict) != signature:
+                break
+            run.append(entry)
+        return run
+
+    @staticmethod
+    def _batch_rows(head, run):
+        """Rows to write for a run; upserts keep only the last row per conflict key"""
+        if head.op != "upsert":
+            return [entry.row for entry in run]
+        columns = [column.strip() for column in head.on_conflict.split(",")]
+        latest = {}
+        for entry in run:
+            latest[tuple(entry.row.get(column) for column in columns)] = entry.row
+        return list(latest.values())
+
+    def _notify(self, entries, status):
+        for entry in entries:
+            entry.status = status
+            entry.error = self.last_error if status in (QUEUED, FAILED) else None
+            if entry.on_done:
+                try:
+                    entry.on_done(entry)
+                except Exception:
+                    pass
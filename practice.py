@@ -0,0 +1,259 @@
+"""Spaced-repetition practice for WAEC questions (SM-2).
+
+Each user keeps one deck per subject.  A deck holds the SM-2 state of every
+question the user has seen and a heap of (due time, question id), so both
+recording an answer and finding the next due question cost O(log n).  Heap
+entries are invalidated lazily: an answer pushes a new entry, and entries
+whose due time no longer matches the card are skipped when they surface.
+Questions the user has never seen are drawn at random from the bank's id
+list with an incremental Fisher-Yates shuffle, one swap per draw.  A drawn
+question only leaves the unseen pool when an answer to it is recorded, so a
+question that is served but skipped (a rerun, a subject switch) stays new.
+Taking a question out of the pool is an O(1) swap: positions come from a
+map of the bank's id list shared by every deck of the subject, and each deck
+only remembers the ids its own swaps moved.  The due count is kept up to
+date as cards become due, so ``counts`` does not scan the cards.
+
+Card changes are written through ``write_cards(rows)``; the app routes them
+through the journaled outbox, which batches them and keeps only the latest
+row per card.
+"""
+
+import heapq
+import random
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+DAY = 86400
+RELEARN_SECONDS = 600      # a missed question comes back after ten minutes
+MIN_EASINESS = 1.3
+QUALITY_CORRECT = 4
+QUALITY_WRONG = 1
+
+
+class Card:
+    """SM-2 state of one question for one user"""
+
+    __slots__ = ("question_id", "easiness", "interval", "repetitions", "due", "lapses")
+
+    def __init__(self, question_id, easiness=2.5, interval=0.0, repetitions=0, due=0.0, lapses=0):
+        self.question_id = question_id
+        self.easiness = easiness
+        self.interval = interval        # days
+        self.repetitions = repetitions
+        self.due = due                  # epoch seconds
+        self.lapses = lapses
+
+    def review(self, quality, now):
+        """Apply one SM-2 review with quality 0-5"""
+        if quality >= 3:
+            if self.repetitions == 0:
+                self.interval = 1.0
+            elif self.repetitions == 1:
+                self.interval = 6.0
+            else:
+                self.interval = round(self.interval * self.easiness, 2)
+            self.repetitions += 1
+            self.due = now + self.interval * DAY
+        else:
+            self.repetitions = 0
+            self.interval = 0.0
+            self.lapses += 1
+            self.due = now + RELEARN_SECONDS
+        self.easiness = max(MIN_EASINESS, self.easiness + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+
+
+def _iso(epoch):
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat()
+
+
+def _epoch(value):
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return 0.0
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class Deck:
+    """One user's cards for one subject.
+
+    ``positions`` maps each id of ``question_ids`` to its index there; pass
+    the same map to every deck of a subject to share it.
+    """
+
+    def __init__(self, question_ids, cards=(), positions=None):
+        self._lock = threading.Lock()
+        self.cards = {card.question_id: card for card in cards}
+        self._heap = [(card.due, card.question_id) for card in self.cards.values()]
+        heapq.heapify(self._heap)
+        # Cards not yet counted as due, soonest first; counts() moves them into _due
+        self._upcoming = list(self._heap)
+        self._due = set()
+        # Unseen questions occupy _pool[:_unseen]; answering one swaps it past the boundary
+        self._pool = array("I", question_ids)
+        self._positions = positions if positions is not None else {qid: i for i, qid in enumerate(self._pool)}
+        self._moved = {}   # id -> index in _pool, for ids whose index differs from _positions
+        self._unseen = len(self._pool)
+        for question_id in self.cards:
+            self._take_unseen(question_id)
+        self.reviews = 0
+
+    def _top(self):
+        """Earliest valid heap entry, dropping stale ones"""
+        heap = self._heap
+        while heap:
+            due, qid = heap[0]
+            card = self.cards.get(qid)
+            if card is not None and card.due == due:
+                return heap[0]
+            heapq.heappop(heap)
+        return None
+
+    def next_question(self, now=None):
+        """Id of the question to ask next: a due review, else a new question, else the soonest review"""
+        now = now or time.time()
+        with self._lock:
+            top = self._top()
+            if top is not None and top[0] <= now:
+                return top[1]
+            if self._unseen:
+                # Park a random unseen question at the end of the unseen range;
+                # record() takes it out of the pool once it is answered
+                last = self._unseen - 1
+                self._swap(random.randrange(self._unseen), last)
+                return self._pool[last]
+            return top[1] if top is not None else None
+
+    def record(self, question_id, correct, now=None):
+        """Update a question's schedule after an answer and return its card"""
+        now = now or time.time()
+        with self._lock:
+            card = self.cards.get(question_id)
+            if card is None:
+                card = self.cards[question_id] = Card(question_id)
+                self._take_unseen(question_id)
+            else:
+                self._due.discard(question_id)
+            card.review(QUALITY_CORRECT if correct else QUALITY_WRONG, now)
+            heapq.heappush(self._heap, (card.due, question_id))
+            heapq.heappush(self._upcoming, (card.due, question_id))
+            self.reviews += 1
+            # Keep the heaps from filling up with stale entries
+            if len(self._heap) > 2 * len(self.cards) + 64:
+                self._heap = [(c.due, c.question_id) for c in self.cards.values()]
+                heapq.heapify(self._heap)
+                self._upcoming = [(c.due, c.question_id) for c in self.cards.values() if c.question_id not in self._due]
+                heapq.heapify(self._upcoming)
+            return card
+
+    def _swap(self, i, j):
+        # Caller holds the lock
+        pool = self._pool
+        pool[i], pool[j] = pool[j], pool[i]
+        self._moved[pool[i]] = i
+        self._moved[pool[j]] = j
+
+    def _take_unseen(self, question_id):
+        """Move a newly answered question past the unseen boundary in O(1) (caller holds the lock)"""
+        index = self._moved.get(question_id)
+        if index is None:
+            index = self._positions.get(question_id)
+        if index is None or index >= self._unseen or self._pool[index] != question_id:
+            # Not in the bank's list for this subject, or already seen
+            return
+        last = self._unseen - 1
+        self._swap(index, last)
+        self._unseen = last
+
+    def counts(self, now=None):
+        """(due now, never seen, seen) question counts; ``now`` is expected to move forward only"""
+        now = now or time.time()
+        with self._lock:
+            upcoming = self._upcoming
+            while upcoming and upcoming[0][0] <= now:
+                due, qid = heapq.heappop(upcoming)
+                card = self.cards.get(qid)
+                if card is not None and card.due == due:
+                    self._due.add(qid)
+            return len(self._due), self._unseen, len(self.cards)
+
+
+class PracticeScheduler:
+    """Process-wide SM-2 decks per (user, subject), loaded lazily and kept in an LRU.
+
+    ``question_ids(subject)`` lists the bank's questions for a subject,
+    ``load_cards(user_id, subject)`` returns stored card rows and
+    ``write_cards(rows)`` persists changed cards.  If ``load_cards`` fails the
+    error propagates and no deck is cached, so a later call retries the load
+    and fresh cards are never written over stored ones.
+    """
+
+    def __init__(self, question_ids, load_cards, write_cards, max_decks=5000):
+        self.question_ids = question_ids
+        self.load_cards = load_cards
+        self.write_cards = write_cards
+        self.max_decks = max_decks
+        self._lock = threading.Lock()
+        self._decks = OrderedDict()
+        self._positions = {}   # subject -> {question id: index}, shared by the subject's decks
+        self.loads = 0
+
+    def deck(self, user_id, subject):
+        key = (user_id, subject)
+        with self._lock:
+            deck = self._decks.get(key)
+            if deck is not None:
+                self._decks.move_to_end(key)
+                return deck
+        rows = self.load_cards(user_id, subject) or []
+        cards = [
+            Card(row["question_id"], easiness=row.get("easiness") or 2.5, interval=row.get("interval_days") or 0.0,
+                 repetitions=row.get("repetitions") or 0, due=_epoch(row.get("due_at") or 0), lapses=row.get("lapses") or 0)
+            for row in rows
+        ]
+        question_ids = self.question_ids(subject)
+        with self._lock:
+            positions = self._positions.get(subject)
+            if positions is None:
+                positions = self._positions[subject] = {qid: i for i, qid in enumerate(question_ids)}
+        deck = Deck(question_ids, cards, positions)
+        with self._lock:
+            self.loads += 1
+            deck = self._decks.setdefault(key, deck)
+            self._decks.move_to_end(key)
+            while len(self._decks) > self.max_decks:
+                self._decks.popitem(last=False)
+        return deck
+
+    def next_question(self, user_id, subject):
+        return self.deck(user_id, subject).next_question()
+
+    def counts(self, user_id, subject):
+        return self.deck(user_id, subject).counts()
+
+    def record(self, user_id, subject, question_id, correct):
+        card = self.deck(user_id, subject).record(question_id, correct)
+        self.write_cards([{
+            "user_id": user_id,
+            "subject": subject,
+            "question_id": question_id,
+            "easiness": round(card.easiness, 3),
+            "interval_days": card.interval,
+            "repetitions": card.repetitions,
+            "lapses": card.lapses,
+            "due_at": _iso(card.due),
+        }])
+        return card
+
+    def stats(self):
+        with self._lock:
+            decks = list(self._decks.values())
+        return {"decks": len(decks), "loads": self.loads, "reviews": sum(deck.reviews for deck in decks)}
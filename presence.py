@@ -0,0 +1,187 @@
+"""Heartbeat-based presence for chat contacts.
+
+Every rerun of a signed-in session calls ``PresenceTracker.heartbeat()``,
+which only stamps an in-process dict.  A background thread flushes users
+whose last persisted heartbeat is older than ``write_interval`` as one batched
+upsert into the presence table, so a session costs at most one row write per
+``write_interval`` however often it reruns.  A user is online while their
+last heartbeat is younger than ``ttl``.
+
+``online(user_ids)`` answers for a whole page of contacts at once: users seen
+by this process are answered from memory and the rest with one bulk query,
+whose answers are reused for ``remote_refresh`` seconds.
+"""
+
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+RATE_WINDOW = 60   # seconds over which write_rate is measured
+
+
+def _timestamp(value):
+    """Parse an ISO timestamp from the database into epoch seconds"""
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return 0.0
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _iso(epoch):
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat()
+
+
+class PresenceTracker:
+    """Process-wide presence store with coalesced, batched heartbeat writes.
+
+    ``write_batch(rows)`` upserts ``[{"user_id", "last_seen"}]`` and
+    ``load_presence(user_ids)`` returns ``{user_id: last_seen}`` (ISO string
+    or epoch seconds) for users seen by other processes; either may be None
+    for a single-process setup.
+    """
+
+    def __init__(self, write_batch=None, load_presence=None, ttl=60, write_interval=20,
+                 flush_interval=5, remote_refresh=10):
+        self.write_batch = write_batch
+        self.load_presence = load_presence
+        self.ttl = ttl
+        self.write_interval = write_interval
+        self.flush_interval = flush_interval
+        self.remote_refresh = remote_refresh
+        self._lock = threading.Lock()
+        self._seen = {}        # user_id -> last heartbeat in this process
+        self._written = {}     # user_id -> last heartbeat persisted
+        self._dirty = set()
+        self._remote = {}      # user_id -> (last_seen, fetched_at)
+        self._writes = deque()  # (time, rows) of recent flushes
+        self.heartbeats = 0
+        self.coalesced = 0
+        self.flushes = 0
+        self.rows_written = 0
+        self.write_errors = 0
+        self.lookups = 0
+        self.remote_queries = 0
+        if write_batch:
+            threading.Thread(target=self._run, name="presence-flush", daemon=True).start()
+
+    def heartbeat(self, user_id):
+        """Mark a user as active now; never touches the database"""
+        if user_id is None:
+            return
+        now = time.time()
+        with self._lock:
+            self.heartbeats += 1
+            self._seen[user_id] = now
+            if user_id in self._dirty or now - self._written.get(user_id, 0.0) < self.write_interval:
+                self.coalesced += 1
+            else:
+                self._dirty.add(user_id)
+
+    def leave(self, user_id):
+        """Mark a user offline at once (sign-out)"""
+        if user_id is None:
+            return
+        with self._lock:
+            self._seen[user_id] = time.time() - self.ttl
+            self._written.pop(user_id, None)
+            self._dirty.add(user_id)
+            self._remote.pop(user_id, None)
+
+    def online(self, user_ids):
+        """Return {user_id: bool} for a page of users with at most one database query"""
+        now = time.time()
+        result = {}
+        missing = []
+        with self._lock:
+            self.lookups += 1
+            for user_id in user_ids:
+                seen = self._seen.get(user_id)
+                if seen is not None and now - seen < self.ttl:
+                    result[user_id] = True
+                    continue
+                remote = self._remote.get(user_id)
+                if remote is not None and now - remote[1] < self.remote_refresh:
+                    result[user_id] = now - max(remote[0], seen or 0.0) < self.ttl
+                    continue
+                missing.append(user_id)
+
+        if missing and self.load_presence:
+            try:
+                found = self.load_presence(missing) or {}
+            except Exception:
+                found = {}
+            with self._lock:
+                self.remote_queries += 1
+                for user_id in missing:
+                    last_seen = found.get(user_id, 0.0)
+                    if isinstance(last_seen, str):
+                        last_seen = _timestamp(last_seen)
+                    self._remote[user_id] = (last_seen, now)
+        for user_id in missing:
+            last_seen = self._remote.get(user_id, (0.0, 0.0))[0]
+            result[user_id] = now - max(last_seen, self._seen.get(user_id) or 0.0) < self.ttl
+        return result
+
+    def flush(self):
+        """Write pending heartbeats as one batch; returns the number of rows written"""
+        with self._lock:
+            if not self._dirty:
+                return 0
+            batch = {user_id: self._seen[user_id] for user_id in self._dirty}
+            self._dirty.clear()
+        rows = [{"user_id": user_id, "last_seen": _iso(seen)} for user_id, seen in batch.items()]
+        try:
+            self.write_batch(rows)
+        except Exception:
+            with self._lock:
+                self.write_errors += 1
+                self._dirty.update(batch)
+            return 0
+        now = time.time()
+        with self._lock:
+            for user_id, seen in batch.items():
+                self._written[user_id] = seen
+            self.flushes += 1
+            self.rows_written += len(rows)
+            self._writes.append((now, len(rows)))
+        return len(rows)
+
+    def _prune(self):
+        """Forget users that have been offline for a while"""
+        cutoff = time.time() - self.ttl * 2
+        with self._lock:
+            for user_id in [u for u, seen in self._seen.items() if seen < cutoff and u not in self._dirty]:
+                del self._seen[user_id]
+                self._written.pop(user_id, None)
+            for user_id in [u for u, (_, fetched) in self._remote.items() if fetched < cutoff]:
+                del self._remote[user_id]
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+            self._prune()
+
+    def stats(self):
+        """Heartbeat and write counters; write_rate is rows written per second over the last minute"""
+        now = time.time()
+        with self._lock:
+            while self._writes and now - self._writes[0][0] > RATE_WINDOW:
+                self._writes.popleft()
+            recent = sum(rows for _, rows in self._writes)
+            online = sum(1 for seen in self._seen.values() if now - seen < self.ttl)
+            return {
+                "online_here": online,
+                "heartbeats": self.heartbeats,
+                "coalesced": self.coalesced,
+                "flushes": self.flushes,
+                "rows_written": self.rows_written,
+                "write_errors": self.write_errors,
+                "write_rate": recent / RATE_WINDOW,
+                "lookups": self.lookups,
+                "remote_queries": self.remote_queries,
+            }
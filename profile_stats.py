@@ -0,0 +1,62 @@
+"""Profile page numbers derived from one aggregate.
+
+``sql/profile_stats.sql`` returns every count the Profile page needs in a
+single RPC.  Points and achievements are computed here from that result, so
+new stat cards or badges never add a query.
+"""
+
+# (icon, name, description, stat getter, goal)
+ACHIEVEMENTS = [
+    ("📖", "Bible Scholar", "Save 10 verses", lambda s: s["saved_verses"], 10),
+    ("🙏", "Faithful Journaler", "Write 7 devotional reflections", lambda s: s["devotionals"], 7),
+    ("🧮", "Math Whiz", "Answer 100 Mathematics questions correctly",
+     lambda s: subject_stat(s, "Mathematics", "correct_answers"), 100),
+    ("🎯", "Sharp Shooter", "Answer 50 questions with at least 80% accuracy",
+     lambda s: s["overall"]["total_questions"] if accuracy(s["overall"]) >= 0.8 else 0, 50),
+    ("🔥", "On Fire", "Study 7 days in a row", lambda s: s["overall"]["best_streak"], 7),
+    ("🦋", "Social Butterfly", "Send 50 messages", lambda s: s["messages"], 50),
+]
+
+EMPTY_OVERALL = {"correct_answers": 0, "total_questions": 0, "current_streak": 0, "best_streak": 0, "last_answer_date": None}
+
+
+def normalize(raw):
+    """Fill in missing fields of a profile_stats result"""
+    raw = raw or {}
+    return {
+        "friends": raw.get("friends") or 0,
+        "messages": raw.get("messages") or 0,
+        "devotionals": raw.get("devotionals") or 0,
+        "saved_verses": raw.get("saved_verses") or 0,
+        "subjects": list(raw.get("subjects") or []),
+        "overall": dict(EMPTY_OVERALL, **{k: v for k, v in (raw.get("overall") or {}).items() if v is not None}),
+    }
+
+
+def accuracy(progress):
+    total = progress.get("total_questions") or 0
+    return (progress.get("correct_answers") or 0) / total if total else 0.0
+
+
+def subject_stat(stats, subject, field):
+    return next((row.get(field) or 0 for row in stats["subjects"] if row.get("subject") == subject), 0)
+
+
+def points(stats):
+    overall = stats["overall"]
+    return (
+        10 * overall["correct_answers"]
+        + 2 * overall["total_questions"]
+        + 5 * stats["devotionals"]
+        + 3 * stats["saved_verses"]
+        + stats["messages"]
+    )
+
+
+def achievements(stats):
+    """Return [(icon, name, description, progress, goal, unlocked)] for every achievement"""
+    result = []
+    for icon, name, description, getter, goal in ACHIEVEMENTS:
+        value = getter(stats) or 0
+        result.append((icon, name, description, min(value, goal), goal, value >= goal))
+    return result
@@ -0,0 +1,199 @@
+"""Opt-in sampling profiler that keeps a profile only for slow reruns.
+
+``SlowRerunProfiler.rerun()`` wraps a script run.  While any run is in
+progress, one background thread samples the stack of each running script
+thread every ``interval`` seconds (``sys._current_frames()``, no tracing
+hooks), so a run costs a few microseconds per sample and nothing at all while
+the app is idle.  When a run ends, its samples are dropped unless it took
+longer than ``threshold`` seconds (or was picked at random with
+``sample_rate``); kept runs are written to ``directory`` as
+
+* ``<time>-<ms>ms-<page>-<n>.folded``: one ``frame;frame;frame count`` line
+  per distinct stack, ready for flamegraph.pl, speedscope or inferno, and
+* ``<time>-<ms>ms-<page>-<n>.json``: page, duration, sample count and the
+  approximate size of each session-state key.
+
+Only the newest ``keep`` profiles are kept.
+"""
+
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__)) + os.sep
+SAMPLE_INTERVAL = 0.01   # seconds between stack samples
+MAX_SIZE_ITEMS = 10000   # containers visited per session-state value when estimating its size
+
+
+def approximate_size(value, limit=MAX_SIZE_ITEMS):
+    """Bytes held by a value and the dicts, lists, tuples and sets inside it (other objects count shallowly)"""
+    seen = set()
+    stack = [value]
+    total = 0
+    while stack and len(seen) < limit:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        try:
+            total += sys.getsizeof(item)
+        except TypeError:
+            continue
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+    return total
+
+
+class _Run:
+    """Samples of one script run"""
+
+    def __init__(self):
+        self.thread_id = threading.get_ident()
+        self.started = time.perf_counter()
+        self.started_at = time.time()
+        self.stacks = Counter()   # folded stack -> samples
+
+
+class SlowRerunProfiler:
+    """Process-wide statistical profiler for script runs"""
+
+    def __init__(self, directory, threshold=0.5, sample_rate=0.0, interval=SAMPLE_INTERVAL, keep=50):
+        self.directory = directory
+        self.threshold = threshold
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.keep = keep
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._runs = {}       # thread id -> _Run
+        self._labels = {}     # code object -> frame label
+        self._seq = 0
+        self.runs = 0
+        self.samples = 0
+        self.written = 0
+        self.errors = 0
+        self.last_path = None
+        threading.Thread(target=self._sample_loop, name="rerun-profiler", daemon=True).start()
+
+    @contextmanager
+    def rerun(self, page_of=None, state_sizes=None):
+        """Sample the enclosed script run; write it out if it turns out slow"""
+        run = _Run()
+        with self._lock:
+            self._runs[run.thread_id] = run
+            self.runs += 1
+        self._wake.set()
+        try:
+            yield run
+        finally:
+            elapsed = time.perf_counter() - run.started
+            with self._lock:
+                self._runs.pop(run.thread_id, None)
+            if elapsed >= self.threshold:
+                trigger = "slow"
+            elif self.sample_rate and random.random() < self.sample_rate:
+                trigger = "sampled"
+            else:
+                trigger = None
+            if trigger and run.stacks:
+                try:
+                    page = page_of() if page_of else None
+                    sizes = state_sizes() if state_sizes else {}
+                    self._write(run, elapsed, trigger, page, sizes)
+                except Exception:
+                    # Profiling must never break the page
+                    self.errors += 1
+
+    def _label(self, code):
+        label = self._labels.get(code)
+        if label is None:
+            filename = code.co_filename
+            if "site-packages" in filename:
+                filename = filename.split("site-packages" + os.sep, 1)[-1]
+            elif filename.startswith(APP_DIR):
+                filename = os.path.relpath(filename, APP_DIR)
+            else:
+                filename = os.path.basename(filename)
+            label = f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+            if len(self._labels) > 50000:
+                self._labels.clear()
+            self._labels[code] = label
+        return label
+
+    def _fold(self, frame):
+        labels = []
+        while frame is not None:
+            labels.append(self._label(frame.f_code))
+            frame = frame.f_back
+        labels.reverse()
+        return ";".join(labels)
+
+    def _sample_loop(self):
+        while True:
+            with self._lock:
+                runs = list(self._runs.values())
+            if not runs:
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            frames = sys._current_frames()
+            folded = [(run, self._fold(frames[run.thread_id])) for run in runs if run.thread_id in frames]
+            del frames
+            with self._lock:
+                for run, stack in folded:
+                    run.stacks[stack] += 1
+                self.samples += len(folded)
+            time.sleep(self.interval)
+
+    def _write(self, run, elapsed, trigger, page, sizes):
+        with self._lock:
+            stacks = dict(run.stacks)
+            self._seq += 1
+            seq = self._seq
+        os.makedirs(self.directory, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", page or "unknown").strip("-").lower() or "page"
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(run.started_at))
+        base = os.path.join(self.directory, f"{stamp}-{elapsed * 1000:.0f}ms-{slug}-{seq}")
+        with open(base + ".folded", "w", encoding="utf-8") as f:
+            for stack, count in sorted(stacks.items(), key=lambda item: -item[1]):
+                f.write(f"{stack} {count}\n")
+        meta = {
+            "page": page,
+            "trigger": trigger,
+            "duration_ms": round(elapsed * 1000, 1),
+            "threshold_ms": round(self.threshold * 1000, 1) if self.threshold != float("inf") else None,
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(run.started_at)),
+            "samples": sum(stacks.values()),
+            "interval_ms": self.interval * 1000,
+            "session_state_bytes": dict(sorted(sizes.items(), key=lambda item: -item[1])),
+            "session_state_total_bytes": sum(sizes.values()),
+        }
+        with open(base + ".json", "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2, default=str)
+        self.written += 1
+        self.last_path = base + ".folded"
+        self._rotate()
+
+    def _rotate(self):
+        """Delete all but the newest ``keep`` profiles"""
+        profiles = sorted(name for name in os.listdir(self.directory) if name.endswith(".folded"))
+        for name in profiles[:max(0, len(profiles) - self.keep)]:
+            for path in (name, name[:-len(".folded")] + ".json"):
+                try:
+                    os.remove(os.path.join(self.directory, path))
+                except OSError:
+                    pass
+
+    def stats(self):
+        with self._lock:
+            return {"runs": self.runs, "samples": self.samples, "written": self.written, "errors": self.errors,
+                    "active": len(self._runs), "last_path": self.last_path}
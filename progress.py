@@ -0,0 +1,175 @@
+"""Answer-event log and incrementally maintained study progress.
+
+Every answered question becomes one append-only answer event.  Alongside it
+``ProgressTracker`` keeps materialized counters per user and subject (plus an
+all-subjects row): answers, correct answers and a day streak.  Each answer
+updates them in O(1) and writes the new totals as an upsert, so reading
+progress never re-scans the event history.  Counters for a user are loaded
+once, on first use, from the stored rows.  A failed load is not cached: the
+error propagates and nothing is written, so counters that started from zero
+never overwrite the stored totals.
+
+Writes go through the callbacks given to the tracker (the app routes them
+through the journaled outbox, which batches them).
+"""
+
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+
+ALL_SUBJECTS = "*"
+
+
+class SubjectProgress:
+    """Counters for one user and subject"""
+
+    __slots__ = ("subject", "correct", "total", "streak", "best_streak", "last_day")
+
+    def __init__(self, subject, correct=0, total=0, streak=0, best_streak=0, last_day=None):
+        self.subject = subject
+        self.correct = correct
+        self.total = total
+        self.streak = streak
+        self.best_streak = best_streak
+        self.last_day = last_day
+
+    @classmethod
+    def from_row(cls, row):
+        last_day = row.get("last_answer_date")
+        return cls(
+            row["subject"],
+            correct=row.get("correct_answers") or 0,
+            total=row.get("total_questions") or 0,
+            streak=row.get("current_streak") or 0,
+            best_streak=row.get("best_streak") or 0,
+            last_day=date.fromisoformat(str(last_day)[:10]) if last_day else None,
+        )
+
+    def record(self, correct, day):
+        self.total += 1
+        if correct:
+            self.correct += 1
+        if self.last_day != day:
+            if self.last_day == day - timedelta(days=1):
+                self.streak += 1
+            else:
+                self.streak = 1
+            self.last_day = day
+            self.best_streak = max(self.best_streak, self.streak)
+
+    @property
+    def accuracy(self):
+        return self.correct / self.total if self.total else 0.0
+
+    def current_streak(self, today=None):
+        """Streak in days, 0 if the user did not answer today or yesterday"""
+        today = today or date.today()
+        if self.last_day is None or (today - self.last_day).days > 1:
+            return 0
+        return self.streak
+
+    def to_row(self, user_id, now):
+        return {
+            "user_id": user_id,
+            "subject": self.subject,
+            "correct_answers": self.correct,
+            "total_questions": self.total,
+            "current_streak": self.streak,
+            "best_streak": self.best_streak,
+            "last_answer_date": self.last_day.isoformat() if self.last_day else None,
+            "last_updated": now.isoformat(),
+        }
+
+
+class ProgressTracker:
+    """Process-wide per-user progress counters fed by answer events.
+
+    ``load_rows(user_id)`` returns the stored progress rows of a user,
+    ``write_event(row)`` appends an answer event and ``write_progress(row)``
+    upserts one progress row (keyed by user_id and subject).  At most
+    ``max_users`` users are kept in memory.
+    """
+
+    def __init__(self, load_rows, write_event, write_progress, max_users=10000):
+        self.load_rows = load_rows
+        self.write_event = write_event
+        self.write_progress = write_progress
+        self.max_users = max_users
+        self._lock = threading.Lock()
+        self._users = OrderedDict()   # user_id -> {subject: SubjectProgress}
+        self.events = 0
+        self.loads = 0
+
+    def _user(self, user_id):
+        with self._lock:
+            subjects = self._users.get(user_id)
+            if subjects is not None:
+                self._users.move_to_end(user_id)
+                return subjects
+        # Raises when the stored rows can't be read; nothing is cached then
+        rows = self.load_rows(user_id) or []
+        loaded = {row["subject"]: SubjectProgress.from_row(row) for row in rows}
+        if loaded and ALL_SUBJECTS not in loaded:
+            # Rows written before the all-subjects row existed
+            latest = max(loaded.values(), key=lambda p: p.last_day or date.min)
+            loaded[ALL_SUBJECTS] = SubjectProgress(
+                ALL_SUBJECTS,
+                correct=sum(p.correct for p in loaded.values()),
+                total=sum(p.total for p in loaded.values()),
+                streak=latest.streak,
+                best_streak=max(p.best_streak for p in loaded.values()),
+                last_day=latest.last_day,
+            )
+        with self._lock:
+            self.loads += 1
+            subjects = self._users.setdefault(user_id, loaded)
+            self._users.move_to_end(user_id)
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+            return subjects
+
+    def record_answer(self, user_id, subject, correct, question_id=None, when=None):
+        """Log one answer and update the user's counters; returns the subject's progress.
+
+        Raises (writing nothing) if the user's stored counters can't be loaded.
+        """
+        when = when or datetime.now()
+        subjects = self._user(user_id)
+        with self._lock:
+            self.events += 1
+            changed = []
+            for key in (subject, ALL_SUBJECTS):
+                progress = subjects.get(key)
+                if progress is None:
+                    progress = subjects[key] = SubjectProgress(key)
+                progress.record(correct, when.date())
+                changed.append(progress.to_row(user_id, when))
+        self.write_event({
+            "client_id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "subject": subject,
+            "question_id": question_id,
+            "correct": bool(correct),
+            "answered_at": when.isoformat(),
+        })
+        for row in changed:
+            self.write_progress(row)
+        return subjects[subject]
+
+    def subjects(self, user_id):
+        """Progress per subject, most answered first (the all-subjects row excluded)"""
+        subjects = self._user(user_id)
+        with self._lock:
+            rows = [p for key, p in subjects.items() if key != ALL_SUBJECTS]
+        return sorted(rows, key=lambda p: (-p.total, p.subject))
+
+    def overall(self, user_id):
+        """Progress across all subjects"""
+        subjects = self._user(user_id)
+        with self._lock:
+            return subjects.get(ALL_SUBJECTS) or SubjectProgress(ALL_SUBJECTS)
+
+    def stats(self):
+        with self._lock:
+            return {"users": len(self._users), "events": self.events, "loads": self.loads}
@@ -0,0 +1,218 @@
+"""WAEC past-question bank stored in a single SQLite file.
+
+The file (``data/waec.sqlite3`` by default) is filled by
+``tools/import_waec.py``.  It is opened once per process, read-only and
+memory-mapped, and shared by every session.  On open the bank keeps only the
+question ids per subject, year and topic in compact ``array`` buffers, so
+drawing N random questions samples ids in memory and then fetches just those
+N rows by primary key.
+
+Without a file the bank is built in memory from ``SEED_QUESTIONS``.
+
+Layout::
+
+    questions(id, subject, year, topic, question, options, answer, explanation, qhash)
+        -- options is a JSON list; qhash identifies the normalized question text
+        -- indexed by (subject, year, topic)
+"""
+
+import hashlib
+import json
+import random
+import re
+import sqlite3
+import threading
+import time
+from array import array
+
+MMAP_SIZE = 256 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS questions (
+    id INTEGER PRIMARY KEY,
+    subject TEXT NOT NULL,
+    year TEXT NOT NULL,
+    topic TEXT NOT NULL DEFAULT '',
+    question TEXT NOT NULL,
+    options TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    explanation TEXT NOT NULL DEFAULT '',
+    qhash TEXT NOT NULL UNIQUE
+);
+CREATE INDEX IF NOT EXISTS questions_subject_year_topic ON questions (subject, year, topic);
+"""
+
+INSERT_SQL = (
+    "INSERT OR IGNORE INTO questions (subject, year, topic, question, options, answer, explanation, qhash)"
+    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+COLUMNS = "id, subject, year, topic, question, options, answer, explanation"
+
+SEED_QUESTIONS = [
+    {
+        "subject": "Mathematics",
+        "year": "2023",
+        "topic": "Algebra",
+        "question": "Simplify: (3x² - 2x + 5) + (2x² + 4x - 3)",
+        "options": ["5x² + 2x + 2", "5x² + 2x - 2", "5x² - 2x + 2", "x² + 6x + 8"],
+        "answer": "5x² + 2x + 2",
+        "explanation": "Combine like terms: 3x² + 2x² = 5x², -2x + 4x = 2x, 5 - 3 = 2"
+    },
+    {
+        "subject": "Mathematics",
+        "year": "2023",
+        "topic": "Geometry",
+        "question": "If a right-angled triangle has sides 3cm, 4cm and 5cm, what is the area?",
+        "options": ["6cm²", "12cm²", "10cm²", "15cm²"],
+        "answer": "6cm²",
+        "explanation": "Area of triangle = 1/2 × base × height = 1/2 × 3 × 4 = 6cm²"
+    },
+    {
+        "subject": "English Language",
+        "year": "2023",
+        "topic": "Concord",
+        "question": "Choose the correct option: Neither the teacher nor the students _____ present.",
+        "options": ["was", "were", "has", "have"],
+        "answer": "were",
+        "explanation": "When using 'neither/nor', the verb agrees with the subject closest to it (students - plural)"
+    },
+]
+
+
+def normalize_question(text):
+    """Lower-case a question and collapse punctuation/whitespace for duplicate detection"""
+    return " ".join(re.sub(r"[^\w]+", " ", str(text).lower()).split())
+
+
+def question_hash(subject, text):
+    return hashlib.sha1(f"{subject.strip().lower()}\x1f{normalize_question(text)}".encode("utf-8")).hexdigest()
+
+
+def question_row(q):
+    """Return the INSERT_SQL parameters for a question dict"""
+    subject = str(q["subject"]).strip()
+    return (
+        subject,
+        str(q["year"]).strip(),
+        str(q.get("topic") or "").strip(),
+        str(q["question"]).strip(),
+        json.dumps([str(option) for option in q["options"]], ensure_ascii=False),
+        str(q["answer"]),
+        str(q.get("explanation") or ""),
+        question_hash(subject, q["question"]),
+    )
+
+
+class QuestionBank:
+    """Shared, read-only question bank with in-memory id lists for sampling"""
+
+    def __init__(self, conn, path=None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = conn
+        self._ids = {}     # (subject,), (subject, year) and (subject, year, topic) -> array of ids
+        self._topics = {}  # (subject, year) -> sorted topics
+        self.samples = 0
+        self.sample_seconds = 0.0
+
+        started = time.perf_counter()
+        topics = {}
+        for qid, subject, year, topic in conn.execute("SELECT id, subject, year, topic FROM questions ORDER BY id"):
+            for key in ((subject,), (subject, year), (subject, year, topic)):
+                ids = self._ids.get(key)
+                if ids is None:
+                    ids = self._ids[key] = array("I")
+                ids.append(qid)
+            if topic:
+                topics.setdefault((subject, year), set()).add(topic)
+                topics.setdefault((subject,), set()).add(topic)
+        self._topics = {key: sorted(values) for key, values in topics.items()}
+        self.load_seconds = time.perf_counter() - started
+
+    @classmethod
+    def open(cls, path):
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        conn.execute("PRAGMA query_only=1")
+        return cls(conn, path)
+
+    @classmethod
+    def from_rows(cls, questions):
+        """Build an in-memory bank from question dicts"""
+        conn = sqlite3.connect(":memory:", check_same_thread=False)
+        conn.executescript(SCHEMA)
+        conn.executemany(INSERT_SQL, (question_row(q) for q in questions))
+        conn.commit()
+        return cls(conn)
+
+    def __len__(self):
+        return sum(len(ids) for key, ids in self._ids.items() if len(key) == 1)
+
+    def _key(self, subject, year=None, topic=None):
+        if year is None:
+            return (subject,)
+        if topic:
+            return (subject, str(year), topic)
+        return (subject, str(year))
+
+    def count(self, subject, year=None, topic=None):
+        return len(self._ids.get(self._key(subject, year, topic), ()))
+
+    def ids(self, subject, year=None, topic=None):
+        """Question ids for a subject (and year/topic), as a shared read-only array"""
+        return self._ids.get(self._key(subject, year, topic), array("I"))
+
+    def topics(self, subject, year=None):
+        key = (subject,) if year is None else (subject, str(year))
+        return self._topics.get(key, [])
+
+    def sample(self, subject, year=None, topic=None, count=5):
+        """Return up to count random questions as dicts, without reading the rest of the bank"""
+        started = time.perf_counter()
+        ids = self._ids.get(self._key(subject, year, topic))
+        if not ids:
+            return []
+        picked = random.sample(range(len(ids)), min(count, len(ids)))
+        questions = self.get([ids[i] for i in picked])
+        with self._lock:
+            self.samples += 1
+            self.sample_seconds += time.perf_counter() - started
+        return questions
+
+    def get(self, question_ids):
+        """Fetch questions by id, in the order given"""
+        question_ids = list(question_ids)
+        if not question_ids:
+            return []
+        placeholders = ",".join("?" * len(question_ids))
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {COLUMNS} FROM questions WHERE id IN ({placeholders})", question_ids).fetchall()
+        by_id = {row[0]: row for row in rows}
+        return [self._question(by_id[qid]) for qid in question_ids if qid in by_id]
+
+    @staticmethod
+    def _question(row):
+        qid, subject, year, topic, question, options, answer, explanation = row
+        return {
+            "id": qid,
+            "subject": subject,
+            "year": year,
+            "topic": topic,
+            "question": question,
+            "options": json.loads(options),
+            "answer": answer,
+            "explanation": explanation,
+        }
+
+    def stats(self):
+        with self._lock:
+            return {
+                "questions": len(self),
+                "load_seconds": self.load_seconds,
+                "samples": self.samples,
+                "avg_sample_ms": (self.sample_seconds / self.samples * 1000) if self.samples else 0.0,
+            }
+
+    def close(self):
+        self._conn.close()
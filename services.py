@@ -0,0 +1,1057 @@
+"""Shared helpers and process-wide resources used by the pages in ``views/``.
+
+Imported once per process: the Supabase client, caches, background workers
+and data helpers defined here are not rebuilt on each rerun.
+"""
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import logging
+import os
+import random
+import sqlite3
+import time
+import uuid
+from contextlib import nullcontext
+from datetime import datetime
+
+from bible_prefetch import ChapterNotFound, ChapterPrefetcher
+from bible_search import BibleSearchIndex
+from bible_store import BibleStore
+from chat_cache import ChatCache
+from chat_realtime import ChatHub, SupabaseRealtimeListener
+from contact_index import ContactIndex
+from journal import Journal
+from metrics import BACKGROUND, Metrics
+from outbox import Outbox
+from practice import PracticeScheduler
+from profiler import SlowRerunProfiler, approximate_size
+from presence import PresenceTracker
+from profile_stats import normalize as normalize_profile_stats
+from progress import ProgressTracker
+from question_bank import QuestionBank, SEED_QUESTIONS
+from session_auth import SessionAuth, TokenRefresher
+from ttl_cache import TTLCache
+
+# Try to import supabase with error handling
+try:
+    from supabase import create_client, Client
+    from supabase.lib.client_options import ClientOptions
+    from gotrue import SyncGoTrueClient, SyncMemoryStorage
+    from gotrue.http_clients import SyncClient as AuthHttpClient
+    import httpx
+    import supabase
+    from metrics import TracedTransport
+    SUPABASE_AVAILABLE = True
+except ImportError:
+    SUPABASE_AVAILABLE = False
+
+# Upstream call metrics, served in the Prometheus text format (empty METRICS_PORT turns the endpoint off)
+METRICS_HOST = os.environ.get("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = os.environ.get("METRICS_PORT", "9464")
+
+def metrics_page():
+    """Page to tag metrics with: the session's page, Login when signed out, or background off the script threads"""
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return BACKGROUND
+    if st.session_state.get('user') is None:
+        return "Login"
+    return st.session_state.get('page', 'Home')
+
+@st.cache_resource
+def get_metrics():
+    """Process-wide upstream call and rerun histograms, with the /metrics endpoint started"""
+    metrics = Metrics(page_of=metrics_page)
+    if METRICS_PORT:
+        try:
+            metrics.serve(METRICS_HOST, int(METRICS_PORT))
+        except (OSError, ValueError) as e:
+            # Another app process already serves the port; keep collecting without it
+            logging.warning("Metrics endpoint not started on %s:%s: %s", METRICS_HOST, METRICS_PORT, e)
+    return metrics
+
+# Module-level so background threads (prefetcher, outbox) record without touching st.cache_resource
+app_metrics = get_metrics()
+
+# Slow-rerun profiles (opt-in: set PROFILE_SLOW_MS and/or PROFILE_SAMPLE_RATE)
+PROFILE_SLOW_MS = os.environ.get("PROFILE_SLOW_MS", "")
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", "") or 0)
+PROFILE_DIR = os.environ.get("PROFILE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "profiles"))
+PROFILE_KEEP = int(os.environ.get("PROFILE_KEEP", "") or 50)
+
+@st.cache_resource
+def get_profiler():
+    """Process-wide sampling profiler for slow reruns (None unless enabled)"""
+    if not PROFILE_SLOW_MS and not PROFILE_SAMPLE_RATE:
+        return None
+    threshold = float(PROFILE_SLOW_MS) / 1000 if PROFILE_SLOW_MS else float("inf")
+    return SlowRerunProfiler(PROFILE_DIR, threshold=threshold, sample_rate=PROFILE_SAMPLE_RATE, keep=PROFILE_KEEP)
+
+def session_state_sizes():
+    """Approximate bytes held by each session-state key"""
+    return {str(key): approximate_size(value) for key, value in st.session_state.items()}
+
+def profile_rerun():
+    """Context manager sampling this script run for the slow-rerun profiler (no-op when it is off)"""
+    profiler = get_profiler()
+    if profiler is None:
+        return nullcontext()
+    return profiler.rerun(page_of=metrics_page, state_sizes=session_state_sizes)
+
+# Initialize Supabase client
+SUPABASE_TIMEOUT = 10  # seconds
+
+@st.cache_resource
+def get_supabase_client(url, key):
+    """One Supabase client per process; its keep-alive HTTP pool is shared by every session.
+    
+    It only ever carries the project key. Signed-in user sessions live in
+    per-session auth clients (see get_auth_client) so JWTs can't leak between users.
+    """
+    options = ClientOptions(
+        persist_session=False,
+        auto_refresh_token=False,
+        storage=SyncMemoryStorage(),
+        postgrest_client_timeout=SUPABASE_TIMEOUT,
+    )
+    client = create_client(url, key, options=options)
+    # Time every table/rpc request at the transport so no call site needs wrapping
+    session = getattr(getattr(client, "postgrest", None), "session", None)
+    if isinstance(session, httpx.Client):
+        session._transport = TracedTransport(session._transport, app_metrics)
+    return client
+
+@st.cache_resource
+def get_auth_http_client():
+    """Pooled HTTP client shared by all per-session auth clients"""
+    return AuthHttpClient(timeout=SUPABASE_TIMEOUT, transport=TracedTransport(httpx.HTTPTransport(), app_metrics))
+
+supabase_client = None
+SUPABASE_URL = SUPABASE_KEY = ""
+SUPABASE_ERROR = None
+if SUPABASE_AVAILABLE:
+    try:
+        # Get credentials from Streamlit secrets
+        SUPABASE_URL = st.secrets.get("supabase", {}).get("url", "")
+        SUPABASE_KEY = st.secrets.get("supabase", {}).get("key", "")
+        
+        if SUPABASE_URL and SUPABASE_KEY:
+            supabase_client = get_supabase_client(SUPABASE_URL, SUPABASE_KEY)
+    except Exception as e:
+        SUPABASE_ERROR = str(e)
+
+def show_connection_status():
+    """Tell the user whether the app is connected to Supabase or running in demo mode"""
+    if not SUPABASE_AVAILABLE:
+        st.error("Supabase package not installed. Please install it with: pip install supabase")
+    elif SUPABASE_ERROR:
+        st.error(f"❌ Could not connect to Supabase: {SUPABASE_ERROR}")
+    elif supabase_client is None:
+        st.warning("⚠️ Supabase credentials not found. Using demo mode.")
+    elif not st.session_state.get('supabase_connected'):
+        st.session_state.supabase_connected = True
+        st.success("✅ Connected to Supabase successfully!")
+
+def get_auth_client():
+    """Get this session's own auth client (None in demo mode)"""
+    if supabase_client is None:
+        return None
+    if 'auth_client' not in st.session_state:
+        st.session_state.auth_client = SyncGoTrueClient(
+            url=f"{SUPABASE_URL}/auth/v1",
+            headers={"apiKey": SUPABASE_KEY, "Authorization": f"Bearer {SUPABASE_KEY}"},
+            storage=SyncMemoryStorage(),
+            http_client=get_auth_http_client(),
+            # Tokens are refreshed by the shared TokenRefresher, not a timer thread per session
+            auto_refresh_token=False,
+            persist_session=False,
+        )
+    return st.session_state.auth_client
+
+@st.cache_resource
+def get_token_refresher():
+    """One background thread refreshing every signed-in session's token before it expires"""
+    return TokenRefresher()
+
+def get_session_auth():
+    """This session's cached sign-in (user, profile and token expiry)"""
+    if 'session_auth' not in st.session_state:
+        st.session_state.session_auth = SessionAuth(get_auth_client(), get_token_refresher() if supabase_client else None)
+    return st.session_state.session_auth
+
+
+# Bible API functions
+BIBLE_API_URL = os.environ.get("BIBLE_API_URL", "https://bible-api.com")
+BIBLE_API_TIMEOUT = (3.05, 10)  # (connect, read) seconds
+FALLBACK_BIBLE_BOOKS = ["Genesis", "Exodus", "Matthew", "John", "Romans", "Psalms"]
+BIBLE_DB_PATH = os.environ.get("BIBLE_DB_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "bible.sqlite3"))
+MAX_CHAPTERS = 150
+MAX_VERSES = 176
+BIBLE_SEARCH_RESULTS = 10
+
+@st.cache_resource
+def get_bible_store():
+    """Open the offline Bible once per process (None if it hasn't been built)"""
+    if not os.path.exists(BIBLE_DB_PATH):
+        return None
+    try:
+        return BibleStore(BIBLE_DB_PATH)
+    except sqlite3.Error:
+        return None
+
+@st.cache_resource
+def get_http_session():
+    """Shared keep-alive HTTP session used by every session and rerun"""
+    session = requests.Session()
+    retry = Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504), allowed_methods=("GET",))
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+@st.cache_resource
+def get_bible_cache():
+    """Process-wide cache for Bible API responses (hits/misses via .stats())"""
+    return TTLCache(maxsize=4096, ttl=24 * 60 * 60, negative_ttl=30)
+
+def fetch_bible_api(path, session=None):
+    """GET a bible-api.com path through the shared session and return its JSON"""
+    target = "books" if path == "books" else "verse" if ":" in path else "chapter"
+    with app_metrics.span("bible_api", target, "get"):
+        response = (session or get_http_session()).get(f"{BIBLE_API_URL}/{path}", timeout=BIBLE_API_TIMEOUT)
+        response.raise_for_status()
+        return response.json()
+
+def get_bible_books():
+    """Get list of Bible books from the offline store, falling back to the API"""
+    store = get_bible_store()
+    if store:
+        return store.books()
+    try:
+        data = get_bible_cache().get_or_load("books", lambda: fetch_bible_api("books"))
+        return [book['name'] for book in data]
+    except Exception:
+        return FALLBACK_BIBLE_BOOKS
+
+def get_bible_verse(book, chapter, verse):
+    """Get specific Bible verse from the offline store, falling back to the API"""
+    store = get_bible_store()
+    if store:
+        found = store.get_verse(book, chapter, verse)
+        if found:
+            return found
+    # Serve from a chapter that is already in memory (chapter mode / prefetch)
+    chapter_verses = get_chapter_prefetcher().peek(book, chapter)
+    if chapter_verses:
+        for number, text in chapter_verses:
+            if number == verse:
+                return text, f"{book} {chapter}:{verse}"
+    # Format book name for API (remove spaces)
+    book_formatted = book.replace(" ", "")
+    path = f"{book_formatted}+{chapter}:{verse}"
+    try:
+        data = get_bible_cache().get_or_load(("verse", path.lower()), lambda: fetch_bible_api(path))
+        return data['text'], data['reference']
+    except requests.HTTPError:
+        return "For God so loved the world that he gave his one and only Son, that whoever believes in him shall not perish but have eternal life.", "John 3:16"
+    except Exception:
+        return "The Lord bless you and keep you; the Lord make his face shine on you and be gracious to you.", "Numbers 6:24-25"
+
+def fetch_bible_chapter(book, chapter, store, session):
+    """Load a whole chapter as [(verse, text)] from the offline store or the API"""
+    if store and store.book_id(book) is not None:
+        # The store has this book: a chapter it lacks doesn't exist, so don't go online
+        verses = store.get_chapter(book, chapter)
+        if not verses:
+            raise ChapterNotFound(f"{book} {chapter}")
+        return verses
+    try:
+        data = fetch_bible_api(f"{book.replace(' ', '')}+{chapter}", session)
+    except requests.HTTPError as e:
+        if e.response is not None and e.response.status_code == 404:
+            raise ChapterNotFound(f"{book} {chapter}") from e
+        raise
+    verses = [(v['verse'], v['text'].strip()) for v in data.get('verses', [])]
+    if not verses:
+        raise ChapterNotFound(f"{book} {chapter}")
+    return verses
+
+@st.cache_resource
+def get_chapter_prefetcher():
+    """Process-wide chapter reader that prefetches adjacent chapters in the background"""
+    # Resolve shared resources here: the prefetch threads have no Streamlit script context
+    store = get_bible_store()
+    session = get_http_session()
+    
+    def chapter_count(book):
+        return (store.chapter_count(book) if store else 0) or MAX_CHAPTERS
+    
+    return ChapterPrefetcher(
+        get_bible_cache(),
+        lambda book, chapter: fetch_bible_chapter(book, chapter, store, session),
+        chapter_count,
+    )
+
+def get_bible_chapter(book, chapter):
+    """Get a whole chapter as [(verse, text)]; empty if it can't be loaded"""
+    try:
+        return get_chapter_prefetcher().get(book, chapter)
+    except Exception:
+        return []
+
+@st.cache_resource
+def get_bible_search():
+    """Build the verse search index once per process (None without the offline store)"""
+    store = get_bible_store()
+    if store is None:
+        return None
+    return BibleSearchIndex.from_store(store)
+
+def search_bible(query, limit=BIBLE_SEARCH_RESULTS):
+    """Search verses by keyword or "exact phrase"; returns (results, elapsed_ms)"""
+    index = get_bible_search()
+    if index is None or not query.strip():
+        return [], 0.0
+    started = time.perf_counter()
+    results = index.search(query, limit=limit)
+    return results, (time.perf_counter() - started) * 1000
+
+def get_chapter_count(book):
+    """Number of chapters in a book (without the offline store, an upper bound lowered once the API reports the end)"""
+    store = get_bible_store()
+    if store and store.chapter_count(book):
+        return store.chapter_count(book)
+    return get_chapter_prefetcher().last_chapter(book)
+
+def get_verse_count(book, chapter):
+    """Number of verses in a chapter (a safe upper bound without the offline store)"""
+    store = get_bible_store()
+    if store and store.verse_count(book, chapter):
+        return store.verse_count(book, chapter)
+    return MAX_VERSES
+
+def get_random_verse():
+    """Get a random inspirational verse"""
+    verses = [
+        ("For I know the plans I have for you, declares the Lord, plans to prosper you and not to harm you, plans to give you hope and a future.", "Jeremiah 29:11"),
+        ("I can do all this through him who gives me strength.", "Philippians 4:13"),
+        ("Trust in the Lord with all your heart and lean not on your own understanding.", "Proverbs 3:5"),
+        ("The Lord is my shepherd, I lack nothing.", "Psalm 23:1"),
+        ("Do not be anxious about anything, but in every situation, by prayer and petition, with thanksgiving, present your requests to God.", "Philippians 4:6")
+    ]
+    return random.choice(verses)
+
+# WAEC API functions
+def get_waec_subjects():
+    """Get list of available WAEC subjects"""
+    return [
+        "Mathematics", "English Language", "Physics", "Chemistry", "Biology",
+        "Economics", "Geography", "Government", "Literature in English",
+        "Financial Accounting", "Commerce", "Agricultural Science",
+        "Further Mathematics", "Christian Religious Studies", "History"
+    ]
+
+def get_waec_years():
+    """Get list of available WAEC years"""
+    return ["2023", "2022", "2021", "2020", "2019", "2018", "2017", "2016"]
+
+WAEC_DB_PATH = os.environ.get("WAEC_DB_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "waec.sqlite3"))
+
+@st.cache_resource
+def get_question_bank():
+    """Process-wide WAEC question bank (built-in sample questions when the file is missing)"""
+    if os.path.exists(WAEC_DB_PATH):
+        try:
+            return QuestionBank.open(WAEC_DB_PATH)
+        except sqlite3.Error:
+            pass
+    return QuestionBank.from_rows(SEED_QUESTIONS)
+
+PROGRESS_COLUMNS = "subject,correct_answers,total_questions,current_streak,best_streak,last_answer_date"
+
+@st.cache_resource
+def get_progress_tracker():
+    """Process-wide study progress counters, updated incrementally from answer events"""
+    client = supabase_client
+    
+    def load_rows(user_id):
+        if not client:
+            return []
+        return client.table("study_progress").select(PROGRESS_COLUMNS).eq("user_id", user_id).execute().data
+    
+    def write_event(row):
+        if client:
+            queue_write("answer_events", row)
+    
+    def write_progress(row):
+        if client:
+            queue_write("study_progress", row, op="upsert", on_conflict="user_id,subject")
+    
+    return ProgressTracker(load_rows, write_event, write_progress)
+
+CARD_COLUMNS = "question_id,easiness,interval_days,repetitions,lapses,due_at"
+
+@st.cache_resource
+def get_practice_scheduler():
+    """Process-wide spaced-repetition decks over the question bank"""
+    client = supabase_client
+    bank = get_question_bank()
+    
+    def load_cards(user_id, subject):
+        if not client:
+            return []
+        return client.table("practice_cards").select(CARD_COLUMNS).eq("user_id", user_id).eq("subject", subject).execute().data
+    
+    def write_cards(rows):
+        if client:
+            for row in rows:
+                queue_write("practice_cards", row, op="upsert", on_conflict="user_id,question_id")
+    
+    return PracticeScheduler(bank.ids, load_cards, write_cards)
+
+def next_practice_question(subject):
+    """The question this user should practise next in a subject, or None"""
+    try:
+        question_id = get_practice_scheduler().next_question(current_user_id(), subject)
+    except Exception:
+        # The user's cards could not be loaded; the caller falls back to random questions
+        return None
+    questions = get_question_bank().get([question_id]) if question_id is not None else []
+    return questions[0] if questions else None
+
+def get_waec_topics(subject, year):
+    """Topics that have questions for a subject and year"""
+    return get_question_bank().topics(subject, year)
+
+def get_waec_questions(subject, year, count=5, topic=None):
+    """Draw random WAEC questions for a subject and year (optionally one topic)"""
+    questions = get_question_bank().sample(subject, year, topic=topic, count=count)
+    if questions:
+        return questions
+    return [
+        {
+            "question": f"Sample {subject} question for {year}",
+            "options": ["Option A", "Option B", "Option C", "Option D"],
+            "answer": "Option A",
+            "explanation": "This is a placeholder question."
+        }
+    ]
+
+def get_study_resources(subject):
+    """Get study resources for a subject"""
+    resources = {
+        "Mathematics": [
+            {"title": "Algebra Fundamentals", "type": "PDF", "url": "#"},
+            {"title": "Geometry Formulas", "type": "Cheat Sheet", "url": "#"}
+        ],
+        "English Language": [
+            {"title": "Grammar Rules", "type": "PDF", "url": "#"},
+            {"title": "Essay Writing Guide", "type": "Guide", "url": "#"}
+        ]
+    }
+    return resources.get(subject, [{"title": "Resources coming soon", "type": "Info", "url": "#"}])
+
+# Chat functions with Supabase integration
+CONTACTS_PAGE_SIZE = 20      # contacts shown per page of search results
+CONTACT_INDEX_TTL = 300      # seconds before the shared contact index is reloaded
+CONTACT_LOAD_PAGE = 1000     # profiles fetched per request when loading the index
+DEMO_CONTACTS = [
+    {"id": "user2", "username": "Grace", "number": "1234", "online": True},
+    {"id": "user3", "username": "David", "number": "5678", "online": False},
+    {"id": "user4", "username": "Sarah", "number": "9012", "online": True}
+]
+
+@st.cache_resource
+def get_contact_index():
+    """Process-wide search index over every profile (id, username and number only)"""
+    client = supabase_client
+    
+    def load_profiles():
+        if not client:
+            return DEMO_CONTACTS
+        contacts = []
+        last_id = None
+        while True:
+            query = client.table("profiles").select("id,username,number").order("id").limit(CONTACT_LOAD_PAGE)
+            if last_id is not None:
+                query = query.gt("id", last_id)
+            rows = query.execute().data or []
+            contacts.extend(
+                {
+                    "id": user["id"],
+                    "username": user.get("username") or "Unknown",
+                    "number": str(user.get("number") or "0000")
+                }
+                for user in rows
+            )
+            if len(rows) < CONTACT_LOAD_PAGE:
+                return contacts or DEMO_CONTACTS
+            last_id = rows[-1]["id"]
+    
+    return ContactIndex(load_profiles, ttl=CONTACT_INDEX_TTL, fallback=DEMO_CONTACTS)
+
+def search_chat_users(query, limit=CONTACTS_PAGE_SIZE, offset=0):
+    """Return (contacts, total) matching a name or code, excluding the current user"""
+    return get_contact_index().search(query, limit=limit, offset=offset, exclude=current_user_id())
+
+def get_chat_user(user_id):
+    """Look up one contact by id"""
+    return get_contact_index().get(user_id)
+
+PRESENCE_TTL = 60              # seconds after the last heartbeat a user still shows as online
+PRESENCE_WRITE_INTERVAL = 20   # at most one presence write per user per this many seconds
+
+@st.cache_resource
+def get_presence():
+    """Process-wide presence tracker fed by session heartbeats"""
+    client = supabase_client
+    if not client:
+        demo_online = [user["id"] for user in DEMO_CONTACTS if user["online"]]
+        return PresenceTracker(load_presence=lambda user_ids: {u: time.time() for u in user_ids if u in demo_online},
+                               ttl=PRESENCE_TTL, write_interval=PRESENCE_WRITE_INTERVAL)
+    
+    def write_batch(rows):
+        client.table("presence").upsert(rows, on_conflict="user_id").execute()
+    
+    def load_presence(user_ids):
+        rows = client.table("presence").select("user_id,last_seen").in_("user_id", list(user_ids)).execute().data or []
+        return {row["user_id"]: row["last_seen"] for row in rows}
+    
+    return PresenceTracker(write_batch, load_presence, ttl=PRESENCE_TTL, write_interval=PRESENCE_WRITE_INTERVAL)
+
+def get_study_groups():
+    """Get list of study groups"""
+    try:
+        if supabase_client:
+            # Try to get groups from Supabase
+            response = supabase_client.table("study_groups").select("*").execute()
+            if response.data:
+                return response.data
+    except:
+        pass
+    
+    # Fallback to demo groups
+    return [
+        {"id": "group1", "name": "Math Study Group", "members": 5, "subject": "Mathematics", "description": "Math help"},
+        {"id": "group2", "name": "Science Club", "members": 8, "subject": "Science", "description": "Science discussions"}
+    ]
+
+CHAT_PAGE_SIZE = 50        # messages fetched per page
+CHAT_WINDOW = 200          # most messages kept per chat (shared window, or a session's scroll-back copy)
+CHAT_VISIBLE = 30          # messages drawn at once; the rest are reached with Earlier/Newer
+CHAT_REFRESH_SECONDS = 2   # how often an open chat polls for newer messages
+CHAT_RESYNC_SECONDS = 30   # polling interval while realtime push is connected
+CHAT_PUSH_INTERVAL = 0.5   # how often the chat pane checks for pushed messages
+CHAT_CACHE_CHATS = 500     # chats whose window is kept in memory; the least recently read go first
+CHAT_CACHE_TTL = 600       # seconds before a cached window is reloaded from the database
+MESSAGE_STATUS_LABELS = {"pending": " · ⏳ sending", "queued": " · 📥 saved offline, will send",
+                         "failed": " · ⚠️ not sent"}
+MESSAGE_COLUMNS = "id,seq,client_id,chat_id,sender_id,content,created_at"
+
+def current_user_id():
+    """Id of the signed-in user (a Supabase user object, or a dict in demo mode)"""
+    user = st.session_state.user
+    return user.get("id") if isinstance(user, dict) else getattr(user, "id", None)
+
+def message_key(row):
+    """Identity of a messages row.
+    
+    client_id is the sender's idempotency key, so it names the message the same
+    way in the sender's session, the database and realtime pushes.
+    """
+    return row.get("client_id") or row.get("id")
+
+def to_chat_message(row):
+    """Convert a messages row into the dict the chat pane renders (the same for every viewer)"""
+    return {
+        "id": message_key(row),
+        "seq": row.get("seq"),
+        "sender": row["sender_id"],
+        "text": row["content"],
+        "timestamp": row.get("created_at") or ""
+    }
+
+@st.cache_resource
+def get_chat_cache():
+    """Process-wide window of each active chat's recent messages, shared by every session viewing it"""
+    return ChatCache(query_messages, to_chat_message, message_key, size=CHAT_WINDOW, page_size=CHAT_PAGE_SIZE,
+                     max_chats=CHAT_CACHE_CHATS, ttl=CHAT_CACHE_TTL)
+
+@st.cache_resource
+def get_chat_hub():
+    """Process-wide realtime hub; also starts the Supabase realtime listener when configured"""
+    if supabase_client:
+        # Sent and pushed messages go into the shared window before the viewers are told
+        hub = ChatHub(on_publish=get_chat_cache().add)
+        SupabaseRealtimeListener(SUPABASE_URL, SUPABASE_KEY, hub).start()
+    else:
+        hub = ChatHub()
+    return hub
+
+def get_chat_subscription(chat_id):
+    """This session's realtime subscription, moved to chat_id if needed"""
+    sub = st.session_state.get('chat_subscription')
+    if sub is None or sub.chat_id != chat_id or sub.closed:
+        if sub is not None:
+            sub.close()
+        sub = get_chat_hub().subscribe(chat_id)
+        st.session_state.chat_subscription = sub
+    return sub
+
+def apply_chat_updates(chat_id):
+    """Take the messages pushed to chat_id since the last call; returns their insert times.
+    
+    With Supabase they are already in the shared window; in demo mode they are
+    merged into this session's list.
+    """
+    items = get_chat_subscription(chat_id).drain()
+    if not items:
+        return []
+    messages = st.session_state.chat_messages.get(chat_id)
+    if supabase_client:
+        if messages is not None:
+            # Reading older history; these come back with "Jump to latest"
+            return []
+    elif messages is not None:
+        known = {msg["id"] for msg in messages}
+        for row, _ in items:
+            if message_key(row) not in known:
+                messages.append(to_chat_message(row))
+                known.add(message_key(row))
+        if len(messages) > CHAT_WINDOW:
+            del messages[:len(messages) - CHAT_WINDOW]
+    return [inserted_at for _, inserted_at in items]
+
+def query_messages(chat_id, newer_than=None, older_than=None, limit=CHAT_PAGE_SIZE):
+    """Fetch one page of a chat by seq cursor, oldest first.
+    
+    seq is numbered by the database on insert (sql/004_message_seq.sql), so a
+    message replayed late from the journal, or sent from a host with a wrong
+    clock, still sorts after everything other viewers have already loaded.
+    """
+    query = supabase_client.table("messages").select(MESSAGE_COLUMNS).eq("chat_id", chat_id)
+    if newer_than is not None:
+        return query.gt("seq", newer_than).order("seq").limit(limit).execute().data or []
+    if older_than is not None:
+        query = query.lt("seq", older_than)
+    rows = query.order("seq", desc=True).limit(limit).execute().data or []
+    return rows[::-1]
+
+def get_chat_position(chat_id):
+    """Whether a chat has older messages to load and whether it is following new ones"""
+    cursor = st.session_state.chat_cursors.get(chat_id)
+    if cursor:
+        return cursor
+    window = get_chat_cache().peek(chat_id) if supabase_client else None
+    return {"has_older": bool(window and window.has_older), "live": True}
+
+def load_older_messages(chat_id):
+    """Load the page before the oldest loaded message ("Earlier messages").
+    
+    Pages go into the shared window while it has room, so every viewer gets
+    them; past that the session continues on its own copy, which stops
+    following new messages until "Jump to latest".
+    """
+    if not supabase_client:
+        return
+    try:
+        if chat_id not in st.session_state.chat_messages:
+            cache = get_chat_cache()
+            if cache.extend_older(chat_id):
+                return
+            window = cache.window(chat_id)
+            if not window.has_older:
+                return
+            st.session_state.chat_messages[chat_id] = list(window.messages)
+            st.session_state.chat_cursors[chat_id] = {"oldest": window.oldest, "has_older": True, "live": False}
+        cursor = st.session_state.chat_cursors[chat_id]
+        if not cursor["has_older"]:
+            return
+        messages = st.session_state.chat_messages[chat_id]
+        known = {msg["id"] for msg in messages}
+        rows = query_messages(chat_id, older_than=cursor["oldest"], limit=CHAT_PAGE_SIZE)
+        older = [to_chat_message(row) for row in rows if message_key(row) not in known]
+        cursor["has_older"] = len(rows) == CHAT_PAGE_SIZE and bool(older)
+        if not older:
+            return
+        messages[:0] = older
+        cursor["oldest"] = older[0]["seq"]
+        if len(messages) > CHAT_WINDOW:
+            # Keep the copy bounded: drop the newest end
+            del messages[CHAT_WINDOW:]
+    except:
+        pass
+
+def jump_to_latest_messages(chat_id):
+    """Leave scroll-back and follow the shared window again ("Jump to latest")"""
+    if supabase_client:
+        st.session_state.chat_messages.pop(chat_id, None)
+        st.session_state.chat_cursors.pop(chat_id, None)
+
+def get_chat_messages(chat_id, refresh=True):
+    """Get chat messages for a specific chat.
+    
+    With Supabase this is the chat's shared window (polled for newer messages
+    at most once per interval across all viewers) followed by this session's
+    sends that the window doesn't have yet.  Don't modify the returned list.
+    """
+    # Initialize chat_messages as dictionary if not already
+    if not isinstance(st.session_state.chat_messages, dict):
+        st.session_state.chat_messages = {}
+    
+    if chat_id in st.session_state.chat_messages:
+        # Demo mode, or reading history older than the shared window
+        return st.session_state.chat_messages[chat_id]
+    
+    try:
+        if supabase_client:
+            cache = get_chat_cache()
+            if refresh:
+                interval = CHAT_RESYNC_SECONDS if get_chat_hub().live else CHAT_REFRESH_SECONDS
+                window = cache.refresh(chat_id, interval)
+            else:
+                window = cache.window(chat_id)
+            pending = st.session_state.setdefault("chat_pending", {})
+            mine = [msg for msg in pending.get(chat_id, []) if msg["id"] not in window.keys]
+            if not mine:
+                pending.pop(chat_id, None)
+                return window.messages
+            pending[chat_id] = mine
+            return window.messages + mine
+    except:
+        pass
+    
+    # Fallback to demo messages
+    sample_messages = {
+        "user2": [
+            {"id": "1", "sender": "user2", "text": "Hey there! How are you?", "timestamp": "2023-05-15 10:30:15", "type": "received"},
+            {"id": "2", "sender": "me", "text": "I'm good, thanks!", "timestamp": "2023-05-15 10:32:45", "type": "sent"}
+        ],
+        "user3": [
+            {"id": "1", "sender": "me", "text": "Hi David!", "timestamp": "2023-05-14 15:20:10", "type": "sent"}
+        ],
+        "user4": [
+            {"id": "1", "sender": "user4", "text": "Hello! How can I help you?", "timestamp": "2023-05-13 18:45:30", "type": "received"}
+        ],
+        "group1": [
+            {"id": "1", "sender": "Grace", "text": "Welcome to the Math Study Group!", "timestamp": "2023-05-10 09:15:20", "type": "received"},
+            {"id": "2", "sender": "me", "text": "Thanks! I'm excited to join.", "timestamp": "2023-05-10 09:20:35", "type": "sent"}
+        ]
+    }
+    
+    st.session_state.chat_messages[chat_id] = sample_messages.get(chat_id, [])
+    return st.session_state.chat_messages[chat_id]
+
+def last_chat_message(chat_id):
+    """Newest message of a chat this session has open, without loading anything"""
+    pending = st.session_state.get("chat_pending", {}).get(chat_id)
+    if pending:
+        return pending[-1]
+    messages = st.session_state.get("chat_messages", {}).get(chat_id)
+    if messages is None and supabase_client:
+        window = get_chat_cache().peek(chat_id)
+        messages = window.messages if window else None
+    return messages[-1] if messages else None
+
+WRITE_JOURNAL_PATH = os.environ.get("WRITE_JOURNAL_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "journal.sqlite3"))
+
+@st.cache_resource
+def get_write_journal():
+    """Local journal of writes not yet confirmed by Supabase (survives restarts)"""
+    os.makedirs(os.path.dirname(WRITE_JOURNAL_PATH) or ".", exist_ok=True)
+    return Journal(WRITE_JOURNAL_PATH)
+
+@st.cache_resource
+def get_outbox():
+    """Process-wide write-behind queue that journals and batches writes from every session"""
+    client = supabase_client
+    
+    def write_batch(head, rows):
+        query = client.table(head.table)
+        if head.op == "insert":
+            return query.upsert(rows, on_conflict=head.key_column, ignore_duplicates=True).execute().data
+        if head.op == "upsert":
+            if head.on_conflict:
+                return query.upsert(rows, on_conflict=head.on_conflict).execute().data
+            return query.upsert(rows[0]).execute().data
+        query = query.update(rows[0])
+        for column, value in (head.match or {}).items():
+            query = query.eq(column, value)
+        return query.execute().data
+    
+    return Outbox(get_write_journal(), write_batch)
+
+def queue_write(table, row, op="insert", on_done=None, **options):
+    """Journal a Supabase write and return at once; it is replayed until Supabase confirms it"""
+    if op == "insert":
+        row.setdefault("client_id", str(uuid.uuid4()))
+    user_column = PROFILE_STATS_TABLES.get(table)
+    if user_column and row.get(user_column):
+        on_done = invalidate_when_sent(get_profile_stats_cache(), ("profile_stats", row[user_column]), on_done)
+    return get_outbox().submit(table, row, op=op, on_done=on_done, **options)
+
+# Profile stats
+PROFILE_STATS_TTL = 300
+# Tables whose writes change a user's profile stats, and the column naming that user
+PROFILE_STATS_TABLES = {"messages": "sender_id", "devotionals": "user_id", "study_progress": "user_id", "saved_verses": "user_id"}
+
+@st.cache_resource
+def get_profile_stats_cache():
+    """Per-user profile stats, dropped once one of the user's relevant writes reaches Supabase"""
+    return TTLCache(maxsize=10000, ttl=PROFILE_STATS_TTL, negative_ttl=5)
+
+def invalidate_when_sent(cache, key, on_done=None):
+    """Outbox callback (worker thread) that drops a cache entry once the write is confirmed"""
+    def done(entry):
+        if entry.status == "sent":
+            cache.invalidate(key)
+        if on_done:
+            on_done(entry)
+    return done
+
+def get_profile_stats(user_id):
+    """Everything the Profile page shows for a user, from one profile_stats RPC"""
+    if not supabase_client:
+        # Demo mode: what this process knows about the session
+        tracker = get_progress_tracker()
+        return normalize_profile_stats({
+            "messages": st.session_state.message_count,
+            "subjects": [{"subject": p.subject, "correct_answers": p.correct, "total_questions": p.total, "best_streak": p.best_streak}
+                         for p in tracker.subjects(user_id)],
+            "overall": tracker.overall(user_id).to_row(user_id, datetime.now()),
+        })
+    
+    # The function reads auth.uid(), so it is called with the user's own token
+    auth = st.session_state.get('session_auth')
+    token = auth.access_token if auth else None
+    if not token:
+        return normalize_profile_stats(None)
+    
+    def load():
+        request = supabase_client.rpc("profile_stats", {})
+        request.headers["Authorization"] = f"Bearer {token}"
+        return normalize_profile_stats(request.execute().data)
+    
+    try:
+        return get_profile_stats_cache().get_or_load(("profile_stats", user_id), load)
+    except Exception:
+        return normalize_profile_stats(None)
+
+def send_message(chat_id, message_text):
+    """Send a message to a chat"""
+    if supabase_client:
+        # Shown from this session's pending list until the shared window has it
+        jump_to_latest_messages(chat_id)
+        messages = st.session_state.setdefault("chat_pending", {}).setdefault(chat_id, [])
+    else:
+        messages = st.session_state.chat_messages.setdefault(chat_id, [])
+    
+    # Create message object; its id is also the idempotency key of the insert
+    st.session_state.message_count += 1
+    client_id = str(uuid.uuid4())
+    new_message = {
+        "id": client_id,
+        "sender": "me",
+        "text": message_text,
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "type": "sent",
+        "status": "pending" if supabase_client else "sent"
+    }
+    
+    # Add to session state
+    messages.append(new_message)
+    
+    # created_at and seq are assigned by the database when the insert lands,
+    # which may be long after now if the message waits in the journal
+    row = {
+        "client_id": client_id,
+        "chat_id": chat_id,
+        "sender_id": current_user_id(),
+        "content": message_text
+    }
+    hub = get_chat_hub()
+    if supabase_client:
+        # Journal the insert; the outbox worker flips the status and pushes the
+        # message to other viewers once the write is confirmed
+        queue_write("messages", row, on_done=lambda entry: message_written(entry, new_message, hub))
+    else:
+        hub.publish(chat_id, dict(row, created_at=new_message["timestamp"]))
+    
+    # Simulate response
+    if chat_id in ["user2", "user3", "user4"]:
+        st.session_state.message_count += 1
+        response_message = {
+            "id": str(uuid.uuid4()),
+            "sender": chat_id,
+            "text": "Thanks for your message!",
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "type": "received"
+        }
+        messages.append(response_message)
+
+def message_written(entry, message, hub):
+    """Outbox callback (worker thread): record the outcome of a message insert"""
+    message["status"] = entry.status
+    if entry.status == "sent":
+        hub.publish(entry.row["chat_id"], entry.result or entry.row)
+
+def create_study_group(name, subject, description):
+    """Create a new study group"""
+    new_group = {
+        "id": f"group{len(st.session_state.study_groups) + 1}",
+        "name": name,
+        "subject": subject,
+        "description": description,
+        "members": 1,
+        "created_by": st.session_state.profile.get('username', 'User')
+    }
+    
+    # Save to Supabase if available
+    try:
+        if supabase_client:
+            queue_write("study_groups", {
+                "name": name,
+                "subject": subject,
+                "description": description,
+                "members": 1,
+                "created_by": st.session_state.user.id
+            })
+    except:
+        pass
+    
+    st.session_state.study_groups.append(new_group)
+    return new_group
+
+# Worship songs
+worship_songs = [
+    {"title": "Amazing Grace", "artist": "Chris Tomlin", "url": "https://cdn.pixabay.com/download/audio/2022/01/20/audio_5c27c9508f.mp3?filename=amazing-grace-121002.mp3"},
+    {"title": "What a Beautiful Name", "artist": "Hillsong Worship", "url": "https://cdn.pixabay.com/download/audio/2021/10/25/audio_5b86d4f9c0.mp3?filename=inspirational-background-music-112834.mp3"},
+    {"title": "Oceans", "artist": "Hillsong UNITED", "url": "https://cdn.pixabay.com/download/audio/2022/03/15/audio_345c531f9c.mp3?filename=soft-inspiring-background-amp-amp-piano-118532.mp3"}
+]
+
+def search_worship_songs(query):
+    """Search for worship songs"""
+    if not query:
+        return worship_songs
+    return [song for song in worship_songs if query.lower() in song['title'].lower() or query.lower() in song['artist'].lower()]
+
+# Authentication functions with Supabase integration
+def sign_up(email, password, username, number):
+    try:
+        if supabase_client:
+            # Create user with Supabase Auth
+            auth_response = get_auth_client().sign_up({
+                "email": email,
+                "password": password,
+            })
+            
+            if auth_response.user:
+                # Create profile in profiles table
+                profile_response = supabase_client.table("profiles").insert({
+                    "id": auth_response.user.id,
+                    "username": username,
+                    "number": number,
+                    "email": email
+                }).execute()
+                
+                if profile_response.data:
+                    st.session_state.profile = profile_response.data[0]
+                    get_session_auth().start(auth_response.user, st.session_state.profile, auth_response.session)
+                    get_contact_index().upsert({"id": auth_response.user.id, "username": username, "number": str(number)})
+                    st.session_state.user = auth_response.user
+                    return True, "Sign up successful! Please check your email to verify your account."
+                else:
+                    return False, "Error creating profile."
+            else:
+                return False, "Error creating account."
+        else:
+            # Demo mode
+            st.session_state.profile = {
+                "id": f"user{random.randint(1000, 9999)}",
+                "username": username,
+                "number": number,
+                "email": email
+            }
+            st.session_state.user = {"id": st.session_state.profile["id"]}
+            return True, "Sign up successful! (Demo mode)"
+    
+    except Exception as e:
+        return False, f"Error: {str(e)}"
+
+def sign_in(email, password):
+    try:
+        if supabase_client:
+            response = get_auth_client().sign_in_with_password({
+                "email": email,
+                "password": password
+            })
+            
+            if response.user:
+                st.session_state.user = response.user
+                
+                # Get user profile
+                profile = supabase_client.table("profiles").select("*").eq("id", response.user.id).execute()
+                if profile.data:
+                    st.session_state.profile = profile.data[0]
+                    get_session_auth().start(response.user, st.session_state.profile, response.session)
+                    return True, "Login successful!"
+                else:
+                    return False, "Profile not found. Please contact support."
+            else:
+                return False, "Login failed. Please check your credentials."
+        else:
+            # Demo mode
+            if email and password:
+                st.session_state.profile = {
+                    "id": "user1",
+                    "username": "CurrentUser",
+                    "number": "1001",
+                    "email": email
+                }
+                st.session_state.user = {"id": st.session_state.profile["id"]}
+                return True, "Login successful! (Demo mode)"
+            else:
+                return False, "Please enter email and password"
+    
+    except Exception as e:
+        return False, f"Error: {str(e)}"
+
+def sign_out():
+    """Sign out and clear the account state; page state is reset by views.reset_state()"""
+    try:
+        get_presence().leave(current_user_id())
+        if st.session_state.get('chat_subscription'):
+            st.session_state.chat_subscription.close()
+        if supabase_client:
+            get_auth_client().sign_out()
+        get_session_auth().clear()
+        st.session_state.user = None
+        st.session_state.profile = {}
+        st.session_state.page = 'Home'
+        st.session_state.message_count = 0
+        return True
+    except Exception as e:
+        st.error(f"Error signing out: {str(e)}")
+
+def check_auth():
+    """Whether this session is signed in; called once per rerun.
+    
+    Answers from the session's cached sign-in. The auth server is only
+    contacted when the token has expired without being refreshed in the
+    background; if it can't be renewed the session is signed out.
+    """
+    if st.session_state.user is None:
+        return False
+    auth = st.session_state.get('session_auth')
+    if auth is None or auth.expires_at is None:
+        # Demo mode, or signed up and waiting for email confirmation
+        return True
+    if auth.validate():
+        st.session_state.user = auth.user
+        return True
+    st.session_state.user = None
+    st.session_state.profile = {}
+    return False
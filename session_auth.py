@@ -0,0 +1,167 @@
+"""Per-session sign-in state with background token refresh.
+
+``SessionAuth`` remembers the signed-in user, their profile and when the
+access token expires, so checking the sign-in on a rerun is a clock
+comparison rather than a call to the auth server.  One process-wide
+``TokenRefresher`` thread refreshes each session's token ``margin`` seconds
+before it expires.  A session therefore makes at most one auth round trip
+per token lifetime; the check only refreshes inline if the background
+refresh has not happened by the time the token runs out.
+
+The GoTrue client of each session must be created with
+``auto_refresh_token=False`` (otherwise it starts its own timer thread per
+session) and ``persist_session=False``.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+import weakref
+
+REFRESH_MARGIN = 60   # seconds before expiry at which the token is refreshed
+RETRY_INTERVAL = 15   # seconds between attempts after a failed refresh
+
+
+class SessionAuth:
+    """Signed-in user, profile and token of one browser session"""
+
+    def __init__(self, client, refresher=None, margin=REFRESH_MARGIN):
+        self.client = client
+        self.refresher = refresher
+        self.margin = margin
+        self._lock = threading.Lock()
+        self.user = None
+        self.profile = {}
+        self.expires_at = None   # epoch seconds; None when no token is tracked
+        self.access_token = None  # the user's JWT, for calls that act as the user (RPCs using auth.uid())
+        self.refreshes = 0
+        self.failures = 0
+        self.last_error = None
+
+    @property
+    def signed_in(self):
+        return self.user is not None
+
+    def start(self, user, profile, session=None):
+        """Remember a successful sign-in (``session`` may be None, e.g. before email confirmation)"""
+        with self._lock:
+            self.user = user
+            self.profile = profile or {}
+            self.expires_at = None
+            self.access_token = None
+            if session is not None:
+                self._set_session(session)
+
+    def clear(self):
+        with self._lock:
+            self.user = None
+            self.profile = {}
+            self.expires_at = None
+            self.access_token = None
+
+    def _set_session(self, session):
+        now = time.time()
+        self.expires_at = session.expires_at or (now + (session.expires_in or 3600))
+        self.access_token = session.access_token
+        if session.user is not None:
+            self.user = session.user
+        if self.refresher is not None:
+            # Short-lived tokens are refreshed halfway through their lifetime
+            lead = min(self.margin, (self.expires_at - now) / 2)
+            self.refresher.schedule(self, self.expires_at - lead)
+
+    def validate(self, now=None):
+        """True while the session is signed in with a usable token; no network call unless the token ran out"""
+        now = now or time.time()
+        with self._lock:
+            if self.user is None:
+                return False
+            if self.expires_at is None or now < self.expires_at:
+                return True
+        return self.refresh()
+
+    def refresh(self):
+        """Exchange the refresh token for a new access token; False (and signed out) if that is impossible"""
+        with self._lock:
+            if self.user is None:
+                return False
+            try:
+                response = self.client.refresh_session()
+                if response.session is None:
+                    raise RuntimeError("no session returned")
+            except Exception as e:
+                self.failures += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+                if self.expires_at is not None and time.time() >= self.expires_at:
+                    # The token is gone and cannot be renewed
+                    self.user = None
+                    self.profile = {}
+                    self.expires_at = None
+                    self.access_token = None
+                elif self.refresher is not None:
+                    self.refresher.schedule(self, time.time() + RETRY_INTERVAL)
+                return False
+            self.refreshes += 1
+            self.last_error = None
+            self._set_session(response.session)
+            return True
+
+
+class TokenRefresher:
+    """One thread that refreshes the tokens of all signed-in sessions before they expire.
+
+    Sessions are held weakly: a session that is dropped (browser closed)
+    simply stops being refreshed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._heap = []   # (due, seq, weakref to SessionAuth)
+        self._due = weakref.WeakKeyDictionary()   # SessionAuth -> due time of its live heap entry
+        self._seq = itertools.count()
+        self.refreshed = 0
+        self.failed = 0
+        threading.Thread(target=self._run, name="token-refresh", daemon=True).start()
+
+    def schedule(self, auth, due):
+        with self._lock:
+            self._due[auth] = due
+            heapq.heappush(self._heap, (due, next(self._seq), weakref.ref(auth)))
+        self._wake.set()
+
+    def _next(self):
+        """Pop the next session whose refresh is due, or return the seconds to wait"""
+        with self._lock:
+            while self._heap:
+                due, _, ref = self._heap[0]
+                auth = ref()
+                if auth is None or self._due.get(auth) != due:
+                    heapq.heappop(self._heap)   # dropped or rescheduled
+                    continue
+                wait = due - time.time()
+                if wait > 0:
+                    return None, wait
+                heapq.heappop(self._heap)
+                del self._due[auth]
+                return auth, 0
+        return None, None
+
+    def _run(self):
+        while True:
+            auth, wait = self._next()
+            if auth is None:
+                self._wake.wait(wait)
+                self._wake.clear()
+                continue
+            ok = auth.refresh()
+            with self._lock:
+                if ok:
+                    self.refreshed += 1
+                else:
+                    self.failed += 1
+
+    def stats(self):
+        with self._lock:
+            return {"sessions": len(self._due), "refreshed": self.refreshed, "failed": self.failed}
@@ -0,0 +1,13 @@
+-- Idempotency keys for writes replayed from the local journal (see "Offline writes").
+-- Inserts are sent as upserts on client_id with ignore_duplicates, which needs a
+-- unique index on that column.
+
+alter table public.messages add column if not exists client_id uuid;
+alter table public.study_groups add column if not exists client_id uuid;
+alter table public.saved_verses add column if not exists client_id uuid;
+alter table public.devotionals add column if not exists client_id uuid;
+
+create unique index if not exists messages_client_id_key on public.messages (client_id);
+create unique index if not exists study_groups_client_id_key on public.study_groups (client_id);
+create unique index if not exists saved_verses_client_id_key on public.saved_verses (client_id);
+create unique index if not exists devotionals_client_id_key on public.devotionals (client_id);
@@ -0,0 +1,42 @@
+-- WAEC answer log, per-subject progress counters and spaced-repetition cards.
+-- study_progress holds one row per (user, subject) plus an overall row with
+-- subject = '*'; the app upserts on (user_id, subject). If the table already
+-- has duplicate (user_id, subject) rows, delete all but the newest before
+-- creating the unique index.
+
+create table if not exists public.answer_events (
+    id bigint generated always as identity primary key,
+    client_id uuid not null,
+    user_id uuid not null,
+    subject text not null,
+    question_id integer,
+    correct boolean not null,
+    answered_at timestamptz not null default now()
+);
+create unique index if not exists answer_events_client_id_key on public.answer_events (client_id);
+create index if not exists answer_events_user_id_idx on public.answer_events (user_id, answered_at);
+
+create table if not exists public.study_progress (
+    user_id uuid not null,
+    subject text not null,
+    correct_answers integer not null default 0,
+    total_questions integer not null default 0,
+    last_updated timestamptz
+);
+alter table public.study_progress add column if not exists current_streak integer not null default 0;
+alter table public.study_progress add column if not exists best_streak integer not null default 0;
+alter table public.study_progress add column if not exists last_answer_date date;
+create unique index if not exists study_progress_user_subject_key on public.study_progress (user_id, subject);
+
+create table if not exists public.practice_cards (
+    user_id uuid not null,
+    subject text not null,
+    question_id integer not null,
+    easiness real not null default 2.5,
+    interval_days real not null default 0,
+    repetitions integer not null default 0,
+    lapses integer not null default 0,
+    due_at timestamptz not null
+);
+create unique index if not exists practice_cards_user_question_key on public.practice_cards (user_id, question_id);
+create index if not exists practice_cards_user_subject_idx on public.practice_cards (user_id, subject);
@@ -0,0 +1,7 @@
+-- Last heartbeat per user; the app upserts batches of (user_id, last_seen)
+-- on user_id and reads them back for the contact list.
+
+create table if not exists public.presence (
+    user_id uuid primary key,
+    last_seen timestamptz not null
+);
@@ -0,0 +1,50 @@
+-- Server-assigned order of chat messages. The app pages and polls a chat by
+-- seq instead of created_at, so messages replayed late from the local journal
+-- (or sent from a host with a wrong clock) are still picked up by other
+-- viewers. created_at is left to the database as well.
+--
+-- Existing rows are numbered in created_at order before seq becomes an
+-- identity column (adding the identity column directly would number them in
+-- physical order), and new rows continue above the highest number.
+
+alter table public.messages add column if not exists seq bigint;
+
+do $$
+declare
+    next_seq bigint;
+begin
+    lock table public.messages in exclusive mode;
+
+    -- Renumber unless every row already has a seq in created_at order (a re-run).
+    -- This also repairs seq values an earlier version of this file assigned.
+    if exists (select 1 from public.messages where seq is null)
+       or exists (
+           select 1
+           from (select seq, lag(seq) over (order by created_at, id) as previous from public.messages) ordered
+           where seq < previous
+       ) then
+        alter table public.messages alter column seq drop identity if exists;
+        -- Recreated below; renumbering in place could briefly collide on it
+        drop index if exists public.messages_chat_seq_key;
+        update public.messages m
+        set seq = numbered.n
+        from (select id, row_number() over (order by created_at, id) as n from public.messages) numbered
+        where m.id = numbered.id;
+    end if;
+
+    if not exists (
+        select 1 from information_schema.columns
+        where table_schema = 'public' and table_name = 'messages' and column_name = 'seq' and is_identity = 'YES'
+    ) then
+        select coalesce(max(seq), 0) + 1 into next_seq from public.messages;
+        alter table public.messages alter column seq set not null;
+        execute format(
+            'alter table public.messages alter column seq add generated always as identity (start with %s)',
+            next_seq
+        );
+    end if;
+end
+$$;
+
+alter table public.messages alter column created_at set default now();
+create unique index if not exists messages_chat_seq_key on public.messages (chat_id, seq);
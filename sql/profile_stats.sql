@@ -0,0 +1,58 @@
+-- Everything the Profile page shows about the signed-in user, in one round trip:
+--   select profile_stats();
+-- The user is auth.uid(), never a parameter, so nobody can read someone
+-- else's counts.
+-- Points and achievements are derived from these counts in profile_stats.py.
+
+create index if not exists messages_sender_id_idx on public.messages (sender_id);
+create index if not exists devotionals_user_id_idx on public.devotionals (user_id);
+create index if not exists saved_verses_user_id_idx on public.saved_verses (user_id);
+
+-- Earlier versions took the user id as an argument
+drop function if exists public.profile_stats(uuid);
+
+create or replace function public.profile_stats()
+returns jsonb
+language sql
+stable
+security invoker
+set search_path = ''
+as $$
+    select jsonb_build_object(
+        'friends', (
+            -- people the user has had a direct conversation with
+            select count(distinct m.chat_id)
+            from public.messages m
+            join public.profiles p on p.id::text = m.chat_id
+            where m.sender_id = (select auth.uid())
+        ),
+        'messages', (select count(*) from public.messages where sender_id = (select auth.uid())),
+        'devotionals', (select count(*) from public.devotionals where user_id = (select auth.uid())),
+        'saved_verses', (select count(*) from public.saved_verses where user_id = (select auth.uid())),
+        'subjects', coalesce((
+            select jsonb_agg(jsonb_build_object(
+                       'subject', subject,
+                       'correct_answers', correct_answers,
+                       'total_questions', total_questions,
+                       'best_streak', best_streak
+                   ) order by total_questions desc)
+            from public.study_progress
+            where user_id = (select auth.uid()) and subject <> '*'
+        ), '[]'::jsonb),
+        'overall', (
+            select jsonb_build_object(
+                'correct_answers', correct_answers,
+                'total_questions', total_questions,
+                'current_streak', current_streak,
+                'best_streak', best_streak,
+                'last_answer_date', last_answer_date
+            )
+            from public.study_progress
+            where user_id = (select auth.uid()) and subject = '*'
+        )
+    );
+$$;
+
+-- The app calls this with the signed-in user's access token
+revoke all on function public.profile_stats() from public, anon;
+grant execute on function public.profile_stats() to authenticated;
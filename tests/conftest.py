@@ -0,0 +1,17 @@
+import os
+import sys
+import time
+
+# The app's modules sit next to teens-app.py, not in a package
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def wait_until(condition, timeout=5.0):
+    """Poll condition() until it is true; fail the test after timeout seconds"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        time.sleep(0.005)
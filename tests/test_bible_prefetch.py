@@ -0,0 +1,66 @@
+import threading
+
+from bible_prefetch import ChapterNotFound, ChapterPrefetcher
+from conftest import wait_until
+from ttl_cache import TTLCache
+
+LAST = 3
+
+
+class FakeSource:
+    """fetch_chapter for books of LAST chapters, counting requests per chapter"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = []
+
+    def fetch(self, book, chapter):
+        with self.lock:
+            self.requests.append(chapter)
+        if chapter > LAST:
+            raise ChapterNotFound(f"{book} {chapter}")
+        return [(1, f"{book} {chapter}:1")]
+
+
+def make_prefetcher(source, ahead=2):
+    return ChapterPrefetcher(TTLCache(maxsize=100, ttl=60, negative_ttl=60), source.fetch, lambda book: 150,
+                             ahead=ahead, behind=1)
+
+
+def settle(prefetcher):
+    wait_until(lambda: prefetcher.stats()["pending"] == 0)
+
+
+def test_prefetch_stops_at_the_first_missing_chapter():
+    source = FakeSource()
+    prefetcher = make_prefetcher(source, ahead=3)
+    prefetcher.get("Ruth", 2)
+    settle(prefetcher)
+    # 3 exists, 4 is missing, 5 is never asked for
+    assert sorted(source.requests) == [1, 2, 3, 4]
+    assert prefetcher.last_chapter("Ruth") == LAST
+    assert prefetcher.stats()["past_end"] == 1
+
+
+def test_known_end_is_not_prefetched_again():
+    source = FakeSource()
+    prefetcher = make_prefetcher(source)
+    prefetcher.get("Ruth", 2)
+    settle(prefetcher)
+    before = len(source.requests)
+    prefetcher.get("Ruth", 3)
+    settle(prefetcher)
+    assert len(source.requests) == before
+    assert prefetcher.stats()["prefetch_hits"] == 1
+
+
+def test_reading_past_the_end_lowers_the_bound():
+    source = FakeSource()
+    prefetcher = make_prefetcher(source)
+    try:
+        prefetcher.get("Jude", 9)
+    except ChapterNotFound:
+        pass
+    settle(prefetcher)
+    assert prefetcher.last_chapter("Jude") <= 8
+    assert prefetcher.last_chapter("Ruth") == 150
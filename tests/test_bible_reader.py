@@ -0,0 +1,85 @@
+import os
+import sys
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from conftest import ROOT
+
+sys.path.insert(0, os.path.join(ROOT, "bench"))
+from fake_bible_api import FakeBibleAPI  # noqa: E402
+
+
+@pytest.fixture
+def api():
+    server = FakeBibleAPI().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def app(api, tmp_path, monkeypatch, request):
+    """Bible Reader in demo mode against the fake bible-api.com"""
+    monkeypatch.setenv("METRICS_PORT", "")
+    monkeypatch.setenv("BIBLE_API_URL", api.url)
+    monkeypatch.setenv("WRITE_JOURNAL_PATH", str(tmp_path / "journal.sqlite3"))
+    at = AppTest.from_file(os.path.join(ROOT, "teens-app.py"), default_timeout=30)
+    at.session_state["user"] = {"id": request.node.name}
+    at.session_state["profile"] = {"id": request.node.name, "username": "Reader", "number": "1001"}
+    at.run()
+    at.sidebar.radio[0].set_value("📖 Bible Reader").run()
+    return at
+
+
+def test_chapter_buttons_move_the_inputs_without_warnings(app):
+    app.toggle(key="chapter_mode").set_value(True).run()
+    next(b for b in app.button if b.label == "Next Chapter ▶").click().run()
+    next(b for b in app.button if b.label == "Next Chapter ▶").click().run()
+    next(b for b in app.button if b.label == "◀ Previous Chapter").click().run()
+    assert app.number_input(key="bible_chapter").value == 2
+    assert app.number_input(key="bible_verse").value == 1
+    assert not app.warning
+    assert not app.exception
+
+
+def test_verse_text_is_not_rendered_as_html(api, monkeypatch, tmp_path, request):
+    import fake_bible_api
+
+    monkeypatch.setattr(fake_bible_api, "verse_text", lambda book, chapter, verse: f"<i>Verse {verse}</i>\n\n<script>x</script>")
+    monkeypatch.setenv("METRICS_PORT", "")
+    monkeypatch.setenv("BIBLE_API_URL", api.url)
+    monkeypatch.setenv("WRITE_JOURNAL_PATH", str(tmp_path / "journal.sqlite3"))
+    at = AppTest.from_file(os.path.join(ROOT, "teens-app.py"), default_timeout=30)
+    at.session_state["user"] = {"id": request.node.name}
+    at.session_state["profile"] = {"id": request.node.name, "username": "Reader", "number": "1001"}
+    at.run()
+    at.sidebar.radio[0].set_value("📖 Bible Reader").run()
+    # A book and chapter no other test reads, so the shared chapter cache doesn't have it
+    at.selectbox(key="bible_book").set_value("Proverbs").run()
+    at.number_input(key="bible_chapter").set_value(17).run()
+    at.toggle(key="chapter_mode").set_value(True).run()
+    page = " ".join(m.value for m in at.markdown)
+    assert "&lt;i&gt;Verse 1&lt;/i&gt;" in page
+    assert "<script>" not in page and "<i>" not in page
+
+
+class Offline:
+    """An HTTP session that must not be used"""
+
+    def get(self, *args, **kwargs):
+        raise AssertionError("went online")
+
+
+def test_offline_store_is_authoritative_for_its_books(tmp_path, monkeypatch):
+    monkeypatch.setenv("METRICS_PORT", "")
+    monkeypatch.setenv("WRITE_JOURNAL_PATH", str(tmp_path / "journal.sqlite3"))
+    from bible_prefetch import ChapterNotFound
+    from bible_store import BibleStore, build_store
+    from services import fetch_bible_chapter
+
+    path = str(tmp_path / "bible.sqlite3")
+    build_store(path, [("Jude", 1, 1, "Jude, the servant of Jesus Christ"), ("Jude", 1, 2, "Mercy unto you")])
+    store = BibleStore(path)
+    assert fetch_bible_chapter("Jude", 1, store, Offline()) == [(1, "Jude, the servant of Jesus Christ"), (2, "Mercy unto you")]
+    with pytest.raises(ChapterNotFound):
+        fetch_bible_chapter("Jude", 2, store, Offline())
@@ -0,0 +1,91 @@
+import pytest
+
+from bible_search import BibleSearchIndex, highlight, stem
+
+VERSES = [
+    ("John", 3, 16, "For God so loved the world, that he gave his only begotten Son"),
+    ("John", 3, 17, "For God sent not his Son into the world to condemn the world"),
+    ("1 John", 4, 8, "He that loveth not knoweth not God; for God is love."),
+    ("Psalms", 23, 1, "The LORD is my shepherd; I shall not want."),
+    ("Philippians", 4, 6, "Be careful for nothing; but in every thing by prayer and supplication "
+                          "with thanksgiving let your requests be made known unto God."),
+    ("Genesis", 1, 1, "In the beginning God created the heaven and the earth."),
+    ("Genesis", 1, 2, "And the earth was without form, and void; and darkness was upon the face of the deep."),
+    ("Genesis", 1, 3, "And God said, Let there be light: and there was light."),
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    index = BibleSearchIndex()
+    for verse in VERSES:
+        index.add(*verse)
+    index.finish()
+    return index
+
+
+def refs(results):
+    return [r["reference"] for r in results]
+
+
+def test_stem_joins_word_forms():
+    assert stem("loves") == stem("loved") == stem("love")
+    assert stem("anxious") == stem("anxiety")
+
+
+def test_bm25_prefers_frequent_terms_and_short_verses(index):
+    # "world" twice in John 3:17 beats once in the similar-length John 3:16
+    assert refs(index.search("world")) == ["John 3:17", "John 3:16"]
+    # "light" twice in a short verse
+    assert refs(index.search("light")) == ["Genesis 1:3"]
+    # Same term count: the shorter verse ranks first
+    results = index.search("God")
+    assert results[0]["reference"] == "1 John 4:8"
+    assert results[-1]["reference"] == "Philippians 4:6"
+
+
+def test_rare_terms_outweigh_common_ones(index):
+    [top, *rest] = index.search("God earth")
+    # "earth" is in two verses, "God" in six: the verse with both wins, then the other "earth" verse
+    assert top["reference"] == "Genesis 1:1"
+    assert rest[0]["reference"] == "Genesis 1:2"
+    assert top["score"] > rest[0]["score"] > rest[1]["score"]
+
+
+def test_stopwords_are_skipped_unless_nothing_else_is_left(index):
+    assert refs(index.search("the shepherd")) == ["Psalms 23:1"]
+    assert index.search("the") != []
+    assert index.search("zebra") == []
+
+
+def test_phrase_must_match_consecutive_words(index):
+    assert refs(index.search('"God so loved"')) == ["John 3:16"]
+    # Loose, "God" and "loved" also meet in 1 John 4:8 ("loveth ... God")
+    assert set(refs(index.search("God loved"))[:2]) == {"John 3:16", "1 John 4:8"}
+    assert refs(index.search('"God loved"')) == []
+    assert index.search('"world God"') == []
+
+
+def test_phrase_does_not_span_verses(index):
+    # Genesis 1:1 ends with "earth", 1:2 starts with "And the earth"
+    assert index.search('"earth and"') == []
+    assert refs(index.search('"earth was"')) == ["Genesis 1:2"]
+
+
+def test_phrase_filters_loose_words(index):
+    results = index.search('"let there be" earth')
+    assert refs(results) == ["Genesis 1:3"]
+    assert index.search('"no such phrase"') == []
+
+
+def test_limit_and_highlight(index):
+    assert len(index.search("God", limit=2)) == 2
+    [result] = index.search("shepherd")
+    assert result["snippet"] == "The LORD is my <mark>shepherd</mark>; I shall not want."
+
+
+def test_highlight_escapes_and_trims():
+    text = "<b>" + "x " * 200 + "loved the world"
+    snippet = highlight(text, {stem("loved")}, max_chars=40)
+    assert snippet.startswith("…") and "<mark>loved</mark>" in snippet
+    assert "<b>" not in highlight("<b>love</b>", {stem("love")})
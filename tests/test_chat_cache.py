@@ -0,0 +1,116 @@
+import threading
+
+from chat_cache import ChatCache
+
+
+class FakeMessages:
+    """load_page over an in-memory messages table that numbers rows like the database"""
+
+    def __init__(self):
+        self.rows = []
+        self.queries = 0
+
+    def insert(self, chat_id, content, created_at="2024-01-01T00:00:00+00:00"):
+        row = {"id": len(self.rows) + 1, "seq": len(self.rows) + 1, "chat_id": chat_id, "sender_id": "u1",
+               "content": content, "created_at": created_at}
+        self.rows.append(row)
+        return row
+
+    def load_page(self, chat_id, newer_than=None, older_than=None, limit=50):
+        self.queries += 1
+        rows = [row for row in self.rows if row["chat_id"] == chat_id]
+        if newer_than is not None:
+            return [row for row in rows if row["seq"] > newer_than][:limit]
+        if older_than is not None:
+            rows = [row for row in rows if row["seq"] < older_than]
+        return rows[-limit:]
+
+
+def to_message(row):
+    return {"id": row["id"], "seq": row.get("seq"), "sender": row["sender_id"], "text": row["content"],
+            "timestamp": row.get("created_at") or ""}
+
+
+def make_cache(db, **options):
+    options.setdefault("size", 10)
+    options.setdefault("page_size", 4)
+    return ChatCache(db.load_page, to_message, lambda row: row["id"], **options)
+
+
+def texts(window):
+    return [msg["text"] for msg in window.messages]
+
+
+def test_concurrent_viewers_share_one_load():
+    db = FakeMessages()
+    for n in range(3):
+        db.insert("c1", f"m{n}")
+    cache = make_cache(db)
+    windows = []
+    threads = [threading.Thread(target=lambda: windows.append(cache.window("c1"))) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert db.queries == 1
+    assert all(window is windows[0] for window in windows)
+    assert texts(windows[0]) == ["m0", "m1", "m2"]
+
+
+def test_refresh_picks_up_late_message_with_old_timestamp():
+    db = FakeMessages()
+    db.insert("c1", "first", created_at="2024-01-01T10:00:00+00:00")
+    cache = make_cache(db)
+    cache.window("c1")
+    # Replayed from a journal after an outage: old client-side time, new seq
+    db.insert("c1", "late", created_at="2024-01-01T09:00:00+00:00")
+    window = cache.refresh("c1", interval=0)
+    assert texts(window) == ["first", "late"]
+
+
+def test_refresh_runs_once_per_interval():
+    db = FakeMessages()
+    db.insert("c1", "m0")
+    cache = make_cache(db)
+    cache.window("c1")
+    for _ in range(10):
+        cache.refresh("c1", interval=60)
+    assert db.queries == 1
+
+
+def test_add_deduplicates_and_keeps_the_window_bounded():
+    db = FakeMessages()
+    cache = make_cache(db, size=3)
+    cache.window("c1")
+    rows = [db.insert("c1", f"m{n}") for n in range(5)]
+    for row in rows + rows[-2:]:
+        cache.add("c1", row)
+    window = cache.window("c1")
+    assert texts(window) == ["m2", "m3", "m4"]
+    assert window.has_older
+    assert not cache.add("uncached", rows[0])
+
+
+def test_extend_older_fills_the_shared_window_then_stops():
+    db = FakeMessages()
+    for n in range(20):
+        db.insert("c1", f"m{n}")
+    cache = make_cache(db, size=10, page_size=4)
+    assert texts(cache.window("c1")) == ["m16", "m17", "m18", "m19"]
+    assert cache.extend_older("c1")
+    assert cache.extend_older("c1")
+    assert not cache.extend_older("c1")   # full: older pages are the session's own
+    window = cache.window("c1")
+    assert texts(window) == [f"m{n}" for n in range(10, 20)]
+    assert (window.oldest, window.newest) == (11, 20)
+
+
+def test_cold_chats_are_evicted_least_recently_used_first():
+    db = FakeMessages()
+    cache = make_cache(db, max_chats=2)
+    cache.window("a")
+    cache.window("b")
+    cache.window("a")
+    cache.window("c")
+    assert cache.peek("a") is not None
+    assert cache.peek("b") is None
@@ -0,0 +1,125 @@
+import threading
+
+from conftest import wait_until
+from contact_index import ContactIndex
+
+PROFILES = [
+    {"id": "1", "username": "Anna", "number": "1001"},
+    {"id": "2", "username": "Annabel", "number": "1002"},
+    {"id": "3", "username": "Hannah", "number": "2001"},
+    {"id": "4", "username": "Joanna", "number": "1100"},
+    {"id": "5", "username": "ann", "number": "3001"},
+    {"id": "6", "username": "Brian", "number": "4001"},
+]
+
+
+def names(page):
+    return [contact["username"] for contact in page[0]]
+
+
+def test_exact_then_prefix_then_infix():
+    index = ContactIndex(lambda: PROFILES)
+    # Exact username, then the other prefix matches, then infix matches, each alphabetical
+    assert names(index.search("ann")) == ["ann", "Anna", "Annabel", "Hannah", "Joanna"]
+    assert names(index.search("Anna")) == ["Anna", "Annabel", "Hannah", "Joanna"]
+    # Two characters only match prefixes
+    assert names(index.search("an")) == ["ann", "Anna", "Annabel"]
+
+
+def test_numbers_match_exactly_or_by_prefix():
+    index = ContactIndex(lambda: PROFILES)
+    assert names(index.search("#1001")) == ["Anna"]
+    assert names(index.search("10")) == ["Anna", "Annabel"]
+    assert names(index.search("1")) == ["Anna", "Annabel", "Joanna"]
+
+
+def test_paging_total_and_exclude():
+    index = ContactIndex(lambda: PROFILES)
+    page, total = index.search("", limit=2, offset=2)
+    assert total == len(PROFILES)
+    assert [c["username"] for c in page] == ["Annabel", "Brian"]
+    page, total = index.search("anna", exclude="1")
+    assert total == 3 and "Anna" not in [c["username"] for c in page]
+
+
+def test_results_are_copies():
+    index = ContactIndex(lambda: PROFILES)
+    index.search("anna")[0][0]["username"] = "changed"
+    assert index.get("1")["username"] == "Anna"
+
+
+def test_upsert_reindexes_one_contact():
+    index = ContactIndex(lambda: PROFILES)
+    index.upsert({"id": "6", "username": "Brianna"})
+    assert names(index.search("anna")) == ["Anna", "Annabel", "Brianna", "Hannah", "Joanna"]
+    assert index.get("6")["number"] == "4001"
+    index.upsert({"id": "7", "username": "Zed", "number": "9999"})
+    assert names(index.search("9999")) == ["Zed"]
+
+
+def test_failed_first_load_serves_fallback():
+    def fail():
+        raise ConnectionError("supabase down")
+
+    index = ContactIndex(fail, fallback=[{"id": "d", "username": "Demo", "number": "0"}])
+    assert names(index.search("demo")) == ["Demo"]
+    assert index.stats()["load_errors"] == 1
+
+
+def test_stale_index_refreshes_in_the_background():
+    profiles = list(PROFILES)
+    index = ContactIndex(lambda: profiles, ttl=0)
+    assert len(index) == len(PROFILES)
+    profiles.append({"id": "8", "username": "Newcomer", "number": "5001"})
+    # The stale snapshot answers at once while the reload runs
+    wait_until(lambda: index.search("newcomer")[1] == 1)
+    assert index.stats()["loads"] >= 2
+
+
+def test_cold_start_loads_once_for_concurrent_sessions():
+    release = threading.Event()
+    calls = []
+
+    def load():
+        calls.append(1)
+        release.wait(5)
+        return PROFILES
+
+    index = ContactIndex(load)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(index.search("anna")[1])) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    wait_until(lambda: calls)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert calls == [1]
+    assert results == [4] * 8
+
+
+def test_concurrent_upserts_are_all_kept():
+    index = ContactIndex(lambda: PROFILES)
+    threads = [threading.Thread(target=index.upsert, args=({"id": f"n{i}", "username": f"New{i}", "number": str(i)},))
+               for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(index) == len(PROFILES) + 20
+    assert index.search("new")[1] == 20
+
+
+def test_reload_keeps_upserts_until_the_table_has_them():
+    profiles = [dict(p) for p in PROFILES]
+    index = ContactIndex(lambda: [dict(p) for p in profiles])
+    index.upsert({"id": "6", "username": "Brianna"})
+    # A reload from rows written before the upsert reached the database
+    index._load()
+    assert index.get("6")["username"] == "Brianna"
+    profiles[5]["username"] = "Brianna"
+    index._load()
+    assert index._upserts == {}
+    profiles[5]["username"] = "Bree"
+    index._load()
+    assert index.get("6")["username"] == "Bree"
@@ -0,0 +1,137 @@
+import threading
+
+from conftest import wait_until
+from journal import Journal
+from outbox import FAILED, SENT, Outbox, is_transient
+
+
+class Rejected(Exception):
+    """Stands in for postgrest's APIError"""
+
+    def __init__(self, code):
+        super().__init__(f"rejected with {code}")
+        self.code = code
+
+
+class FakeDatabase:
+    """write_batch that records every write and fails on demand"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.writes = []   # (table, [row values])
+        self.fail = lambda head, rows: None
+
+    def write_batch(self, head, rows):
+        self.fail(head, rows)
+        with self.lock:
+            self.writes.append((head.table, [row["n"] for row in rows]))
+        return rows
+
+    def written(self, table):
+        with self.lock:
+            return [n for t, rows in self.writes if t == table for n in rows]
+
+
+def make_outbox(tmp_path, db, **options):
+    options.setdefault("linger", 0)
+    options.setdefault("backoff", 0.01)
+    options.setdefault("max_backoff", 0.05)
+    return Outbox(Journal(str(tmp_path / "journal.sqlite3")), db.write_batch, **options)
+
+
+def test_writes_each_table_in_submit_order(tmp_path):
+    db = FakeDatabase()
+    outbox = make_outbox(tmp_path, db)
+    entries = [outbox.submit("a" if n % 2 else "b", {"n": n}) for n in range(20)]
+    wait_until(lambda: outbox.depth() == 0 and all(entry.status == SENT for entry in entries))
+    assert db.written("a") == list(range(1, 20, 2))
+    assert db.written("b") == list(range(0, 20, 2))
+
+
+def test_transient_failures_are_retried_until_written(tmp_path):
+    db = FakeDatabase()
+    failures = iter([ConnectionError("down"), Rejected("503"), Rejected("PGRST000")])
+
+    def fail(head, rows):
+        error = next(failures, None)
+        if error:
+            raise error
+
+    db.fail = fail
+    outbox = make_outbox(tmp_path, db, max_attempts=2)
+    entry = outbox.submit("messages", {"n": 1})
+    wait_until(lambda: entry.status == SENT)
+    assert db.written("messages") == [1]
+    assert outbox.journal.dead_letters() == []
+
+
+def test_rejected_write_is_dead_lettered_without_blocking_other_tables(tmp_path):
+    db = FakeDatabase()
+
+    def fail(head, rows):
+        if head.table == "answer_events":
+            raise Rejected("42P01")   # undefined table
+
+    db.fail = fail
+    outbox = make_outbox(tmp_path, db, max_attempts=3)
+    bad = outbox.submit("answer_events", {"n": 0})
+    good = [outbox.submit("messages", {"n": n}) for n in range(1, 4)]
+    wait_until(lambda: all(entry.status == SENT for entry in good))
+    wait_until(lambda: bad.status == FAILED)
+    assert "42P01" in bad.error
+    assert outbox.depth() == 0
+    [(entry, error)] = outbox.journal.dead_letters()
+    assert (entry.table, entry.row, entry.attempts) == ("answer_events", {"n": 0}, 3)
+    assert outbox.stats()["dead_lettered"] == 1
+
+
+def test_bad_row_is_isolated_from_its_batch(tmp_path):
+    db = FakeDatabase()
+
+    def fail(head, rows):
+        if any(row["n"] == 2 for row in rows):
+            raise Rejected("23502")   # not-null violation
+
+    db.fail = fail
+    gate = threading.Event()
+    original = db.write_batch
+
+    def write_batch(head, rows):
+        gate.wait()
+        return original(head, rows)
+
+    outbox = Outbox(Journal(str(tmp_path / "journal.sqlite3")), write_batch, linger=0, backoff=0.01, max_backoff=0.05,
+                    max_attempts=2)
+    entries = [outbox.submit("messages", {"n": n}) for n in range(5)]
+    gate.set()
+    wait_until(lambda: outbox.depth() == 0)
+    assert [entry.status for entry in entries] == [SENT, SENT, FAILED, SENT, SENT]
+    assert db.written("messages") == [0, 1, 3, 4]
+
+
+def test_dead_letters_survive_restart_and_do_not_replay(tmp_path):
+    db = FakeDatabase()
+    db.fail = lambda head, rows: (_ for _ in ()).throw(Rejected("42501"))   # RLS denial
+    outbox = make_outbox(tmp_path, db, max_attempts=2)
+    outbox.submit("presence", {"n": 1})
+    wait_until(lambda: outbox.stats()["dead_lettered"] == 1)
+
+    db.fail = lambda head, rows: None
+    restarted = make_outbox(tmp_path, db)
+    restarted.submit("presence", {"n": 2})
+    wait_until(lambda: restarted.depth() == 0)
+    assert db.written("presence") == [2]
+    assert len(restarted.journal.dead_letters()) == 1
+
+
+def test_is_transient():
+    assert is_transient(ConnectionError("reset"))
+    assert is_transient(TimeoutError())
+    assert is_transient(Rejected("500"))
+    assert is_transient(Rejected(429))
+    assert is_transient(Rejected("PGRST001"))
+    assert is_transient(Rejected("40P01"))   # deadlock
+    assert not is_transient(Rejected("400"))
+    assert not is_transient(Rejected("PGRST204"))   # unknown column
+    assert not is_transient(Rejected("42501"))
+    assert not is_transient(Rejected("23505"))
@@ -0,0 +1,125 @@
+import pytest
+
+from practice import DAY, MIN_EASINESS, RELEARN_SECONDS, Card, Deck, PracticeScheduler
+
+NOW = 1_700_000_000.0
+
+
+def test_sm2_intervals_for_correct_answers():
+    card = Card(1)
+    intervals = []
+    for _ in range(4):
+        card.review(4, NOW)
+        intervals.append(card.interval)
+    assert intervals == [1.0, 6.0, 15.0, 37.5]
+    assert card.easiness == pytest.approx(2.5)
+    assert card.repetitions == 4
+    assert card.due == NOW + 37.5 * DAY
+
+
+def test_sm2_lapse_resets_and_lowers_easiness():
+    card = Card(1)
+    card.review(4, NOW)
+    card.review(4, NOW)
+    card.review(1, NOW)
+    assert (card.repetitions, card.interval, card.lapses) == (0, 0.0, 1)
+    assert card.due == NOW + RELEARN_SECONDS
+    assert card.easiness == pytest.approx(1.96)
+    card.review(4, NOW)
+    assert card.interval == 1.0
+    for _ in range(5):
+        card.review(0, NOW)
+    assert card.easiness == MIN_EASINESS
+
+
+def test_due_review_comes_before_new_questions():
+    deck = Deck([1, 2, 3])
+    deck.record(2, correct=False, now=NOW)
+    assert deck.next_question(now=NOW + 1) in (1, 3)
+    assert deck.next_question(now=NOW + RELEARN_SECONDS) == 2
+
+
+def test_drawn_question_stays_new_until_answered():
+    deck = Deck(range(1, 11))
+    for _ in range(20):
+        deck.next_question(now=NOW)
+    assert deck.counts(now=NOW) == (0, 10, 0)
+    drawn = deck.next_question(now=NOW)
+    deck.record(drawn, correct=True, now=NOW)
+    assert deck.counts(now=NOW) == (0, 9, 1)
+    assert all(deck.next_question(now=NOW) != drawn for _ in range(50))
+
+
+def test_answer_outside_practice_leaves_the_new_pool():
+    deck = Deck([1, 2, 3])
+    deck.record(2, correct=True, now=NOW)
+    assert deck.counts(now=NOW) == (0, 2, 1)
+    assert {deck.next_question(now=NOW) for _ in range(50)} == {1, 3}
+    deck.record(1, correct=True, now=NOW)
+    deck.record(3, correct=True, now=NOW)
+    assert deck.counts(now=NOW) == (0, 0, 3)
+    # Nothing new or due: the soonest review
+    assert deck.next_question(now=NOW) in (1, 2, 3)
+
+
+def test_scheduler_writes_the_reviewed_card():
+    written = []
+    scheduler = PracticeScheduler(lambda subject: [1, 2], lambda user, subject: [], written.extend)
+    scheduler.record("u1", "Mathematics", 1, correct=True)
+    [row] = written
+    assert (row["user_id"], row["subject"], row["question_id"]) == ("u1", "Mathematics", 1)
+    assert (row["interval_days"], row["repetitions"], row["lapses"]) == (1.0, 1, 0)
+    assert scheduler.counts("u1", "Mathematics")[1:] == (1, 1)
+
+
+def test_failed_card_load_is_retried_and_never_overwrites_stored_cards():
+    stored = [{"question_id": 1, "easiness": 2.2, "interval_days": 15.0, "repetitions": 3, "lapses": 1,
+               "due_at": "2024-01-01T00:00:00+00:00"}]
+    failures = [ConnectionError("supabase unreachable")]
+
+    def load_cards(user_id, subject):
+        if failures:
+            raise failures.pop()
+        return stored
+
+    written = []
+    scheduler = PracticeScheduler(lambda subject: [1, 2], load_cards, written.extend)
+    with pytest.raises(ConnectionError):
+        scheduler.record("u1", "Mathematics", 1, correct=True)
+    assert written == []
+
+    scheduler.record("u1", "Mathematics", 1, correct=True)
+    [row] = written
+    assert (row["repetitions"], row["lapses"]) == (4, 1)
+    assert row["interval_days"] == round(15.0 * 2.2, 2)
+
+
+def test_due_count_follows_time_and_reviews():
+    cards = [Card(1, due=NOW - 10), Card(2, due=NOW + 100), Card(3, due=NOW + 200)]
+    deck = Deck([1, 2, 3, 4], cards)
+    assert deck.counts(now=NOW) == (1, 1, 3)
+    assert deck.counts(now=NOW + 150) == (2, 1, 3)
+    # Reviewing a due card takes it out of the due count until it is due again
+    deck.record(2, correct=True, now=NOW + 150)
+    assert deck.counts(now=NOW + 150) == (1, 1, 3)
+    deck.record(4, correct=False, now=NOW + 150)
+    assert deck.counts(now=NOW + 150) == (1, 0, 4)
+    assert deck.counts(now=NOW + 150 + RELEARN_SECONDS) == (3, 0, 4)
+    assert deck.counts(now=NOW + 150 + DAY) == (4, 0, 4)
+
+
+def test_decks_share_positions_and_take_any_unseen_question():
+    ids = list(range(100, 200))
+    scheduler = PracticeScheduler(lambda subject: ids, lambda user, subject: [{"question_id": 150}], lambda rows: None)
+    first, second = scheduler.deck("u1", "Mathematics"), scheduler.deck("u2", "Mathematics")
+    assert first._positions is second._positions
+    assert first.counts()[1:] == (99, 1)
+    for _ in range(30):
+        first.next_question()
+    # Answer questions wherever the draws moved them, in any order
+    for qid in (199, 100, 151, 150, 100):
+        first.record(qid, correct=True)
+    assert first.counts()[1:] == (96, 4)
+    drawn = {first.next_question() for _ in range(500)}
+    assert drawn.isdisjoint({100, 150, 151, 199}) and len(drawn) > 50
+    assert second.counts()[1:] == (99, 1)
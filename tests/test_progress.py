@@ -0,0 +1,56 @@
+from datetime import datetime
+
+import pytest
+
+from progress import ALL_SUBJECTS, ProgressTracker
+
+STORED = [
+    {"subject": "Mathematics", "correct_answers": 40, "total_questions": 50, "current_streak": 6,
+     "best_streak": 9, "last_answer_date": "2024-05-01"},
+    {"subject": ALL_SUBJECTS, "correct_answers": 70, "total_questions": 90, "current_streak": 6,
+     "best_streak": 9, "last_answer_date": "2024-05-01"},
+]
+
+
+class Store:
+    """load_rows that fails a given number of times before returning the stored rows"""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.events = []
+        self.progress = []
+
+    def load_rows(self, user_id):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("supabase unreachable")
+        return [dict(row) for row in STORED]
+
+    def tracker(self):
+        return ProgressTracker(self.load_rows, self.events.append, self.progress.append)
+
+
+def test_answer_updates_stored_counters():
+    store = Store()
+    tracker = store.tracker()
+    progress = tracker.record_answer("u1", "Mathematics", True, when=datetime(2024, 5, 2, 9))
+    assert (progress.correct, progress.total, progress.streak, progress.best_streak) == (41, 51, 7, 9)
+    assert [row["total_questions"] for row in store.progress] == [51, 91]
+    assert len(store.events) == 1
+
+
+def test_failed_load_is_not_cached_or_written_over_stored_totals():
+    store = Store(failures=1)
+    tracker = store.tracker()
+    with pytest.raises(ConnectionError):
+        tracker.record_answer("u1", "Mathematics", True, when=datetime(2024, 5, 2, 9))
+    assert store.events == [] and store.progress == []
+
+    # The next answer loads the stored rows and builds on them
+    tracker.record_answer("u1", "Mathematics", False, when=datetime(2024, 5, 2, 10))
+    by_subject = {row["subject"]: row for row in store.progress}
+    assert by_subject["Mathematics"]["total_questions"] == 51
+    assert by_subject["Mathematics"]["correct_answers"] == 40
+    assert by_subject["Mathematics"]["current_streak"] == 7
+    assert by_subject[ALL_SUBJECTS]["total_questions"] == 91
+    assert tracker.overall("u1").best_streak == 9
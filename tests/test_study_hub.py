@@ -0,0 +1,69 @@
+import os
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from conftest import ROOT
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch, request):
+    """Study Hub in demo mode (no Supabase) for a fresh signed-in user"""
+    monkeypatch.setenv("METRICS_PORT", "")
+    monkeypatch.setenv("WRITE_JOURNAL_PATH", str(tmp_path / "journal.sqlite3"))
+    at = AppTest.from_file(os.path.join(ROOT, "teens-app.py"), default_timeout=30)
+    at.session_state["user"] = {"id": request.node.name}
+    at.session_state["profile"] = {"id": request.node.name, "username": "Tester", "number": "1001"}
+    at.run()
+    at.sidebar.radio[0].set_value("📚 Study Hub").run()
+    button(at, "Load Questions").click().run()
+    return at
+
+
+def button(at, label):
+    return next(b for b in at.button if b.label == label)
+
+
+def answered(at):
+    return next(m for m in at.metric if m.label == "Total Questions Answered").value
+
+
+def test_check_answer_twice_records_one_answer(app):
+    check = button(app, "Check Answer")
+    check.click().run()
+    assert not [b for b in app.button if b.label == "Check Answer"]
+    assert app.radio(key="waec_0").disabled
+    # A second click on the same question (e.g. a double click) changes nothing
+    check.click().run()
+    assert not app.exception
+    assert answered(app) == "1"
+
+
+def test_each_question_is_recorded_once(app):
+    for _ in range(2):
+        button(app, "Check Answer").click().run()
+        button(app, "Next Question →").click().run()
+    assert answered(app) == "2"
+
+
+def test_practice_reviews_the_served_question_once(app):
+    app.toggle(key="waec_practice").set_value(True).run()
+    button(app, "Load Questions").click().run()
+    check = button(app, "Check Answer")
+    check.click().run()
+    check.click().run()
+    [counts] = [c.value for c in app.caption if c.value.startswith("Due for review")]
+    assert counts.endswith("Practised: 1")
+
+
+def test_question_text_is_not_rendered_as_html(app):
+    app.session_state["waec_questions"] = [{
+        "id": 1, "question": "Is <b>2 < 3</b>?", "options": ["Yes", "No"], "answer": "Yes",
+        "explanation": "<script>alert(1)</script>\n\n**3** is larger",
+    }]
+    app.run()
+    button(app, "Check Answer").click().run()
+    html = " ".join(m.value for m in app.markdown)
+    assert "Is &lt;b&gt;2 &lt; 3&lt;/b&gt;?" in html
+    assert "&lt;script&gt;alert(1)&lt;/script&gt;<br><br>**3** is larger" in html
+    assert "<script>" not in html
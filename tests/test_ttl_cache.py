@@ -0,0 +1,117 @@
+import threading
+
+import pytest
+
+import ttl_cache
+from conftest import wait_until
+from ttl_cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Manual time.monotonic for the cache module"""
+    now = [1000.0]
+    monkeypatch.setattr(ttl_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_concurrent_misses_share_one_load():
+    cache = TTLCache()
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        release.wait(5)
+        return "verse"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load("john 3:16", loader))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    # Every caller but the leader is waiting on the leader's load
+    wait_until(lambda: cache.coalesced == 7)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [1]
+    assert results == ["verse"] * 8
+    assert cache.stats()["misses"] == 1
+    assert cache.get_or_load("john 3:16", loader) == "verse"
+    assert cache.hits == 1
+
+
+def test_waiters_get_the_leaders_error():
+    cache = TTLCache()
+    release = threading.Event()
+
+    def loader():
+        release.wait(5)
+        raise ConnectionError("bible-api.com unreachable")
+
+    errors = []
+
+    def call():
+        try:
+            cache.get_or_load("gen 1", loader)
+        except ConnectionError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    wait_until(lambda: cache.coalesced == 3)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(errors) == 4 and len({id(e) for e in errors}) == 1
+    assert cache.failures == 1
+
+
+def test_failures_are_cached_for_negative_ttl(clock):
+    cache = TTLCache(ttl=3600, negative_ttl=30)
+    calls = []
+
+    def failing():
+        calls.append(1)
+        raise ConnectionError("down")
+
+    with pytest.raises(ConnectionError):
+        cache.get_or_load("key", failing)
+    clock[0] += 29
+    with pytest.raises(ConnectionError):
+        cache.get_or_load("key", failing)
+    assert len(calls) == 1
+    # A cached failure is not a value
+    assert cache.get("key") is None
+
+    clock[0] += 2
+    assert cache.get_or_load("key", lambda: "back") == "back"
+    assert cache.stats()["expirations"] == 1
+
+
+def test_values_expire_after_ttl(clock):
+    cache = TTLCache(ttl=60)
+    cache.get_or_load("key", lambda: 1)
+    clock[0] += 59
+    assert cache.get_or_load("key", lambda: 2) == 1
+    clock[0] += 1
+    assert "key" not in cache
+    assert cache.get_or_load("key", lambda: 2) == 2
+    # A per-call ttl overrides the default
+    cache.get_or_load("short", lambda: "s", ttl=5)
+    clock[0] += 5
+    assert cache.get("short") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
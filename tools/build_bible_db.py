@@ -0,0 +1,99 @@
+"""Build the offline Bible file used by the Bible Reader.
+
+Usage:
+    python tools/build_bible_db.py kjv.csv --translation KJV
+    python tools/build_bible_db.py web.json -o data/bible.sqlite3 --translation WEB
+
+Accepted dumps (any public-domain translation):
+  * CSV/TSV with a header row naming the book, chapter, verse and text
+    columns (``book,chapter,verse,text`` or the ``b,c,v,t`` layout used by
+    common public-domain Bible databases, where ``b`` is the 1-66 book number)
+  * JSON: a list of objects with the same keys
+  * NDJSON: one such object per line
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bible_store import CANONICAL_BOOKS, build_store  # noqa: E402
+
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "bible.sqlite3")
+
+COLUMN_ALIASES = {
+    "book": ("book", "book_name", "b"),
+    "chapter": ("chapter", "c"),
+    "verse": ("verse", "v"),
+    "text": ("text", "t", "content"),
+}
+
+
+def _pick(record, field):
+    for name in COLUMN_ALIASES[field]:
+        if name in record and record[name] not in (None, ""):
+            return record[name]
+    raise ValueError(f"missing '{field}' in record: {record!r}")
+
+
+def _book_name(value):
+    value = str(value).strip()
+    if value.isdigit() and 1 <= int(value) <= len(CANONICAL_BOOKS):
+        return CANONICAL_BOOKS[int(value) - 1]
+    return value
+
+
+def read_records(path):
+    """Yield dict records from a CSV, TSV, JSON or NDJSON dump"""
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        if ext in (".json",):
+            yield from json.load(f)
+        elif ext in (".ndjson", ".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            delimiter = "\t" if ext in (".tsv", ".tab") else ","
+            for row in csv.DictReader(f, delimiter=delimiter):
+                yield {key.strip().lower(): value for key, value in row.items() if key}
+
+
+def iter_verses(path):
+    for record in read_records(path):
+        record = {str(key).lower(): value for key, value in record.items()}
+        yield (
+            _book_name(_pick(record, "book")),
+            int(_pick(record, "chapter")),
+            int(_pick(record, "verse")),
+            _pick(record, "text"),
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the offline Bible file from a translation dump")
+    parser.add_argument("source", help="CSV/TSV/JSON/NDJSON dump of the translation")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT, help=f"output file (default: {DEFAULT_OUTPUT})")
+    parser.add_argument("--translation", default="", help="translation name stored in the file, e.g. KJV")
+    args = parser.parse_args(argv)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    tmp_path = args.output + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    started = time.perf_counter()
+    total = build_store(tmp_path, iter_verses(args.source), translation=args.translation)
+    os.replace(tmp_path, args.output)
+    elapsed = time.perf_counter() - started
+
+    size_mb = os.path.getsize(args.output) / (1024 * 1024)
+    print(f"Wrote {total} verses to {args.output} ({size_mb:.1f} MB) in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
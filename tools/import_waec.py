@@ -0,0 +1,251 @@
+"""Import WAEC past questions into the question bank.
+
+Usage:
+    python tools/import_waec.py questions.csv
+    python tools/import_waec.py dump.ndjson --subject Physics --rejects rejects.ndjson
+
+Accepted dumps are read as a stream, so memory use does not grow with the
+file:
+  * CSV/TSV with a header row: subject, year, topic, question, answer,
+    explanation and either an ``options`` column (separated by ``|``) or
+    ``option_a`` ... ``option_e`` / ``a`` ... ``e`` columns
+  * JSON: a list of objects with the same keys (``options`` may be a list)
+  * NDJSON: one such object per line
+
+``answer`` may be the option text or its letter.  Records whose options do
+not contain the answer are rejected; questions already in the bank (same
+subject and normalized text) are skipped.  Rows are written in batches, and
+the number of records consumed is checkpointed with every batch, so an
+interrupted import picks up where it stopped when run again.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_bank import INSERT_SQL, SCHEMA, question_row  # noqa: E402
+
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "waec.sqlite3")
+JSON_CHUNK = 1 << 16
+LETTERS = "abcde"
+
+CHECKPOINT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS import_checkpoints (
+    source TEXT PRIMARY KEY,
+    records INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+def _iter_json_array(f):
+    """Yield the objects of a top-level JSON array without loading the whole file"""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    started = False
+    eof = False
+    while True:
+        # Skip whitespace and separators between values
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+            pos += 1
+        if not started and pos < len(buffer):
+            if buffer[pos] != "[":
+                raise ValueError("JSON dump must be a list of objects")
+            started = True
+            pos += 1
+            continue
+        if started and buffer[pos:pos + 1] == "]":
+            return
+        if pos < len(buffer):
+            try:
+                value, pos = decoder.raw_decode(buffer, pos)
+                yield value
+                continue
+            except ValueError:
+                if eof:
+                    raise ValueError("malformed or truncated JSON dump")
+        elif eof:
+            if started:
+                raise ValueError("truncated JSON dump")
+            return
+        # Need more input: keep only the unread tail
+        chunk = f.read(JSON_CHUNK)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+
+def read_records(path):
+    """Yield dict records from a CSV, TSV, JSON or NDJSON dump"""
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        if ext in (".json",):
+            yield from _iter_json_array(f)
+        elif ext in (".ndjson", ".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            delimiter = "\t" if ext in (".tsv", ".tab") else ","
+            for row in csv.DictReader(f, delimiter=delimiter):
+                yield {key.strip().lower(): value for key, value in row.items() if key}
+
+
+def to_question(record, subject=None, year=None):
+    """Validate one record and return a question dict; raises ValueError with the reason"""
+    record = {str(key).strip().lower(): value for key, value in record.items()}
+    options = record.get("options")
+    if isinstance(options, str):
+        options = options.split("|")
+    if not options:
+        options = [record.get(f"option_{letter}") or record.get(letter) for letter in LETTERS]
+    options = [str(option).strip() for option in options if option not in (None, "") and str(option).strip()]
+
+    question = str(record.get("question") or "").strip()
+    subject = str(record.get("subject") or subject or "").strip()
+    year = str(record.get("year") or year or "").strip()
+    answer = str(record.get("answer") or "").strip()
+    if not question:
+        raise ValueError("empty question")
+    if not subject or not year:
+        raise ValueError("missing subject or year")
+    if len(options) < 2:
+        raise ValueError("fewer than two options")
+    if len(options) != len(set(options)):
+        raise ValueError("duplicate options")
+    if answer not in options and len(answer) == 1 and answer.lower() in LETTERS[:len(options)]:
+        answer = options[LETTERS.index(answer.lower())]
+    if answer not in options:
+        raise ValueError("answer is not one of the options")
+
+    return {
+        "subject": subject,
+        "year": year,
+        "topic": record.get("topic") or "",
+        "question": question,
+        "options": options,
+        "answer": answer,
+        "explanation": record.get("explanation") or "",
+    }
+
+
+def source_key(path):
+    """Identify a dump by path, size and mtime so a changed file starts over"""
+    stat = os.stat(path)
+    return f"{os.path.abspath(path)}:{stat.st_size}:{int(stat.st_mtime)}"
+
+
+class SqliteTarget:
+    """Batched INSERT OR IGNORE into the local question bank; the checkpoint commits with each batch"""
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA + CHECKPOINT_SCHEMA)
+
+    def checkpoint(self, source):
+        row = self.conn.execute("SELECT records FROM import_checkpoints WHERE source = ?", (source,)).fetchone()
+        return row[0] if row else 0
+
+    def write(self, rows, source, consumed):
+        """Insert a batch and record how many source records are done; returns rows inserted"""
+        self.conn.execute("BEGIN")
+        before = self.conn.total_changes
+        self.conn.executemany(INSERT_SQL, rows)
+        inserted = self.conn.total_changes - before
+        self.conn.execute(
+            "INSERT OR REPLACE INTO import_checkpoints (source, records, updated_at) VALUES (?, ?, ?)",
+            (source, consumed, time.time()),
+        )
+        self.conn.execute("COMMIT")
+        return inserted
+
+    def close(self):
+        # Leave a plain rollback-journal file so the app can open it read-only
+        self.conn.execute("PRAGMA journal_mode=DELETE")
+        self.conn.close()
+
+
+def run_import(records, target, source, batch_size=5000, subject=None, year=None, rejects=None, report_every=5.0):
+    """Stream records into target in batches; returns a stats dict"""
+    stats = {"read": 0, "skipped": 0, "inserted": 0, "duplicates": 0, "rejected": 0}
+    resume_from = target.checkpoint(source)
+    started = last_report = time.perf_counter()
+    batch = []
+    consumed = 0
+
+    def flush():
+        inserted = target.write(batch, source, consumed)
+        stats["inserted"] += inserted
+        stats["duplicates"] += len(batch) - inserted
+        batch.clear()
+
+    for record in records:
+        consumed += 1
+        if consumed <= resume_from:
+            stats["skipped"] += 1
+            continue
+        stats["read"] += 1
+        try:
+            batch.append(question_row(to_question(record, subject, year)))
+        except (ValueError, TypeError, AttributeError) as e:
+            stats["rejected"] += 1
+            if rejects:
+                rejects.write(json.dumps({"record": consumed, "error": str(e), "data": record}, default=str) + "\n")
+        if len(batch) >= batch_size:
+            flush()
+        now = time.perf_counter()
+        if now - last_report >= report_every:
+            last_report = now
+            print(f"  {consumed} records, {stats['read'] / (now - started):,.0f}/s", file=sys.stderr)
+
+    if batch or consumed > resume_from:
+        flush()
+    stats["elapsed"] = time.perf_counter() - started
+    stats["rate"] = stats["read"] / stats["elapsed"] if stats["elapsed"] else 0.0
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import WAEC past questions from a CSV/TSV/JSON/NDJSON dump")
+    parser.add_argument("source", help="question dump")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT, help=f"question bank file (default: {DEFAULT_OUTPUT})")
+    parser.add_argument("--subject", help="subject for records that have none")
+    parser.add_argument("--year", help="year for records that have none")
+    parser.add_argument("--batch-size", type=int, default=5000, help="rows per write (default: 5000)")
+    parser.add_argument("--rejects", help="write rejected records with the reason to this NDJSON file")
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and read the dump from the start")
+    args = parser.parse_args(argv)
+
+    target = SqliteTarget(args.output)
+
+    source = source_key(args.source)
+    if args.restart:
+        target.write([], source, 0)
+
+    rejects = open(args.rejects, "a", encoding="utf-8") if args.rejects else None
+    try:
+        stats = run_import(read_records(args.source), target, source, batch_size=args.batch_size,
+                           subject=args.subject, year=args.year, rejects=rejects)
+    finally:
+        target.close()
+        if rejects:
+            rejects.close()
+
+    if stats["skipped"]:
+        print(f"Resumed after {stats['skipped']} records already imported")
+    print(f"Read {stats['read']} records in {stats['elapsed']:.1f}s ({stats['rate']:,.0f}/s): "
+          f"{stats['inserted']} inserted, {stats['duplicates']} duplicates, {stats['rejected']} rejected")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Process-wide TTL/LRU cache shared by every Streamlit session.
+
+Streamlit reruns the app script on every widget interaction, so anything
+kept in module globals of ``teens-app.py`` is rebuilt each time.  Objects
+from this module are created once (through ``st.cache_resource``) and live
+for the whole server process.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class _PendingLoad:
+    """A load in progress that other callers can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class TTLCache:
+    """Bounded LRU cache with per-entry expiry, negative caching and request coalescing.
+
+    ``get_or_load(key, loader)`` returns the cached value for ``key`` or calls
+    ``loader()`` to produce it.  If the loader raises, the exception is cached
+    for ``negative_ttl`` seconds and re-raised to every caller in that window,
+    so a failing upstream is not hammered.  Concurrent misses for the same key
+    wait for the single in-flight load instead of starting their own.
+    """
+
+    def __init__(self, maxsize=1024, ttl=3600, negative_ttl=30):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries = OrderedDict()  # key -> (expires_at, ok, value_or_error)
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.failures = 0
+
+    def get_or_load(self, key, loader, ttl=None):
+        """Return the value for key, loading it at most once across threads"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return self._unwrap(entry)
+                del self._entries[key]
+                self.expirations += 1
+
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = self._pending[key] = _PendingLoad()
+                leader = True
+                self.misses += 1
+            else:
+                leader = False
+                self.coalesced += 1
+
+        if not leader:
+            pending.done.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.value
+
+        try:
+            pending.value = loader()
+        except Exception as e:
+            pending.error = e
+
+        with self._lock:
+            if pending.error is None:
+                lifetime = self.ttl if ttl is None else ttl
+                self._store(key, (time.monotonic() + lifetime, True, pending.value))
+            else:
+                self.failures += 1
+                self._store(key, (time.monotonic() + self.negative_ttl, False, pending.error))
+            del self._pending[key]
+        pending.done.set()
+
+        if pending.error is not None:
+            raise pending.error
+        return pending.value
+
+    def get(self, key, default=None):
+        """Return a fresh cached value without loading, or default"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic() or not entry[1]:
+                return default
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def set(self, key, value, ttl=None):
+        """Store a value directly, e.g. one fetched as part of a larger batch"""
+        lifetime = self.ttl if ttl is None else ttl
+        with self._lock:
+            self._store(key, (time.monotonic() + lifetime, True, value))
+
+    def invalidate(self, key):
+        """Drop a single entry"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop every entry (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[0] > time.monotonic()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Return hit/miss/eviction counters as a dict"""
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "failures": self.failures,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            }
+
+    def _store(self, key, entry):
+        # Caller holds the lock
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    @staticmethod
+    def _unwrap(entry):
+        if entry[1]:
+            return entry[2]
+        raise entry[2]
@@ -0,0 +1,112 @@
+"""Page registry.
+
+Each page lives in its own module in this package and defines
+``STATE_DEFAULTS`` (the session keys it uses, with their initial values) and
+``render()``.  A page module is imported the first time any session opens
+the page and then stays loaded for the life of the process, so a rerun only
+initializes and runs the page that is on screen.  Import and render times
+are recorded per page (see ``get_page_timings``).
+"""
+
+import copy
+import importlib
+import sys
+import threading
+import time
+from collections import deque
+
+import streamlit as st
+
+# Page name -> (sidebar label, module), in sidebar order
+PAGES = {
+    "Home": ("🏠 Home", "views.home"),
+    "Bible Reader": ("📖 Bible Reader", "views.bible_reader"),
+    "Music Player": ("🎶 Music Player", "views.music_player"),
+    "Daily Devotional": ("📅 Daily Devotional", "views.devotional"),
+    "Games": ("🎮 Games", "views.games"),
+    "Study Hub": ("📚 Study Hub", "views.study_hub"),
+    "Chat & Groups": ("💬 Chat & Groups", "views.chat"),
+    "Profile": ("👤 Profile", "views.profile"),
+}
+LOGIN = "Login"
+
+MODULES = {name: module for name, (label, module) in PAGES.items()}
+MODULES[LOGIN] = "views.login"
+
+
+class PageTimings:
+    """Module import time and recent render times per page"""
+
+    def __init__(self, window=200):
+        self._lock = threading.Lock()
+        self._imports = {}   # page -> seconds
+        self._renders = {}   # page -> deque of seconds
+        self._counts = {}
+        self.window = window
+
+    def record_import(self, page, seconds):
+        with self._lock:
+            self._imports[page] = seconds
+
+    def record_render(self, page, seconds):
+        with self._lock:
+            renders = self._renders.get(page)
+            if renders is None:
+                renders = self._renders[page] = deque(maxlen=self.window)
+            renders.append(seconds)
+            self._counts[page] = self._counts.get(page, 0) + 1
+
+    def stats(self):
+        """{page: {import_ms, renders, last_render_ms, avg_render_ms, max_render_ms}}"""
+        with self._lock:
+            result = {}
+            for page in set(self._imports) | set(self._renders):
+                renders = list(self._renders.get(page, ()))
+                result[page] = {
+                    "import_ms": self._imports.get(page, 0.0) * 1000,
+                    "renders": self._counts.get(page, 0),
+                    "last_render_ms": renders[-1] * 1000 if renders else 0.0,
+                    "avg_render_ms": sum(renders) / len(renders) * 1000 if renders else 0.0,
+                    "max_render_ms": max(renders) * 1000 if renders else 0.0,
+                }
+            return result
+
+
+@st.cache_resource
+def get_page_timings():
+    """Process-wide page timings"""
+    return PageTimings()
+
+
+def load(page):
+    """The module of a page, imported on first use"""
+    name = MODULES[page]
+    if name in sys.modules:
+        # Not sys.modules[name]: import_module waits while another session is still importing it
+        return importlib.import_module(name)
+    started = time.perf_counter()
+    module = importlib.import_module(name)
+    get_page_timings().record_import(page, time.perf_counter() - started)
+    return module
+
+
+def render(page):
+    """Initialize the page's session state and draw it"""
+    module = load(page)
+    for key, value in module.STATE_DEFAULTS.items():
+        if key not in st.session_state:
+            st.session_state[key] = copy.deepcopy(value)
+    started = time.perf_counter()
+    try:
+        module.render()
+    finally:
+        get_page_timings().record_render(page, time.perf_counter() - started)
+
+
+def reset_state():
+    """Drop the session state of every loaded page so it starts from its defaults again"""
+    for name in MODULES.values():
+        module = sys.modules.get(name)
+        if module is not None:
+            for key in module.STATE_DEFAULTS:
+                st.session_state.pop(key, None)
@@ -0,0 +1,142 @@
+"""Bible Reader page: verse lookup, verse search and chapter reading."""
+
+import html
+
+import streamlit as st
+
+from services import (
+    get_bible_books, get_bible_chapter, get_bible_search, get_bible_verse, get_chapter_count,
+    get_chapter_prefetcher, get_verse_count, queue_write, search_bible, supabase_client,
+)
+
+STATE_DEFAULTS = {
+    "lookup_verse": False,
+    "bible_chapter": 1,
+    "bible_verse": 1,
+}
+
+def _escape(value):
+    # Verse text comes from the API or the offline file; a blank line would end the HTML block
+    return html.escape(str(value)).replace("\r", "").replace("\n", " ")
+
+def render():
+    st.markdown('<h1 class="sub-header">📖 Bible Reader</h1>', unsafe_allow_html=True)
+    
+    bible_books = get_bible_books()
+    
+    # Keep the reader widgets within bounds (their values may come from a search result)
+    if st.session_state.get('bible_book') not in bible_books:
+        st.session_state.pop('bible_book', None)
+    
+    col1, col2 = st.columns([1, 3])
+    
+    with col1:
+        selected_book = st.selectbox("Select Book", bible_books, key="bible_book")
+        # The inputs take their values from session state only (seeded by STATE_DEFAULTS and set by
+        # the callbacks below); clamp them in case the book changed to a shorter one
+        max_chapter = get_chapter_count(selected_book)
+        st.session_state.bible_chapter = min(max(st.session_state.get('bible_chapter', 1), 1), max_chapter)
+        chapter = st.number_input("Chapter", min_value=1, max_value=max_chapter, key="bible_chapter")
+        max_verse = get_verse_count(selected_book, chapter)
+        st.session_state.bible_verse = min(max(st.session_state.get('bible_verse', 1), 1), max_verse)
+        verse = st.number_input("Verse", min_value=1, max_value=max_verse, key="bible_verse")
+        
+        if st.button("Lookup Verse"):
+            st.session_state.lookup_verse = True
+        
+        st.toggle("📜 Chapter mode", key="chapter_mode")
+    
+    with col2:
+        if st.session_state.get('chapter_mode', False):
+            chapter_reader(selected_book, chapter, verse, max_chapter)
+        elif st.session_state.get('lookup_verse', False):
+            verse_text, reference = get_bible_verse(selected_book, chapter, verse)
+            st.markdown(f'<div class="bible-verse"><h3>{_escape(reference)}</h3><p>{_escape(verse_text)}</p></div>', unsafe_allow_html=True)
+            
+            col21, col22 = st.columns(2)
+            with col21:
+                if st.button("💾 Save to Favorites"):
+                    save_favorite_verse(selected_book, chapter, verse, verse_text, reference)
+            with col22:
+                if st.button("📤 Share Verse"):
+                    st.info("Sharing feature coming soon!")
+        else:
+            st.info("Select a book, chapter, and verse to begin reading.")
+    
+    st.divider()
+    st.subheader("🔎 Search the Bible")
+    if get_bible_search() is None:
+        st.caption("Verse search needs the offline Bible (see tools/build_bible_db.py).")
+        return
+    
+    query = st.text_input('Search by keyword or "exact phrase"', key="bible_query", placeholder='e.g. anxious, "fear not"')
+    if query.strip():
+        results, elapsed_ms = search_bible(query)
+        if not results:
+            st.info("No verses found. Try different words.")
+        else:
+            st.caption(f"{len(results)} results in {elapsed_ms:.1f} ms")
+        for i, result in enumerate(results):
+            col_a, col_b = st.columns([5, 1])
+            with col_a:
+                st.markdown(f'<div class="bible-verse"><strong>{_escape(result["reference"])}</strong> {result["snippet"]}</div>', unsafe_allow_html=True)
+            with col_b:
+                st.button("Open", key=f"open_result_{i}", on_click=open_verse,
+                          args=(result["book"], result["chapter"], result["verse"]))
+
+def chapter_reader(book, chapter, verse, max_chapter):
+    """Show a whole chapter with the selected verse highlighted"""
+    verses = get_bible_chapter(book, chapter)
+    if not verses:
+        st.warning("Could not load this chapter. Please try again.")
+        return
+    
+    lines = []
+    for number, text in verses:
+        line = f'<sup>{number}</sup> {_escape(text)}'
+        lines.append(f'<mark>{line}</mark>' if number == verse else line)
+    st.markdown(f'<div class="bible-verse"><h3>{_escape(book)} {chapter}</h3><p>{" ".join(lines)}</p></div>', unsafe_allow_html=True)
+    
+    col21, col22, col23 = st.columns(3)
+    with col21:
+        st.button("◀ Previous Chapter", on_click=step_chapter, args=(-1, max_chapter), disabled=chapter <= 1)
+    with col22:
+        selected = next((text for number, text in verses if number == verse), None)
+        if selected and st.button("💾 Save to Favorites"):
+            save_favorite_verse(book, chapter, verse, selected, f"{book} {chapter}:{verse}")
+    with col23:
+        st.button("Next Chapter ▶", on_click=step_chapter, args=(1, max_chapter), disabled=chapter >= max_chapter)
+    
+    stats = get_chapter_prefetcher().stats()
+    st.caption(f"Prefetch hit rate: {stats['prefetch_hit_rate']:.0%} of {stats['reads']} chapter reads")
+
+def step_chapter(delta, max_chapter):
+    """Move the reader to the previous/next chapter (used as a button callback)"""
+    st.session_state.bible_chapter = min(max(st.session_state.get('bible_chapter', 1) + delta, 1), max_chapter)
+    st.session_state.bible_verse = 1
+
+def save_favorite_verse(book, chapter, verse, verse_text, reference):
+    """Save a verse to the user's favorites"""
+    # Save to Supabase if available
+    try:
+        if supabase_client:
+            queue_write("saved_verses", {
+                "user_id": st.session_state.user.id,
+                "book": book,
+                "chapter": chapter,
+                "verse": verse,
+                "verse_text": verse_text,
+                "reference": reference
+            })
+            st.success("Verse saved to favorites!")
+        else:
+            st.success("Verse saved to favorites! (Demo mode)")
+    except Exception as e:
+        st.error(f"Error saving verse: {str(e)}")
+
+def open_verse(book, chapter, verse):
+    """Point the Bible Reader at a verse (used as a button callback)"""
+    st.session_state.bible_book = book
+    st.session_state.bible_chapter = chapter
+    st.session_state.bible_verse = verse
+    st.session_state.lookup_verse = True
@@ -0,0 +1,202 @@
+"""Chat & Groups page: direct messages, study groups and group creation."""
+
+import streamlit as st
+
+from chat_render import messages_html, visible_window
+from services import (
+    CHAT_PUSH_INTERVAL, CHAT_VISIBLE, CONTACTS_PAGE_SIZE, MESSAGE_STATUS_LABELS, apply_chat_updates,
+    create_study_group, current_user_id, get_chat_hub, get_chat_messages, get_chat_position, get_chat_user,
+    get_presence, get_study_groups, get_waec_subjects, jump_to_latest_messages,
+    load_older_messages, search_chat_users, send_message,
+)
+
+STATE_DEFAULTS = {
+    "chat_messages": {},
+    "chat_cursors": {},
+    "chat_pending": {},
+    "chat_scroll": {},
+    "current_chat": None,
+    "study_groups": [],
+    "user_search": "",
+    "group_search": "",
+}
+
+def render():
+    st.markdown('<h1 class="sub-header">💬 Chat & Groups</h1>', unsafe_allow_html=True)
+    
+    tab1, tab2, tab3 = st.tabs(["Direct Messages", "Study Groups", "Create Group"])
+    
+    with tab1:
+        st.subheader("Chat with Friends")
+        
+        # SEARCH FUNCTIONALITY
+        search_term = st.text_input("🔍 Search users by name or code", key="user_search")
+        
+        # Show more results only for the search they were requested for
+        if st.session_state.get('contacts_query') != search_term:
+            st.session_state.contacts_query = search_term
+            st.session_state.contacts_limit = CONTACTS_PAGE_SIZE
+        
+        col1, col2 = st.columns([1, 2])
+        
+        with col1:
+            st.write("### Contacts")
+            
+            # Search the shared contact index
+            filtered_users, total_users = search_chat_users(search_term, limit=st.session_state.contacts_limit)
+            
+            if not filtered_users and search_term:
+                st.info("No users found. Try a different search term.")
+            elif not filtered_users:
+                st.info("No contacts available. Join groups to meet people!")
+            
+            online = get_presence().online([user['id'] for user in filtered_users])
+            for user in filtered_users:
+                status_indicator = "🟢" if online.get(user['id']) else "⚪"
+                st.button(f"{status_indicator} {user['username']} (#{user['number']})",
+                          key=f"user_{user['id']}", use_container_width=True, on_click=open_chat, args=(user['id'],))
+            
+            if total_users > len(filtered_users):
+                st.caption(f"Showing {len(filtered_users)} of {total_users}")
+                st.button("Show more", key="contacts_more", use_container_width=True, on_click=show_more_contacts)
+            
+            presence = get_presence().stats()
+            st.caption(f"Presence writes: {presence['write_rate']:.2f}/s ({presence['coalesced']} heartbeats coalesced)")
+        
+        with col2:
+            if st.session_state.current_chat:
+                # Get current chat user, or the study group opened with "View Chat"
+                current_user = get_chat_user(st.session_state.current_chat)
+                group = None if current_user else next(
+                    (g for g in st.session_state.study_groups if g['id'] == st.session_state.current_chat), None)
+                
+                if current_user or group:
+                    st.write(f"### Chat with {current_user['username'] if current_user else group['name']}")
+                    
+                    chat_pane(st.session_state.current_chat)
+            else:
+                st.info("Select a contact to start chatting")
+    
+    with tab2:
+        st.subheader("Study Groups")
+        
+        # SEARCH FOR GROUPS
+        group_search = st.text_input("🔍 Search groups by name or subject", key="group_search")
+        
+        # Get study groups
+        if not st.session_state.study_groups:
+            st.session_state.study_groups = get_study_groups()
+        
+        filtered_groups = st.session_state.study_groups
+        if group_search:
+            filtered_groups = [
+                group for group in st.session_state.study_groups
+                if (group_search.lower() in group['name'].lower() or 
+                    group_search.lower() in group['subject'].lower())
+            ]
+        
+        if not filtered_groups and group_search:
+            st.info("No groups found. Try a different search term.")
+        
+        for group in filtered_groups:
+            with st.expander(f"{group['name']} - {group['subject']} ({group['members']} members)"):
+                st.write(f"Topic: {group.get('description', 'General study group')}")
+                if st.button("Join Group", key=f"join_{group['id']}"):
+                    st.success(f"You've joined {group['name']}!")
+                st.button("View Chat", key=f"view_{group['id']}", on_click=open_chat, args=(group['id'],))
+    
+    with tab3:
+        st.subheader("Create a Study Group")
+        
+        with st.form("create_group_form"):
+            group_name = st.text_input("Group Name")
+            group_subject = st.selectbox("Subject", get_waec_subjects())
+            group_description = st.text_area("Description")
+            
+            if st.form_submit_button("Create Group"):
+                if group_name and group_subject:
+                    new_group = create_study_group(group_name, group_subject, group_description)
+                    st.success(f"Group '{new_group['name']}' created successfully!")
+                    st.session_state.study_groups.append(new_group)
+                else:
+                    st.error("Please provide a group name and subject")
+
+def open_chat(chat_id):
+    st.session_state.current_chat = chat_id
+    st.session_state.chat_scroll.pop(chat_id, None)
+    get_chat_messages(chat_id)
+
+def show_more_contacts():
+    st.session_state.contacts_limit += CONTACTS_PAGE_SIZE
+
+def submit_message(chat_id):
+    """Send the composed message; runs before the pane reruns, so the message shows at once"""
+    text = st.session_state.get("message_input", "")
+    if text.strip():
+        send_message(chat_id, text)
+        st.session_state.message_input = ""
+        st.session_state.chat_scroll.pop(chat_id, None)
+    else:
+        st.toast("Please enter a message")
+
+def show_earlier_messages(chat_id):
+    """Move the chat window up a screen, fetching an older page once the loaded ones run out"""
+    messages = get_chat_messages(chat_id, refresh=False)
+    _, start = visible_window(messages, st.session_state.chat_scroll.get(chat_id), CHAT_VISIBLE)
+    if start < CHAT_VISIBLE and messages:
+        first = messages[0]["id"]
+        load_older_messages(chat_id)
+        messages = get_chat_messages(chat_id, refresh=False)
+        # Older messages were prepended: the window moves down by as many
+        start += next((i for i, msg in enumerate(messages) if msg["id"] == first), 0)
+    st.session_state.chat_scroll[chat_id] = max(0, start - CHAT_VISIBLE)
+
+def show_newer_messages(chat_id):
+    """Move the chat window down a screen; at the bottom of a live chat it follows new messages again"""
+    messages = get_chat_messages(chat_id, refresh=False)
+    _, start = visible_window(messages, st.session_state.chat_scroll.get(chat_id), CHAT_VISIBLE)
+    start += CHAT_VISIBLE
+    if start + CHAT_VISIBLE >= len(messages) and get_chat_position(chat_id)["live"]:
+        st.session_state.chat_scroll.pop(chat_id, None)
+    else:
+        st.session_state.chat_scroll[chat_id] = start
+
+def jump_to_latest(chat_id):
+    st.session_state.chat_scroll.pop(chat_id, None)
+    if not get_chat_position(chat_id)["live"]:
+        jump_to_latest_messages(chat_id)
+
+@st.fragment(run_every=CHAT_PUSH_INTERVAL)
+def chat_pane(chat_id):
+    """Message list and composer of the open chat.
+    
+    Reruns on its own timer to show pushed messages; sending a message or
+    paging the history reruns only this fragment. Only CHAT_VISIBLE messages
+    are drawn, as one escaped HTML block.
+    """
+    get_presence().heartbeat(current_user_id())
+    pushed = apply_chat_updates(chat_id)
+    messages = get_chat_messages(chat_id)
+    cursor = get_chat_position(chat_id)
+    scroll = st.session_state.chat_scroll.get(chat_id)
+    visible, start = visible_window(messages, scroll, CHAT_VISIBLE)
+    if start > 0 or (cursor["has_older"]):
+        st.button("⬆ Earlier messages", on_click=show_earlier_messages, args=(chat_id,))
+    
+    st.markdown(messages_html(visible, MESSAGE_STATUS_LABELS, current_user_id()), unsafe_allow_html=True)
+    
+    if start + len(visible) < len(messages):
+        st.button("⬇ Newer messages", on_click=show_newer_messages, args=(chat_id,))
+    if scroll is not None or (not cursor["live"]):
+        st.button("⬇ Jump to latest", on_click=jump_to_latest, args=(chat_id,))
+    
+    
+    # Message input
+    col21, col22 = st.columns([4, 1])
+    with col21:
+        st.text_input("Type your message:", key="message_input")
+    with col22:
+        st.button("Send", use_container_width=True, on_click=submit_message, args=(chat_id,))
+    
+    if pushed:
+        get_chat_hub().record_render(pushed)
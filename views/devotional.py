@@ -0,0 +1,47 @@
+"""Daily Devotional page."""
+
+import streamlit as st
+
+from datetime import datetime
+from services import get_random_verse, queue_write, supabase_client
+
+STATE_DEFAULTS = {}
+
+def render():
+    st.markdown('<h1 class="sub-header">📅 Daily Devotional</h1>', unsafe_allow_html=True)
+    
+    verse_text, reference = get_random_verse()
+    st.markdown(f'<div class="bible-verse"><h3>Verse of the Day ({reference})</h3><p>{verse_text}</p></div>', unsafe_allow_html=True)
+    
+    st.subheader("Reflection Questions")
+    st.write("1. What does this verse mean to you personally?")
+    st.write("2. How can you apply this verse in your life today?")
+    st.write("3. What is God trying to tell you through this scripture?")
+    
+    st.subheader("Journal Your Thoughts")
+    journal_entry = st.text_area("Write your reflections here:", height=150, key="devotional_journal")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("💾 Save Reflection"):
+            if journal_entry:
+                # Save to Supabase if available
+                try:
+                    if supabase_client:
+                        queue_write("devotionals", {
+                            "user_id": st.session_state.user.id,
+                            "verse_text": verse_text,
+                            "reference": reference,
+                            "reflection": journal_entry,
+                            "date": datetime.now().isoformat()
+                        })
+                        st.success("Your reflection has been saved!")
+                    else:
+                        st.success("Your reflection has been saved! (Demo mode)")
+                except Exception as e:
+                    st.error(f"Error saving reflection: {str(e)}")
+            else:
+                st.warning("Please write something before saving.")
+    with col2:
+        if st.button("🔄 New Verse"):
+            st.rerun()
@@ -0,0 +1,143 @@
+"""Games page: Bible trivia, word scramble and verse memory."""
+
+import random
+
+import streamlit as st
+
+TRIVIA_QUESTIONS = [
+    {
+        "question": "Who built the ark?",
+        "options": ["Moses", "Noah", "Abraham", "David"],
+        "answer": "Noah"
+    },
+    {
+        "question": "How many books are in the New Testament?",
+        "options": ["27", "39", "66", "50"],
+        "answer": "27"
+    },
+    {
+        "question": "Who was thrown into the lions' den?",
+        "options": ["David", "Daniel", "Samuel", "Joseph"],
+        "answer": "Daniel"
+    }
+]
+
+SCRAMBLE_WORDS = ["FAITH", "PRAYER", "JESUS", "BIBLE", "GRACE", "CHURCH", "GOSPEL", "PRAISE"]
+
+MEMORY_VERSES = [
+    ("For God so loved the world", "John 3:16"),
+    ("The Lord is my shepherd", "Psalm 23:1"),
+    ("I can do all things", "Philippians 4:13")
+]
+
+STATE_DEFAULTS = {
+    "trivia_index": 0,
+    "trivia_score": 0,
+    "verse_index": 0,
+    "verse_score": 0,
+    # game -> (kind, message) shown after its last answer, e.g. ("success", "Correct! 🎉")
+    "game_feedback": {},
+}
+
+def render():
+    st.markdown('<h1 class="sub-header">🎮 Games</h1>', unsafe_allow_html=True)
+    
+    game_choice = st.radio("Choose a game:", ["Bible Trivia", "Word Scramble", "Verse Memory"])
+    
+    if game_choice == "Bible Trivia":
+        trivia()
+    elif game_choice == "Word Scramble":
+        word_scramble()
+    elif game_choice == "Verse Memory":
+        verse_memory()
+
+def show_feedback(game):
+    feedback = st.session_state.game_feedback.get(game)
+    if feedback:
+        kind, message = feedback
+        getattr(st, kind)(message)
+
+def answer_trivia(q):
+    if st.session_state.get(f"trivia_{st.session_state.trivia_index}") == q['answer']:
+        st.session_state.trivia_score += 1
+        st.session_state.game_feedback["trivia"] = ("success", "Correct! 🎉")
+    else:
+        st.session_state.game_feedback["trivia"] = ("error", f"Sorry, the correct answer is {q['answer']}")
+    st.session_state.trivia_index += 1
+
+def restart_trivia():
+    st.session_state.trivia_index = 0
+    st.session_state.trivia_score = 0
+    st.session_state.game_feedback.pop("trivia", None)
+
+# Each game is a fragment: answering reruns only the game, not the page
+@st.fragment
+def trivia():
+    st.subheader("Bible Trivia Challenge")
+    show_feedback("trivia")
+    
+    if st.session_state.trivia_index < len(TRIVIA_QUESTIONS):
+        q = TRIVIA_QUESTIONS[st.session_state.trivia_index]
+        
+        st.write(f"Question {st.session_state.trivia_index + 1}: {q['question']}")
+        st.radio("Select your answer:", q['options'], key=f"trivia_{st.session_state.trivia_index}")
+        st.button("Submit Answer", on_click=answer_trivia, args=(q,))
+    else:
+        st.success(f"Quiz completed! Your score: {st.session_state.trivia_score}/{len(TRIVIA_QUESTIONS)}")
+        st.button("Play Again", on_click=restart_trivia)
+
+def check_scramble():
+    if st.session_state.get("scramble_guess", "").upper() == st.session_state.scramble_word:
+        st.session_state.game_feedback["scramble"] = ("success", "Correct! 🎉")
+        del st.session_state.scramble_word
+        del st.session_state.scrambled
+        st.session_state.scramble_guess = ""
+    else:
+        st.session_state.game_feedback["scramble"] = ("error", "Try again!")
+
+@st.fragment
+def word_scramble():
+    st.subheader("Bible Word Scramble")
+    
+    if 'scramble_word' not in st.session_state:
+        word = random.choice(SCRAMBLE_WORDS)
+        scrambled = ''.join(random.sample(word, len(word)))
+        st.session_state.scramble_word = word
+        st.session_state.scrambled = scrambled
+    
+    show_feedback("scramble")
+    st.write(f"Unscramble this word: **{st.session_state.scrambled}**")
+    
+    st.text_input("Your guess:", key="scramble_guess")
+    st.button("Check Answer", on_click=check_scramble)
+
+def check_verse(verse_text):
+    if st.session_state.get(f"verse_{st.session_state.verse_index}", "").strip().lower() == verse_text.lower():
+        st.session_state.verse_score += 1
+        st.session_state.game_feedback["verses"] = ("success", "Excellent memory! 🎉")
+    else:
+        st.session_state.game_feedback["verses"] = ("error", f"Close! The verse is: {verse_text}")
+    st.session_state.verse_index += 1
+
+def restart_verses():
+    st.session_state.verse_index = 0
+    st.session_state.verse_score = 0
+    st.session_state.game_feedback.pop("verses", None)
+
+@st.fragment
+def verse_memory():
+    st.subheader("Verse Memory Challenge")
+    show_feedback("verses")
+    
+    if st.session_state.verse_index < len(MEMORY_VERSES):
+        verse_text, reference = MEMORY_VERSES[st.session_state.verse_index]
+        
+        st.write(f"Memorize this verse: **{verse_text}**")
+        st.write(f"Reference: {reference}")
+        
+        st.write("Now try to recall it:")
+        st.text_input("Type the verse:", key=f"verse_{st.session_state.verse_index}")
+        st.button("Check Answer", on_click=check_verse, args=(verse_text,))
+    else:
+        st.success(f"Challenge completed! Your score: {st.session_state.verse_score}/{len(MEMORY_VERSES)}")
+        st.button("Play Again", on_click=restart_verses)
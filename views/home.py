@@ -0,0 +1,49 @@
+"""Home page: verse of the day, playlist and latest chat message."""
+
+import streamlit as st
+
+from chat_render import is_sent
+from services import current_user_id, get_random_verse, last_chat_message, worship_songs
+
+STATE_DEFAULTS = {
+    "current_chat": None,
+    "chat_messages": {},
+}
+
+def render():
+    st.markdown('<h1 class="main-header">👥 TeenConnect</h1>', unsafe_allow_html=True)
+    st.markdown("### Welcome to your safe space for connection, inspiration, and fun!")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.markdown('<div class="card">', unsafe_allow_html=True)
+        st.subheader("📖 Bible Verse of the Day")
+        verse_text, reference = get_random_verse()
+        st.markdown(f'<div class="bible-verse"><p>{verse_text}</p><p>- {reference}</p></div>', unsafe_allow_html=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown('<div class="card">', unsafe_allow_html=True)
+        st.subheader("🎵 Today's Playlist")
+        for song in worship_songs[:2]:
+            st.write(f"• {song['title']} - {song['artist']}")
+        if st.button("Open Music Player →"):
+            st.session_state.page = "Music Player"
+            st.rerun()
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col3:
+        st.markdown('<div class="card">', unsafe_allow_html=True)
+        st.subheader("💬 Recent Messages")
+        recent_msg = last_chat_message(st.session_state.current_chat) if st.session_state.current_chat else None
+        if recent_msg:
+            sender_name = "You" if is_sent(recent_msg, current_user_id()) else recent_msg['sender']
+            st.write(f"From: {sender_name}")
+            st.write(f"Message: {recent_msg['text'][:30]}...")
+        else:
+            st.write("No recent messages")
+        if st.button("Open Chats →"):
+            st.session_state.page = "Chat & Groups"
+            st.rerun()
+        st.markdown('</div>', unsafe_allow_html=True)
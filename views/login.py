@@ -0,0 +1,55 @@
+"""Sign in / sign up page shown to signed-out sessions."""
+
+import time
+
+import streamlit as st
+
+from services import SUPABASE_AVAILABLE, sign_in, sign_up
+
+STATE_DEFAULTS = {}
+
+def render():
+    st.title("👥 TeenConnect")
+    st.markdown("### Welcome! Please sign in or create an account.")
+    
+    if not SUPABASE_AVAILABLE:
+        st.warning("⚠️ Supabase not available. Running in demo mode.")
+    
+    tab1, tab2 = st.tabs(["Login", "Sign Up"])
+    
+    with tab1:
+        with st.form("login_form"):
+            email = st.text_input("Email")
+            password = st.text_input("Password", type="password")
+            login_btn = st.form_submit_button("Login")
+            
+            if login_btn:
+                success, message = sign_in(email, password)
+                if success:
+                    st.success(message)
+                    time.sleep(1)
+                    st.rerun()
+                else:
+                    st.error(message)
+    
+    with tab2:
+        with st.form("signup_form"):
+            email = st.text_input("Email")
+            username = st.text_input("Username")
+            number = st.text_input("4+ Digit Code", max_chars=6)
+            password = st.text_input("Password", type="password")
+            confirm_password = st.text_input("Confirm Password", type="password")
+            
+            signup_btn = st.form_submit_button("Create Account")
+            
+            if signup_btn:
+                if not number.isdigit() or len(number) < 4:
+                    st.error("Please enter a valid 4+ digit code")
+                elif password != confirm_password:
+                    st.error("Passwords do not match")
+                else:
+                    success, message = sign_up(email, password, username, number)
+                    if success:
+                        st.success(message)
+                    else:
+                        st.error(message)
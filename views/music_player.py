@@ -0,0 +1,58 @@
+"""Music Player page."""
+
+import streamlit as st
+
+from services import search_worship_songs, worship_songs
+
+STATE_DEFAULTS = {
+    "current_song": None,
+    "audio_playing": False,
+}
+
+def play(song):
+    st.session_state.current_song = song
+    st.session_state.audio_playing = True
+
+def step_song(delta):
+    """Move to the previous (-1) or next (+1) song in the playlist"""
+    current_index = next((i for i, song in enumerate(worship_songs) if song['title'] == st.session_state.current_song['title']), 0)
+    st.session_state.current_song = worship_songs[(current_index + delta) % len(worship_songs)]
+
+def toggle_playing():
+    st.session_state.audio_playing = not st.session_state.audio_playing
+
+def render():
+    st.markdown('<h1 class="sub-header">🎶 Music Player</h1>', unsafe_allow_html=True)
+    
+    search_query = st.text_input("Search for worship songs")
+    player(search_worship_songs(search_query))
+
+@st.fragment
+def player(songs):
+    """Song list and Now Playing controls; their buttons rerun only this fragment"""
+    for i, song in enumerate(songs):
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.write(f"**{song['title']}**")
+            st.write(f"*{song['artist']}*")
+        with col2:
+            if st.button("▶️ Play", key=f"play_{i}", on_click=play, args=(song,)):
+                st.success(f"Playing: {song['title']}")
+    
+    if st.session_state.current_song:
+        st.markdown('<div class="music-player">', unsafe_allow_html=True)
+        st.subheader("🎵 Now Playing")
+        st.write(f"**{st.session_state.current_song['title']}** by {st.session_state.current_song['artist']}")
+        
+        st.audio(st.session_state.current_song['url'], format="audio/mp3")
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.button("⏮ Previous", on_click=step_song, args=(-1,))
+        with col2:
+            st.button("⏸ Pause" if st.session_state.audio_playing else "▶️ Play", on_click=toggle_playing)
+        with col3:
+            st.button("⏭ Next", on_click=step_song, args=(1,))
+        st.markdown('</div>', unsafe_allow_html=True)
+    else:
+        st.info("Select a song to begin listening")
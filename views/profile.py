@@ -0,0 +1,67 @@
+"""Profile page: account details, stats and achievements."""
+
+import streamlit as st
+
+from profile_stats import achievements, points
+from services import current_user_id, get_contact_index, get_profile_stats, queue_write, supabase_client
+
+STATE_DEFAULTS = {}
+
+def render():
+    st.markdown('<h1 class="sub-header">👤 Your Profile</h1>', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns([1, 2])
+    
+    with col1:
+        st.subheader("Profile Info")
+        st.write(f"**Username:** {st.session_state.profile.get('username', 'N/A')}")
+        st.write(f"**Your Code:** #{st.session_state.profile.get('number', '0000')}")
+        st.write(f"**Email:** {st.session_state.profile.get('email', 'N/A')}")
+        
+        st.divider()
+        
+        st.subheader("Update Profile")
+        new_username = st.text_input("New Username", value=st.session_state.profile.get('username', ''))
+        
+        if st.button("Update Profile"):
+            # Update in session state
+            st.session_state.profile['username'] = new_username
+            
+            # Update in Supabase if available
+            try:
+                if supabase_client:
+                    queue_write("profiles", {
+                        "username": new_username
+                    }, op="update", match={"id": st.session_state.user.id})
+                    get_contact_index().upsert({"id": st.session_state.user.id, "username": new_username})
+            except:
+                pass
+            
+            st.success("Profile updated successfully!")
+    
+    with col2:
+        st.subheader("Your Stats")
+        stats = get_profile_stats(current_user_id())
+        
+        col21, col22, col23 = st.columns(3)
+        with col21:
+            st.markdown(f'<div class="card"><h3>{stats["friends"]}</h3><p>Friends</p></div>', unsafe_allow_html=True)
+        with col22:
+            st.markdown(f'<div class="card"><h3>{stats["devotionals"]}</h3><p>Devotionals</p></div>', unsafe_allow_html=True)
+        with col23:
+            st.markdown(f'<div class="card"><h3>{points(stats)}</h3><p>Points</p></div>', unsafe_allow_html=True)
+        
+        st.subheader("Study Progress")
+        if not stats["subjects"]:
+            st.write("📊 No questions answered yet. Try the WAEC questions in the Study Hub!")
+        for row in stats["subjects"]:
+            total = row.get("total_questions") or 0
+            score = (row.get("correct_answers") or 0) / total if total else 0
+            st.write(f"📊 {row['subject']}: {score:.0%} correct over {total} questions")
+        
+        st.subheader("Achievements")
+        for icon, name, description, progress, goal, unlocked in achievements(stats):
+            if unlocked:
+                st.write(f"🏆 {name} ({description})")
+            else:
+                st.write(f"🔒 {icon} {name} ({description}) · {progress}/{goal}")
@@ -0,0 +1,165 @@
+"""Study Hub page: WAEC questions, study resources and progress."""
+
+import html
+
+import streamlit as st
+
+from services import (
+    current_user_id, get_practice_scheduler, get_progress_tracker, get_study_resources,
+    get_waec_questions, get_waec_subjects, get_waec_topics, get_waec_years, next_practice_question,
+)
+
+STATE_DEFAULTS = {
+    "waec_subject": "Mathematics",
+    "waec_year": "2023",
+}
+
+def _escape(value):
+    # Imported question text is data, not markup; newlines become <br> as in chat_render
+    return html.escape(str(value or "")).replace("\r", "").replace("\n", "<br>")
+
+def render():
+    st.markdown('<h1 class="sub-header">📚 Study Hub</h1>', unsafe_allow_html=True)
+    
+    tab1, tab2, tab3 = st.tabs(["WAEC Questions", "Study Resources", "Progress Tracking"])
+    
+    with tab1:
+        st.subheader("WAEC Past Questions")
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            subjects = get_waec_subjects()
+            st.session_state.waec_subject = st.selectbox("Select Subject", subjects, index=subjects.index(st.session_state.waec_subject), key="waec_subject_select")
+        
+        with col2:
+            years = get_waec_years()
+            st.session_state.waec_year = st.selectbox("Select Year", years, index=years.index(st.session_state.waec_year), key="waec_year_select")
+        
+        with col3:
+            topics = ["All topics"] + get_waec_topics(st.session_state.waec_subject, st.session_state.waec_year)
+            topic = st.selectbox("Select Topic", topics, key="waec_topic_select")
+            st.session_state.waec_topic = None if topic == "All topics" else topic
+        
+        practice = st.toggle("🧠 Adaptive practice (spaced repetition across all years and topics)", key="waec_practice")
+        waec_quiz(practice)
+    
+    with tab2:
+        st.subheader("Study Resources")
+        
+        subject = st.selectbox("Select Subject", get_waec_subjects(), key="resources_subject")
+        resources = get_study_resources(subject)
+        
+        st.write(f"### Resources for {subject}")
+        
+        for resource in resources:
+            with st.expander(f"{resource['title']} ({resource['type']})"):
+                st.write("This resource will help you master key concepts.")
+                if st.button("Download", key=f"dl_{resource['title']}"):
+                    st.info("Download feature will be available soon!")
+    
+    with tab3:
+        st.subheader("Study Progress")
+        
+        st.write("Track your progress across different subjects:")
+        
+        tracker = get_progress_tracker()
+        try:
+            subject_progress = tracker.subjects(current_user_id())
+            overall = tracker.overall(current_user_id())
+        except Exception:
+            st.warning("Could not load your progress. Please try again.")
+            return
+        if not subject_progress:
+            st.info("Answer some WAEC questions to start tracking your progress.")
+        for progress in subject_progress:
+            st.write(f"**{progress.subject}**")
+            st.progress(progress.accuracy)
+            st.caption(f"{progress.accuracy:.0%} correct · {progress.correct} of {progress.total} answered")
+        
+        streak = overall.current_streak()
+        st.metric("Total Questions Answered", overall.total)
+        st.metric("Average Score", f"{overall.accuracy:.0%}" if overall.total else "–")
+        st.metric("Study Streak", f"{streak} day{'s' if streak != 1 else ''}")
+
+def load_questions(practice):
+    if practice:
+        question = next_practice_question(st.session_state.waec_subject)
+        st.session_state.waec_questions = [question] if question else get_waec_questions(st.session_state.waec_subject, st.session_state.waec_year)
+    else:
+        st.session_state.waec_questions = get_waec_questions(st.session_state.waec_subject, st.session_state.waec_year, topic=st.session_state.waec_topic)
+    st.session_state.current_question = 0
+    st.session_state.show_answer = False
+
+def check_answer(q):
+    if st.session_state.get('show_answer', False):
+        # Already answered: a second click must not log the question again
+        return
+    selected_option = st.session_state.get(f"waec_{st.session_state.current_question}")
+    st.session_state.show_answer = True
+    st.session_state.selected_option = selected_option
+    # Log the answer once; progress counters update incrementally
+    subject = q.get("subject", st.session_state.waec_subject)
+    correct = selected_option == q['answer']
+    st.session_state.answer_saved = True
+    try:
+        get_progress_tracker().record_answer(current_user_id(), subject, correct, question_id=q.get("id"))
+    except Exception:
+        # Stored progress couldn't be loaded, so nothing was written
+        st.session_state.answer_saved = False
+    if q.get("id") is not None:
+        try:
+            get_practice_scheduler().record(current_user_id(), subject, q["id"], correct)
+        except Exception:
+            pass
+
+def next_question(q, practice):
+    if practice and q.get("id") is not None:
+        question = next_practice_question(q["subject"])
+        if question:
+            st.session_state.waec_questions.append(question)
+    st.session_state.current_question += 1
+    st.session_state.show_answer = False
+
+def start_again():
+    st.session_state.waec_questions = get_waec_questions(st.session_state.waec_subject, st.session_state.waec_year, topic=st.session_state.get('waec_topic'))
+    st.session_state.current_question = 0
+    st.session_state.show_answer = False
+
+@st.fragment
+def waec_quiz(practice):
+    """Question card; answering and moving on rerun only this fragment"""
+    if practice:
+        try:
+            due, unseen, seen = get_practice_scheduler().counts(current_user_id(), st.session_state.waec_subject)
+            st.caption(f"Due for review: {due} · New: {unseen} · Practised: {seen}")
+        except Exception:
+            st.caption("Your practice schedule could not be loaded; questions are drawn at random.")
+    
+    st.button("Load Questions", on_click=load_questions, args=(practice,))
+    
+    if 'waec_questions' in st.session_state and st.session_state.waec_questions:
+        if st.session_state.current_question < len(st.session_state.waec_questions):
+            q = st.session_state.waec_questions[st.session_state.current_question]
+            
+            st.markdown(f'<div class="waec-question"><h3>Question {st.session_state.current_question + 1}</h3><p>{_escape(q["question"])}</p></div>', unsafe_allow_html=True)
+            
+            answered = st.session_state.get('show_answer', False)
+            st.radio("Select your answer:", q['options'], key=f"waec_{st.session_state.current_question}", disabled=answered)
+            if not answered:
+                st.button("Check Answer", on_click=check_answer, args=(q,))
+            else:
+                if st.session_state.selected_option == q['answer']:
+                    st.success("✅ Correct!")
+                else:
+                    st.error(f"❌ Incorrect. The correct answer is: {q['answer']}")
+                if not st.session_state.get('answer_saved', True):
+                    st.warning("Your progress could not be loaded, so this answer was not counted.")
+                
+                st.markdown(f'<div class="waec-answer"><strong>Explanation:</strong> {_escape(q["explanation"])}</div>', unsafe_allow_html=True)
+                
+                st.button("Next Question →", on_click=next_question, args=(q, practice))
+        else:
+            st.success("🎉 You've completed all questions!")
+            st.button("Start Again", on_click=start_again)
+    else:
+        st.info("Select a subject and year, then click 'Load Questions' to begin.")